@@ -1,7 +1,8 @@
-import imp
+import importlib
 import logging
-import os.path
 import sys
+import threading
+from contextlib import contextmanager
 from os import environ
 
 __version__ = '0.4.0'
@@ -51,43 +52,76 @@ BALANCING_AUTHORITIES = {
 }
 
 
-def client_factory(client_name, **kwargs):
-    """Return a client for an external data set"""
-    # set up
-    dir_name = os.path.dirname(os.path.abspath(__file__))
-    error_msg = 'No client found for name %s' % client_name
+# client classes by balancing authority, filled in as their modules are imported
+_client_classes = {}
+_client_classes_lock = threading.Lock()
+
+# maximum number of idle sessions kept for each balancing authority by pooled_client
+POOL_MAX_IDLE = 4
+
+_session_pool = {}
+_session_pool_lock = threading.Lock()
+
+
+def client_class(client_name):
+    """
+    Return the client class for a balancing authority.
+    Its module is imported the first time the class is needed, and only once.
+    """
     client_key = client_name.upper()
+    error_msg = 'No client found for name %s' % client_name
 
     # find client
     try:
         client_vals = BALANCING_AUTHORITIES[client_key]
-        module_name = client_vals['module']
-
-        class_name = client_vals['class']
     except KeyError:
         raise ValueError(error_msg)
 
-    # find module
-    try:
-        fp, pathname, description = imp.find_module(module_name, [dir_name])
-    except ImportError:
-        raise ValueError(error_msg)
-
     # load
-    try:
-        mod = imp.load_module(module_name, fp, pathname, description)
-    finally:
-        # Since we may exit via an exception, close fp explicitly.
-        if fp:
-            fp.close()
+    with _client_classes_lock:
+        if client_key not in _client_classes:
+            mod = importlib.import_module('pyiso.%s' % client_vals['module'])
+            try:
+                _client_classes[client_key] = getattr(mod, client_vals['class'])
+            except AttributeError:
+                raise ValueError(error_msg)
+        return _client_classes[client_key]
+
 
+def client_factory(client_name, **kwargs):
+    """Return a client for an external data set"""
     # instantiate class
-    try:
-        client_inst = getattr(mod, class_name)(**kwargs)
-    except AttributeError:
-        raise ValueError(error_msg)
+    client_inst = client_class(client_name)(**kwargs)
 
     # set name
     client_inst.NAME = client_name
 
     return client_inst
+
+
+@contextmanager
+def pooled_client(client_name, **kwargs):
+    """
+    Lend a client for an external data set, for use in a with statement.
+    The client is new, since some clients fix "now" when they are created,
+    but its requests.Session comes from a pool and goes back to it on exit,
+    so later users reuse its open connections instead of connecting again.
+    Each session is lent to one user at a time.
+
+    :param str client_name: The balancing authority, as for client_factory.
+    :param kwargs: Passed to the client's constructor.
+    """
+    client_inst = client_factory(client_name, **kwargs)
+    with _session_pool_lock:
+        idle = _session_pool.setdefault(client_name.upper(), [])
+        if idle:
+            client_inst.session = idle.pop()
+
+    try:
+        yield client_inst
+    finally:
+        session = getattr(client_inst, 'session', None)
+        if session is not None:
+            with _session_pool_lock:
+                if len(idle) < POOL_MAX_IDLE:
+                    idle.append(session)
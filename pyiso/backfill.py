@@ -0,0 +1,360 @@
+"""
+Backfills historical data for many balancing authorities into columnar files.
+
+The (balancing authority, data type, date range) jobs are split into shards that run in a process pool,
+so parsing is spread over all CPUs. At most ``per_source`` shards of balancing authorities served by the same
+client module (and so the same source host) run at the same time. Each shard is written to its own file under
+``<output_dir>/data=<data>/ba_name=<ba_name>/``, and completed shards are recorded in a checkpoint file,
+so an interrupted backfill picks up where it left off when run again with the same output directory.
+
+Run with:
+    python -m pyiso.backfill --start 2017-01-01 --end 2017-04-01 --data gen load --output-dir history
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+from collections import namedtuple
+from datetime import datetime, timedelta
+from multiprocessing import Pool, cpu_count
+from timeit import default_timer
+
+try:
+    from queue import Empty, Queue
+except ImportError:  # Python 2
+    from Queue import Empty, Queue
+
+import pandas as pd
+
+from pyiso import BALANCING_AUTHORITIES, LOGGER, client_factory
+from pyiso.engine import GETTERS
+
+
+# one data type of one balancing authority over the local dates from start_date up to but not including end_date
+Shard = namedtuple('Shard', ['ba_name', 'data', 'start_date', 'end_date'])
+
+# result of running a shard: the number of rows written, or an error message
+ShardResult = namedtuple('ShardResult', ['shard', 'rows', 'error'])
+
+OUTPUT_FORMATS = ['parquet', 'csv']
+
+CHECKPOINT_FILENAME = '_completed.txt'
+
+# file listing the keys of shards that returned no data, once per run
+EMPTY_FILENAME = '_empty.txt'
+
+# error of shards that returned no data, which clients also return when a request failed
+NO_DATA = 'no data'
+
+# default number of runs in which a shard returns no data before it counts as completed
+MAX_EMPTY_RETRIES = 3
+
+# default maximum number of shards of one source running at the same time
+PER_SOURCE = 2
+
+# default seconds after which a shard that has not finished (e.g. because its worker process died) counts as failed;
+# its slot stays taken until it does finish
+SHARD_TIMEOUT = 3600
+
+
+def make_shards(ba_names, data_types, start_date, end_date, days=1):
+    """
+    :param list ba_names: Balancing authorities.
+    :param list data_types: Data types, each one of 'gen', 'load' or 'trade'.
+    :param date start_date: First local date to backfill.
+    :param date end_date: Local date after the last date to backfill.
+    :param int days: Number of days in each shard.
+    :return: List of Shards covering every combination, in chronological order.
+    :rtype: list
+    """
+    for ba_name in ba_names:
+        if ba_name.upper() not in BALANCING_AUTHORITIES:
+            raise ValueError('No client found for name %s' % ba_name)
+    for data in data_types:
+        if data not in GETTERS:
+            raise ValueError('data must be one of %s, not %s' % (sorted(GETTERS.keys()), data))
+
+    shards = []
+    shard_start = start_date
+    while shard_start < end_date:
+        shard_end = min(shard_start + timedelta(days=days), end_date)
+        for ba_name in ba_names:
+            for data in data_types:
+                shards.append(Shard(ba_name, data, shard_start, shard_end))
+        shard_start = shard_end
+    return shards
+
+
+def shard_key(shard):
+    """Returns a string that identifies the shard in the checkpoint file."""
+    return '%s %s %s %s' % (shard.ba_name, shard.data, shard.start_date.strftime('%Y%m%d'),
+                            shard.end_date.strftime('%Y%m%d'))
+
+
+def shard_source(shard):
+    """Returns the client module of the shard's balancing authority, which identifies the host it is fetched from."""
+    return BALANCING_AUTHORITIES[shard.ba_name.upper()]['module']
+
+
+def shard_path(output_dir, shard, output_format):
+    return os.path.join(output_dir, 'data=%s' % shard.data, 'ba_name=%s' % shard.ba_name,
+                        '%s_%s.%s' % (shard.start_date.strftime('%Y%m%d'), shard.end_date.strftime('%Y%m%d'),
+                                      output_format))
+
+
+def write_frame(df, path, output_format):
+    """
+    Writes a DataFrame to path, through a temporary file so that a partly written file is never left at path.
+    Parquet output needs pyarrow or fastparquet to be installed.
+    """
+    dir_name = os.path.dirname(path)
+    if not os.path.isdir(dir_name):
+        try:
+            os.makedirs(dir_name)
+        except OSError:
+            # made by another worker
+            if not os.path.isdir(dir_name):
+                raise
+
+    tmp_path = path + '.tmp'
+    if output_format == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.rename(tmp_path, path)
+
+
+def parquet_available():
+    """Returns whether DataFrames can be written to Parquet, which needs pandas>=0.21 and pyarrow or fastparquet."""
+    if not hasattr(pd.DataFrame, 'to_parquet'):
+        return False
+    for engine in ['pyarrow', 'fastparquet']:
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            pass
+    return False
+
+
+def fetch_shard(shard, output_dir, output_format):
+    """
+    Fetches the data of one shard and writes it to its file. Runs in a worker process.
+
+    :rtype: ShardResult
+    """
+    try:
+        client = client_factory(shard.ba_name)
+        end_at = datetime.combine(shard.end_date, datetime.min.time()) - timedelta(microseconds=1)
+        data = getattr(client, GETTERS[shard.data])(start_at=shard.start_date.strftime('%Y-%m-%d'),
+                                                    end_at=end_at.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+        if not data:
+            # clients also return no data on request errors, so try again next time
+            return ShardResult(shard, None, NO_DATA)
+
+        df = pd.DataFrame(data)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+        write_frame(df, shard_path(output_dir, shard, output_format), output_format)
+        return ShardResult(shard, len(df), None)
+    except NotImplementedError:
+        # will never succeed, so count it as done
+        LOGGER.debug('%s: %s not implemented' % (shard.ba_name, GETTERS[shard.data]))
+        return ShardResult(shard, 0, None)
+    except Exception as e:
+        return ShardResult(shard, None, '%s: %s' % (type(e).__name__, e))
+
+
+class Checkpoint(object):
+    """
+    File listing the keys of completed shards, one per line, and a file listing the key of a shard each time
+    it returns no data. Lines are appended as shards finish, so the files stay valid if the backfill is interrupted.
+    """
+    def __init__(self, path, empty_path=None):
+        self.path = path
+        self.empty_path = empty_path
+        self.completed = set(self._read_keys(path))
+        self.empty_counts = {}
+        for key in self._read_keys(empty_path):
+            self.empty_counts[key] = self.empty_counts.get(key, 0) + 1
+
+    @staticmethod
+    def _read_keys(path):
+        if path is None or not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [line.strip() for line in f if line.strip()]
+
+    def __contains__(self, shard):
+        return shard_key(shard) in self.completed
+
+    def add(self, shard):
+        key = shard_key(shard)
+        with open(self.path, 'a') as f:
+            f.write(key + '\n')
+        self.completed.add(key)
+
+    def add_empty(self, shard):
+        """
+        Records that the shard returned no data.
+
+        :return: The number of times the shard has returned no data.
+        :rtype: int
+        """
+        key = shard_key(shard)
+        if self.empty_path is not None:
+            with open(self.empty_path, 'a') as f:
+                f.write(key + '\n')
+        self.empty_counts[key] = self.empty_counts.get(key, 0) + 1
+        return self.empty_counts[key]
+
+
+def run_backfill(shards, output_dir, output_format='parquet', processes=None, per_source=PER_SOURCE, pool=None,
+                 shard_timeout=SHARD_TIMEOUT, max_empty_retries=MAX_EMPTY_RETRIES):
+    """
+    Runs the shards that have not completed in a previous run, and checkpoints each one that completes.
+
+    :param list shards: Shards to run, from make_shards. They are started in order, subject to per_source.
+    :param str output_dir: Directory to write output files and the checkpoint file to.
+    :param str output_format: One of OUTPUT_FORMATS. If Parquet cannot be written (see parquet_available),
+        csv is written instead.
+    :param int processes: Number of worker processes. Defaults to the number of CPUs.
+    :param int per_source: Maximum number of shards of one source running at the same time.
+    :param pool: Pool to run shards in, with the interface of multiprocessing.Pool.
+        If not provided, a multiprocessing.Pool of processes workers is created and closed at the end.
+    :param float shard_timeout: Seconds after which a shard that has not finished counts as failed.
+        Its slot stays taken until it does finish, so that per_source is kept; shards still waiting for such a slot
+        after another shard_timeout count as failed.
+    :param int max_empty_retries: Number of runs in which a shard returns no data (which may be a request error)
+        before it counts as completed, with no rows.
+    :return: List of ShardResults of the shards run in this call. Shards that returned no data have the error NO_DATA,
+        or no error and 0 rows if they are now completed.
+    :rtype: list
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError('output_format must be one of %s, not %s' % (OUTPUT_FORMATS, output_format))
+    if output_format == 'parquet' and not parquet_available():
+        LOGGER.warn('Writing csv instead of parquet, which needs pandas>=0.21 and pyarrow or fastparquet '
+                    '(pip install pyiso[parquet])')
+        output_format = 'csv'
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    checkpoint = Checkpoint(os.path.join(output_dir, CHECKPOINT_FILENAME), os.path.join(output_dir, EMPTY_FILENAME))
+    pending = [shard for shard in shards if shard not in checkpoint]
+    LOGGER.info('Backfilling %d shards (%d already completed)' % (len(pending), len(shards) - len(pending)))
+
+    own_pool = pool is None
+    if own_pool:
+        pool = Pool(processes or cpu_count())
+
+    def callbacks(shard):
+        kwargs = {'callback': finished.put}
+        if sys.version_info[0] >= 3:  # Python 2 pools have no error_callback; the shard times out instead
+            kwargs['error_callback'] = lambda e: finished.put(
+                ShardResult(shard, None, '%s: %s' % (type(e).__name__, e)))
+        return kwargs
+
+    finished = Queue()
+    running = {}
+    started = {}
+    timed_out = set()
+    results = []
+    try:
+        while pending or started:
+            # start every pending shard whose source has room, in order
+            waiting = []
+            for shard in pending:
+                source = shard_source(shard)
+                if running.get(source, 0) < per_source:
+                    running[source] = running.get(source, 0) + 1
+                    started[shard] = default_timer()
+                    pool.apply_async(fetch_shard, (shard, output_dir, output_format), **callbacks(shard))
+                else:
+                    waiting.append(shard)
+            pending = waiting
+
+            # wait for a shard to finish, or give up on shards that take too long
+            if started:
+                timeout = max(min(started.values()) + shard_timeout - default_timer(), 0)
+            else:
+                # every pending shard waits for a slot taken by a shard that timed out
+                timeout = shard_timeout
+            try:
+                result = finished.get(timeout=timeout)
+            except Empty:
+                if not started:
+                    for shard in pending:
+                        results.append(ShardResult(shard, None, 'no free slot for its source'))
+                        LOGGER.error('%s: failed, will retry on the next run: no free slot for its source' %
+                                     shard_key(shard))
+                    break
+                # keep its slot taken until it finishes
+                shard = min(started, key=started.get)
+                del started[shard]
+                timed_out.add(shard)
+                result = ShardResult(shard, None, 'no result after %s seconds' % shard_timeout)
+            else:
+                running[shard_source(result.shard)] -= 1
+                if result.shard in timed_out:
+                    timed_out.discard(result.shard)
+                    LOGGER.debug('%s: finished after timing out' % shard_key(result.shard))
+                    continue
+                del started[result.shard]
+
+            if result.error == NO_DATA and checkpoint.add_empty(result.shard) >= max_empty_retries:
+                LOGGER.warn('%s: no data in %d runs, marking as completed' % (shard_key(result.shard),
+                                                                              max_empty_retries))
+                result = ShardResult(result.shard, 0, None)
+            results.append(result)
+            if result.error is None:
+                checkpoint.add(result.shard)
+                LOGGER.info('%s: wrote %d rows' % (shard_key(result.shard), result.rows))
+            else:
+                LOGGER.error('%s: failed, will retry on the next run: %s' % (shard_key(result.shard), result.error))
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+
+    return results
+
+
+def parse_date(date_str):
+    return datetime.strptime(date_str, '%Y-%m-%d').date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Backfill historical data for many balancing authorities.')
+    parser.add_argument('--start', type=parse_date, required=True, help='first local date, as YYYY-MM-DD')
+    parser.add_argument('--end', type=parse_date, required=True, help='local date after the last date, as YYYY-MM-DD')
+    parser.add_argument('--ba', nargs='+', default=None, dest='ba_names',
+                        help='balancing authorities (default: all)')
+    parser.add_argument('--data', nargs='+', default=['gen'], choices=sorted(GETTERS.keys()), help='data types')
+    parser.add_argument('--days', type=int, default=1, help='number of days in each shard')
+    parser.add_argument('--output-dir', required=True, help='directory to write output and checkpoint files to')
+    parser.add_argument('--format', default='parquet', choices=OUTPUT_FORMATS, dest='output_format',
+                        help='output file format (parquet needs pyarrow or fastparquet, otherwise csv is written)')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: CPUs)')
+    parser.add_argument('--per-source', type=int, default=PER_SOURCE,
+                        help='maximum number of shards of one source running at the same time')
+    parser.add_argument('--max-empty-retries', type=int, default=MAX_EMPTY_RETRIES,
+                        help='number of runs in which a shard returns no data before it counts as completed')
+    args = parser.parse_args(argv)
+
+    ba_names = args.ba_names or sorted(BALANCING_AUTHORITIES.keys())
+    shards = make_shards(ba_names, args.data, args.start, args.end, days=args.days)
+    results = run_backfill(shards, args.output_dir, output_format=args.output_format,
+                           processes=args.processes, per_source=args.per_source,
+                           max_empty_retries=args.max_empty_retries)
+
+    # shards with no data are retried on later runs, but only failed shards are errors
+    empty = [result for result in results if result.error == NO_DATA]
+    failed = [result for result in results if result.error not in (None, NO_DATA)]
+    print('%d shards completed, %d with no data, %d failed' % (len(results) - len(empty) - len(failed), len(empty),
+                                                               len(failed)))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,25 +1,25 @@
 import os
-import ssl
 import warnings
+from functools import wraps
 import zipfile
 from collections import namedtuple
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from io import StringIO, BytesIO
+from multiprocessing.pool import ThreadPool
 from time import sleep
+from timeit import default_timer
 
-import certifi
+import numpy as np
 import pandas as pd
 import pytz
 import requests
 from dateutil.parser import parse as dateutil_parse
-from pytz import AmbiguousTimeError
+from pytz import AmbiguousTimeError, NonExistentTimeError
 
 from pyiso import LOGGER
-
-try:
-    from urllib2 import urlopen
-except ImportError:
-    from urllib.request import urlopen  # Changed from urllib2 for python3.x
+from pyiso.cache import default_cache
+from pyiso.metrics import CallStats, default_metrics_sink
+from pyiso.store import default_store
 
 # named tuple for time period interval labels
 IntervalChoices = namedtuple('IntervalChoices', ['hourly', 'fivemin', 'tenmin', 'fifteenmin', 'na', 'dam'])
@@ -45,13 +45,45 @@ class BaseClient(object):
     # name
     NAME = ''
 
+    # choices for the output option, see format_output
+    OUTPUT_CHOICES = ['list', 'frame', 'arrays']
+
+    # default upper bound on concurrent requests made through map_concurrently
+    MAX_WORKERS = 4
+
+    # list of pyiso.cache.CacheRule for URLs whose responses may be cached
+    CACHE_RULES = []
+
+    # response cache, see get_cache
+    cache = None
+
+    # pyiso.metrics.BaseMetricsSink that phase measurements are sent to, see get_metrics_sink
+    metrics_sink = None
+
+    # time series store that get_* calls for time ranges consult, see get_store
+    store = None
+
+    # data points more recent than this may still be published or revised by the source,
+    # so their interval is not marked as stored; override in clients of sources that publish later
+    STORE_SETTLED_AFTER = timedelta(hours=3)
+
+    # pyiso.watch.ResponseHashes that response bodies are checked against in watch mode, see pyiso.watch.Watcher
+    response_hashes = None
+
     def __init__(self, timeout_seconds=30):
         # will hold query options
         self.options = {}
 
+        # will hold phase measurements of the current call
+        self.stats = CallStats(self.NAME)
+
         # connection timeout
         self.timeout_seconds = timeout_seconds
 
+        # consult the time series store, if any, in get_* calls
+        for data, method_name in [('gen', 'get_generation'), ('load', 'get_load'), ('trade', 'get_trade')]:
+            setattr(self, method_name, self._stored_getter(data, getattr(self, method_name)))
+
     def get_generation(self, latest=False, yesterday=False, start_at=False, end_at=False, **kwargs):
         """
         Scrape and parse generation fuel mix data.
@@ -66,6 +98,9 @@ class BaseClient(object):
         :param datetime end_at: If the datetime is naive, it is assummed to be in the timezone of the Balancing Authority. The timestamp of all returned data points will be less than or equal to this value.
            If using, must provide both ``start_at`` and ``end_at`` parameters.
            Not available for all regions.
+        :param str output: One of 'list' (default), 'frame' or 'arrays'.
+           If 'frame' or 'arrays', return a DataFrame or numpy record array with one column per key instead of a list.
+           Not available for all regions.
         :return: List of dicts, each with keys ``[ba_name, timestamp, freq, market, fuel_name, gen_MW]``.
            Timestamps are in UTC.
         :rtype: list
@@ -87,6 +122,9 @@ class BaseClient(object):
         :param datetime end_at: If the datetime is naive, it is assummed to be in the timezone of the Balancing Authority. The timestamp of all returned data points will be less than or equal to this value.
            If using, must provide both ``start_at`` and ``end_at`` parameters.
            Not available for all regions.
+        :param str output: One of 'list' (default), 'frame' or 'arrays'.
+           If 'frame' or 'arrays', return a DataFrame or numpy record array with one column per key instead of a list.
+           Not available for all regions.
         :return: List of dicts, each with keys ``[ba_name, timestamp, freq, market, load_MW]``.
            Timestamps are in UTC.
         :rtype: list
@@ -109,6 +147,9 @@ class BaseClient(object):
         :param datetime end_at: If the datetime is naive, it is assummed to be in the timezone of the Balancing Authority. The timestamp of all returned data points will be less than or equal to this value.
            If using, must provide both ``start_at`` and ``end_at`` parameters.
            Not available for all regions.
+        :param str output: One of 'list' (default), 'frame' or 'arrays'.
+           If 'frame' or 'arrays', return a DataFrame or numpy record array with one column per key instead of a list.
+           Not available for all regions.
         :return: List of dicts, each with keys ``[ba_name, timestamp, freq, market, net_exp_MW]``.
            Timestamps are in UTC.
         :rtype: list
@@ -116,6 +157,68 @@ class BaseClient(object):
         """
         raise NotImplementedError('Derived classes must implement the get_trade method.')
 
+    def iter_generation(self, start_at=False, end_at=False, **kwargs):
+        """
+        Scrape and parse generation fuel mix data for a time range, yielding the data in chronological chunks
+        (for example one per day or per report file) as soon as each chunk is fetched and parsed.
+        Use this instead of get_generation to process long time ranges in constant memory.
+
+        :param datetime start_at: Same as for get_generation. Required.
+        :param datetime end_at: Same as for get_generation. Required.
+        :return: Generator of results in the format returned by get_generation.
+        :rtype: generator
+        """
+        return self._iter_daily(self.get_generation, start_at, end_at, **kwargs)
+
+    def iter_load(self, start_at=False, end_at=False, **kwargs):
+        """
+        Scrape and parse load data for a time range, yielding the data in chronological chunks
+        (for example one per day or per report file) as soon as each chunk is fetched and parsed.
+        Use this instead of get_load to process long time ranges in constant memory.
+
+        :param datetime start_at: Same as for get_load. Required.
+        :param datetime end_at: Same as for get_load. Required.
+        :return: Generator of results in the format returned by get_load.
+        :rtype: generator
+        """
+        return self._iter_daily(self.get_load, start_at, end_at, **kwargs)
+
+    def iter_trade(self, start_at=False, end_at=False, **kwargs):
+        """
+        Scrape and parse import/export data for a time range, yielding the data in chronological chunks
+        (for example one per day or per report file) as soon as each chunk is fetched and parsed.
+        Use this instead of get_trade to process long time ranges in constant memory.
+
+        :param datetime start_at: Same as for get_trade. Required.
+        :param datetime end_at: Same as for get_trade. Required.
+        :return: Generator of results in the format returned by get_trade.
+        :rtype: generator
+        """
+        return self._iter_daily(self.get_trade, start_at, end_at, **kwargs)
+
+    def _iter_daily(self, getter, start_at, end_at, **kwargs):
+        """
+        Default implementation of the iter_* methods.
+        Calls getter once for each local day in the range and yields its results, skipping empty days.
+        """
+        if not (start_at and end_at):
+            raise ValueError('start_at and end_at must both be provided.')
+        start_at = self.utcify(start_at)
+        end_at = self.utcify(end_at)
+        tz = pytz.timezone(self.TZ_NAME)
+
+        chunk_start = start_at
+        while chunk_start < end_at:
+            # chunk ends just before the next local midnight
+            next_date = chunk_start.astimezone(tz).date() + timedelta(days=1)
+            next_start = tz.localize(datetime.combine(next_date, time(0))).astimezone(pytz.utc)
+            chunk_end = min(next_start - timedelta(microseconds=1), end_at)
+
+            data = getter(start_at=chunk_start, end_at=chunk_end, **kwargs)
+            if len(data) > 0:
+                yield data
+            chunk_start = next_start
+
     def get_lmp(self, **kwargs):
         """
         Locational Marginal Price (LMP) is no longer considered a useful measure in reducing
@@ -127,8 +230,14 @@ class BaseClient(object):
     def handle_options(self, **kwargs):
         """
         Process and store keyword argument options.
+        Also starts a new CallStats for the call in the stats attribute.
         """
         self.options = kwargs
+        self.stats = CallStats(self.NAME)
+
+        # check output format
+        if self.options.get('output', 'list') not in self.OUTPUT_CHOICES:
+            raise ValueError('Invalid output %s, must be one of %s' % (self.options['output'], self.OUTPUT_CHOICES))
 
         # check start_at and end_at args
         if self.options.get('start_at', None) and self.options.get('end_at', None):
@@ -223,10 +332,12 @@ class BaseClient(object):
         :return: The .xls document's content as a pandas object.
         :rtype: pandas.io.excel.ExcelFile
         """
-        # follow http://stackoverflow.com/questions/27835619/ssl-certificate-verify-failed-error
-        context = ssl.create_default_context(cafile=certifi.where())
-        socket = urlopen(url, context=context)
-        xd = pd.ExcelFile(socket)
+        # make request with self.request so that the response can be cached
+        response = self.request(url)
+        if response is None or response.status_code != 200:
+            raise ValueError('%s: could not fetch xls file %s' % (self.NAME, url))
+
+        xd = pd.ExcelFile(BytesIO(response.content))
         return xd
 
     def request(self, url, mode='get', retry_sec=5, retries_remaining=5, **kwargs):
@@ -240,12 +351,26 @@ class BaseClient(object):
         if mode not in allowed_modes:
             raise ValueError('Invalid request mode %s' % mode)
 
+        start = default_timer()
+
+        # check cache
+        cache = self.get_cache() if mode == 'get' else None
+        if cache is not None:
+            cache_key = cache.make_key(url, kwargs.get('params'))
+            cache_ttl = self.cache_ttl(url)
+            if cache_ttl == 0:
+                cache = None
+            else:
+                cached_response = cache.get(cache_key)
+                if cached_response is not None:
+                    LOGGER.debug('%s: request success for %s, %s with cache hit True' % (self.NAME, url, kwargs))
+                    self.record_phase('request', default_timer() - start, bytes=len(cached_response.content))
+                    if self.response_hashes is not None:
+                        self.response_hashes.check(url, kwargs.get('params'), cached_response.content)
+                    return cached_response
+
         # check for session
-        try:
-            session = getattr(self, 'session')
-        except AttributeError:
-            self.session = requests.Session()
-            session = self.session
+        session = self.get_session()
 
         # carry out request
         try:
@@ -261,15 +386,25 @@ class BaseClient(object):
             # eg max retries exceeded
             msg = '%s: connection error for %s, %s:\n%s' % (self.NAME, url, kwargs, e)
             LOGGER.error(msg)
+            self.record_phase('request', default_timer() - start, bytes=0)
             return None
         # except requests.exceptions.RequestException:
         #     msg = '%s: request exception for %s, %s:\n%s' % (self.NAME, url, kwargs, e)
         #     LOGGER.error(msg)
         #     return None
+        self.record_phase('request', default_timer() - start, bytes=len(response.content))
 
         if response.status_code == 200:
             # success
             LOGGER.debug('%s: request success for %s, %s with cache hit %s' % (self.NAME, url, kwargs, getattr(response, 'from_cache', None)))
+            if cache is not None:
+                cache.set(cache_key, response, cache_ttl)
+            if self.response_hashes is not None:
+                self.response_hashes.check(url, kwargs.get('params'), response.content)
+
+        elif response.status_code == 304:
+            # conditional request for content the caller already has
+            LOGGER.debug('%s: not modified for %s, %s' % (self.NAME, url, kwargs))
 
         elif response.status_code == 429:
             if retries_remaining > 0:
@@ -298,6 +433,182 @@ class BaseClient(object):
 
         return response
 
+    def get_cache(self):
+        """
+        Returns the response cache used by request, or None if responses are not cached.
+        Set the cache attribute to a pyiso.cache.BaseCache to use a specific cache for this client;
+        otherwise the cache configured by the PYISO_CACHE_PATH environment variable is used, if any.
+        """
+        if self.cache is not None:
+            return self.cache
+        return default_cache()
+
+    def get_store(self):
+        """
+        Returns the time series store that get_* calls for time ranges consult, or None if data is not stored.
+        Set the store attribute to a pyiso.store.SQLiteTimeSeriesStore to use a specific store for this client;
+        otherwise the store configured by the PYISO_STORE_PATH environment variable is used, if any.
+        """
+        if self.store is not None:
+            return self.store
+        return default_store()
+
+    def store_name(self):
+        """Returns the name that this client's data points are stored under in the time series store."""
+        return self.NAME
+
+    def _stored_getter(self, data, getter):
+        """
+        Wraps a get_* method so that, when a store is configured, calls for a past time range fetch only the parts
+        of the range that are not stored yet, store what they fetch, and return the stored points for the range.
+        Other calls (latest, yesterday, forecasts, or output other than 'list') go straight to the method.
+        """
+        @wraps(getter)
+        def get_stored(*args, **kwargs):
+            store = self.get_store()
+            start_at = kwargs.get('start_at')
+            end_at = kwargs.get('end_at')
+            if store is None or args or not (start_at and end_at) or kwargs.get('latest') or \
+                    kwargs.get('yesterday') or kwargs.get('forecast') or kwargs.get('output', 'list') != 'list':
+                return getter(*args, **kwargs)
+
+            start_at = self.utcify(start_at)
+            end_at = self.utcify(end_at)
+            settled_at = datetime.now(pytz.utc) - self.STORE_SETTLED_AFTER
+            if start_at >= settled_at:
+                return getter(*args, **kwargs)
+
+            options = dict((k, v) for k, v in kwargs.items() if k not in ('start_at', 'end_at'))
+            ba_name = self.store_name()
+            for gap_start, gap_end in store.gaps(ba_name, data, options, start_at, end_at):
+                LOGGER.debug('%s: fetching %s from %s to %s' % (ba_name, data, gap_start, gap_end))
+                points = getter(start_at=gap_start, end_at=gap_end, **options)
+                if not points:
+                    # an empty result may be an error, so the interval is not marked as stored
+                    continue
+                store.add(ba_name, data, options, points)
+                if gap_start < settled_at:
+                    # clients skip days whose requests failed, so only days with data count as stored
+                    store.add_coverage(ba_name, data, options,
+                                       self.days_with_points(points, gap_start, min(gap_end, settled_at)))
+            return store.get(ba_name, data, options, start_at, end_at)
+
+        return get_stored
+
+    def days_with_points(self, points, start_at, end_at):
+        """
+        :param list points: List of dicts of data points, as returned by get_*.
+        :param datetime start_at: Start of the range, tz-aware.
+        :param datetime end_at: End of the range, tz-aware.
+        :return: Sorted list of (start_at, end_at) tuples of the local days that have at least one of the points,
+            clipped to the range.
+        :rtype: list
+        """
+        tz = pytz.timezone(self.TZ_NAME)
+        dates = set(point['timestamp'].astimezone(tz).date() for point in points)
+        intervals = []
+        day = start_at.astimezone(tz).date()
+        day_start = tz.localize(datetime.combine(day, time(0))).astimezone(pytz.utc)
+        while day_start <= end_at:
+            next_day = day + timedelta(days=1)
+            next_day_start = tz.localize(datetime.combine(next_day, time(0))).astimezone(pytz.utc)
+            if day in dates:
+                intervals.append((max(day_start, start_at), min(next_day_start, end_at)))
+            day, day_start = next_day, next_day_start
+        return intervals
+
+    def cache_ttl(self, url):
+        """
+        Returns the number of seconds a response for the URL may be cached, None if it may be cached forever,
+        or 0 if it should not be cached. The first of the client's CACHE_RULES that matches the URL is used.
+        """
+        for rule in self.CACHE_RULES:
+            if rule.matches(url):
+                return rule.ttl(url, datetime.utcnow())
+        return 0
+
+    def get_metrics_sink(self):
+        """
+        Returns the pyiso.metrics.BaseMetricsSink that record_phase sends measurements to, or None.
+        Set the metrics_sink attribute to use a specific sink for this client;
+        otherwise pyiso.metrics.default_metrics_sink() is used.
+        """
+        if self.metrics_sink is not None:
+            return self.metrics_sink
+        return default_metrics_sink()
+
+    def record_phase(self, phase, seconds, bytes=None, rows=None):
+        """
+        Records one run of a phase of the current call (e.g. 'request' or 'parse_to_df') in the stats attribute,
+        and sends it to the metrics sink as the metrics pyiso.phase.seconds, pyiso.phase.bytes and
+        pyiso.phase.rows, tagged with the client's ba_name and the phase.
+
+        :param str phase: The phase name.
+        :param float seconds: Wall time taken.
+        :param int bytes: Bytes transferred or read, if known.
+        :param int rows: Rows produced, if known.
+        """
+        # clients that do not call BaseClient.__init__
+        if getattr(self, 'stats', None) is None:
+            self.stats = CallStats(self.NAME)
+        self.stats.record(phase, seconds, bytes=bytes, rows=rows)
+
+        sink = self.get_metrics_sink()
+        if sink is None:
+            return
+        tags = {'ba_name': self.NAME, 'phase': phase}
+        try:
+            sink.timing('pyiso.phase.seconds', seconds, tags)
+            if bytes is not None:
+                sink.count('pyiso.phase.bytes', bytes, tags)
+            if rows is not None:
+                sink.count('pyiso.phase.rows', rows, tags)
+        except Exception as e:
+            # metrics must never break data collection
+            LOGGER.warn('%s: metrics sink error for phase %s: %s' % (self.NAME, phase, e))
+
+    def get_session(self):
+        """
+        Returns the client's requests.Session, creating it if needed.
+        All requests made by the client share this session and its connection pool.
+        """
+        try:
+            return getattr(self, 'session')
+        except AttributeError:
+            self.session = requests.Session()
+            return self.session
+
+    def map_concurrently(self, func, items, max_workers=None):
+        """
+        Apply func to each item using a bounded pool of threads and return the results in the order of items.
+        The threads share the client's requests.Session, so connections are reused between requests.
+
+        :param callable func: Function of one argument, usually one that makes a request.
+        :param list items: Arguments to call func with.
+        :param int max_workers: Maximum number of concurrent calls. If not provided, the 'max_workers' option
+            is used if set, otherwise the client's MAX_WORKERS.
+        :return: List of func's return values.
+        :rtype: list
+        """
+        items = list(items)
+        if max_workers is None:
+            max_workers = self.options.get('max_workers', self.MAX_WORKERS)
+        num_workers = min(max_workers, len(items))
+
+        # nothing to gain from a pool
+        if num_workers <= 1:
+            return [func(item) for item in items]
+
+        # create session before spawning threads so that they all share it
+        self.get_session()
+
+        pool = ThreadPool(num_workers)
+        try:
+            return pool.map(func, items, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
     def unzip(self, content):
         """
         Unzip encoded data.
@@ -305,6 +616,8 @@ class BaseClient(object):
         or returns None if an error was encountered.
         ***Previous behavior: Only returned the content from the first file***
         """
+        start = default_timer()
+
         # create zip file
         try:
             filecontent = BytesIO(content)
@@ -322,6 +635,7 @@ class BaseClient(object):
         # have unzipped content
         unzipped = [z.read(thisfile) for thisfile in z.namelist()]
         z.close()
+        self.record_phase('unzip', default_timer() - start, bytes=len(content), rows=len(unzipped))
 
         # return
         return unzipped
@@ -347,6 +661,8 @@ class BaseClient(object):
         allowed_modes = ['csv', 'xls']
         if mode not in allowed_modes:
             raise ValueError('Invalid mode %s' % mode)
+        start = default_timer()
+        num_bytes = len(filelike) if isinstance(filelike, (bytes, str)) else None
 
         # do csv/tsv
         if mode == 'csv':
@@ -360,7 +676,8 @@ class BaseClient(object):
                     filelike = StringIO(filelike)
 
             # read csv
-            kwargs['engine'] = 'python'
+            if 'engine' not in kwargs:
+                kwargs['engine'] = self.csv_engine(**kwargs)
             df = pd.read_csv(filelike, **kwargs)
 
         # do xls
@@ -387,8 +704,33 @@ class BaseClient(object):
         # drop na
         df = df.dropna()
 
+        self.record_phase('parse_to_df', default_timer() - start, bytes=num_bytes, rows=len(df))
         return df
 
+    @staticmethod
+    def csv_engine(**kwargs):
+        """
+        Returns the fastest pandas.read_csv engine that supports the given read_csv kwargs:
+        'c' unless the delimiter is a regular expression or sniffed, or an option only the python engine supports
+        is used.
+        """
+        # sep and delimiter are aliases
+        delimiter = kwargs.get('delimiter', kwargs.get('sep', ','))
+
+        # sniffed delimiter
+        if delimiter is None:
+            return 'python'
+
+        # regex delimiter; the C engine special-cases whitespace
+        if len(delimiter) > 1 and delimiter != '\\s+':
+            return 'python'
+
+        # options not implemented by the C engine
+        if kwargs.get('skipfooter') or kwargs.get('skip_footer'):
+            return 'python'
+
+        return 'c'
+
     def utcify_index(self, local_index, tz_name=None, tz_col=None):
         """
         Convert a DateTimeIndex to UTC.
@@ -396,30 +738,20 @@ class BaseClient(object):
         :param DateTimeIndex local_index: The local DateTimeIndex to be converted.
         :param string tz_name: If local_ts is naive, it is assumed to be in timezone tz.
             If tz is not provided, the client's default timezone is used.
+        :param tz_col: Optional sequence with the timezone name or abbreviation (e.g. EST, EDT) of each row.
+            Rows with unknown timezone names are localized in tz_name.
         :return: DatetimeIndex in UTC.
         :rtype: DatetimeIndex
         """
+        start = default_timer()
+
         # set up tz
         if tz_name is None:
             tz_name = self.TZ_NAME
 
         # use tz col if given
         if tz_col is not None:
-            # it seems like we shouldn't have to iterate, but all the smart ways aren't working
-            aware_utc_list = []
-            for i in range(len(local_index)):
-                try:
-                    aware_local_ts = pytz.timezone(tz_col[i]).localize(local_index[i])
-                except pytz.UnknownTimeZoneError:
-                    # fall back to local ts
-                    aware_local_ts = pytz.timezone(tz_name).localize(local_index[i])
-
-                # utcify
-                aware_utc_ts = self.utcify(aware_local_ts)
-                aware_utc_list.append(aware_utc_ts)
-
-            # indexify
-            aware_utc_index = pd.DatetimeIndex(aware_utc_list)
+            aware_utc_index = self._utcify_index_by_tz_col(local_index, tz_name, tz_col)
 
         else:
             # localize
@@ -442,8 +774,54 @@ class BaseClient(object):
             aware_utc_index = aware_local_index.tz_convert('UTC')
 
         # return
+        self.record_phase('utcify_index', default_timer() - start, rows=len(aware_utc_index))
         return aware_utc_index
 
+    def _utcify_index_by_tz_col(self, local_index, tz_name, tz_col):
+        """
+        Vectorized tz_col path of utcify_index.
+        Rows are grouped by timezone, and each group is localized with one tz_localize call.
+        Groups with an unknown timezone name are localized in tz_name, using the name to decide
+        whether ambiguous times are in daylight saving time (e.g. EDT) or not (e.g. EST).
+        Groups that cannot be localized this way fall back to row-by-row localization.
+        """
+        local_index = pd.DatetimeIndex(local_index)
+        tz_values = np.asarray(tz_col)
+        utc_values = np.empty(len(local_index), dtype='datetime64[ns]')
+
+        for tz_value in pd.unique(tz_values):
+            mask = tz_values == tz_value
+            group_index = local_index[mask]
+            try:
+                try:
+                    aware_group_index = group_index.tz_localize(pytz.timezone(tz_value))
+                except pytz.UnknownTimeZoneError:
+                    is_dst = str(tz_value).upper().endswith('DT')
+                    aware_group_index = group_index.tz_localize(tz_name, ambiguous=np.repeat(is_dst, len(group_index)))
+            except (AmbiguousTimeError, NonExistentTimeError, ValueError) as e:
+                LOGGER.debug(e)
+                aware_group_index = self._utcify_index_rowwise(group_index, tz_name, tz_values[mask])
+
+            # values of an aware index are in UTC
+            utc_values[mask] = aware_group_index.values
+
+        return pd.DatetimeIndex(utc_values).tz_localize('UTC')
+
+    def _utcify_index_rowwise(self, local_index, tz_name, tz_col):
+        """Row-by-row tz_col localization, used as a fallback by _utcify_index_by_tz_col."""
+        aware_utc_list = []
+        for local_ts, tz_value in zip(local_index, tz_col):
+            try:
+                aware_local_ts = pytz.timezone(tz_value).localize(local_ts)
+            except pytz.UnknownTimeZoneError:
+                # fall back to local ts
+                aware_local_ts = pytz.timezone(tz_name).localize(local_ts)
+
+            aware_utc_list.append(aware_local_ts.astimezone(pytz.utc))
+
+        # indexify
+        return pd.DatetimeIndex(aware_utc_list)
+
     def slice_times(self, df, options=None):
         if options is None:
             options = self.options
@@ -463,32 +841,93 @@ class BaseClient(object):
                 raise ValueError('Slicing by time requires start_at and end_at')
 
         # sort before truncate eliminates DST KeyError
+        start = default_timer()
         sorteddf = df.sort_index()
         sliced = sorteddf.truncate(before=start_at, after=end_at)
 
         # return
+        self.record_phase('slice_times', default_timer() - start, rows=len(sliced))
         return sliced
 
     def unpivot(self, df):
         return df.stack().reset_index(level=1)
 
     def serialize(self, df, header, extras={}):
-        data = []
-
-        for row in df.itertuples():
-            dp = dict(zip(header, list(row)))
-            dp.update(extras)
-            data.append(dp)
+        start = default_timer()
+        if self.options.get('output', 'list') != 'list':
+            frame = df.reset_index()
+            frame.columns = header
+            data = self.format_output(self._add_extras(frame, extras))
+        else:
+            data = []
+            for row in df.itertuples():
+                dp = dict(zip(header, list(row)))
+                dp.update(extras)
+                data.append(dp)
 
+        self.record_phase('serialize', default_timer() - start, rows=len(data))
         return data
 
     def serialize_faster(self, df, extras={}, drop_index=False):
         """DF is a DataFrame with DateTimeIndex and columns fuel_type and gen_MW (or load_mW).
         Index and columns are already properly named."""
-        df = df.reset_index(drop=drop_index)
-        for key in extras:
-            df[key] = extras[key]
-        return df.to_dict(orient='records')
+        start = default_timer()
+        if self.options.get('output', 'list') != 'list':
+            if len(df) == 0:
+                data = self.format_output([])
+            else:
+                data = self.format_output(self._add_extras(df.reset_index(drop=drop_index), extras))
+        else:
+            df = df.reset_index(drop=drop_index)
+            for key in extras:
+                df[key] = extras[key]
+            data = df.to_dict(orient='records')
+
+        self.record_phase('serialize_faster', default_timer() - start, rows=len(data))
+        return data
+
+    def format_output(self, data):
+        """
+        Returns data in the format requested by the 'output' option.
+
+        :param data: List of data point dicts, or DataFrame with one row per data point and a timestamp column.
+        :return: If output is 'list' (the default), the list of dicts.
+            If output is 'frame', a DataFrame with a tz-aware UTC timestamp column, categorical string columns
+            (ba_name, freq, market and fuel_name) and float value columns.
+            If output is 'arrays', the same data as a numpy record array, with naive UTC timestamps.
+        """
+        output = self.options.get('output', 'list')
+        if output == 'list':
+            return data
+
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        for col in ['timestamp', 'ba_name', 'freq', 'market']:
+            if col not in frame.columns:
+                frame[col] = None
+
+        # types
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True)
+        for col in frame.columns:
+            if col in ['ba_name', 'freq', 'market', 'fuel_name']:
+                frame[col] = frame[col].astype('category')
+            elif col.endswith('_MW'):
+                frame[col] = frame[col].astype('float64')
+
+        # order columns
+        first_cols = ['timestamp', 'ba_name', 'freq', 'market']
+        frame = frame[first_cols + [col for col in frame.columns if col not in first_cols]]
+
+        if output == 'arrays':
+            frame['timestamp'] = frame['timestamp'].dt.tz_localize(None)
+            return frame.to_records(index=False)
+        return frame.reset_index(drop=True)
+
+    def _add_extras(self, df, extras):
+        """Adds a categorical column to df for each item in extras, without repeating the values as objects."""
+        codes = np.zeros(len(df), dtype='int8')
+        for key, val in extras.items():
+            df[key] = pd.Categorical.from_codes(codes, categories=[val])
+        return df
 
     def local_now(self):
         """Returns a tz-aware datetime equal to the current moment, in the local timezone"""
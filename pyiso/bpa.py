@@ -3,6 +3,7 @@ import pytz
 from dateutil.parser import parse as dateutil_parse
 import pandas as pd
 from pyiso.base import BaseClient
+from pyiso.cache import CacheRule
 from pyiso import LOGGER
 
 
@@ -20,6 +21,11 @@ class BPAClient(BaseClient):
 
     TZ_NAME = 'America/Los_Angeles'
 
+    # yearly files for past years do not change
+    CACHE_RULES = [
+        CacheRule(r'WindGenTotalLoadYTD_(?P<date>\d{4})\.xls$', date_format='%Y', covers=timedelta(days=366)),
+    ]
+
     def fetch_historical(self):
         """Get BPA generation or load data from the far past"""
         # set up requests
@@ -140,7 +146,7 @@ class BPAClient(BaseClient):
 
         # return empty list if null
         if len(df) == 0:
-            return []
+            return self.format_output([])
 
         # parse and clean
         cleaned_df = self.parse_generation(df)
@@ -161,7 +167,7 @@ class BPAClient(BaseClient):
 
         # return empty list if null
         if len(df) == 0:
-            return []
+            return self.format_output([])
 
         # parse and clean
         df.index = self.utcify_index(df.index)
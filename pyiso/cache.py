@@ -0,0 +1,318 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from time import time
+
+import requests
+
+from pyiso import LOGGER
+
+
+class CacheRule(object):
+    """
+    Decides how long responses for matching URLs may be cached.
+
+    Files that cover a fixed period in the past (e.g. a daily report for last week) never change once
+    the source has finished publishing them, so they are cached forever. Files for the current or
+    a future period are cached for ``current_ttl`` seconds, which is 0 (not cached) by default.
+    """
+    def __init__(self, pattern, date_format=None, covers=timedelta(days=1), settled_after=timedelta(days=2),
+                 current_ttl=0):
+        """
+        :param str pattern: Regular expression searched for in the URL. If date_format is given,
+            it must contain a named group ``date``.
+        :param str date_format: strptime format of the ``date`` group.
+            If not provided, every matching URL is cached for ``current_ttl`` seconds.
+        :param timedelta covers: Length of the period that starts at the URL's date and is covered by the file.
+        :param timedelta settled_after: How long after the end of the covered period the file is final.
+        :param int current_ttl: Seconds to cache files that are not yet final.
+        """
+        self.regex = re.compile(pattern)
+        self.date_format = date_format
+        self.covers = covers
+        self.settled_after = settled_after
+        self.current_ttl = current_ttl
+
+    def matches(self, url):
+        return self.regex.search(url) is not None
+
+    def ttl(self, url, utcnow):
+        """
+        :param str url: A URL that this rule matches.
+        :param datetime utcnow: The current naive UTC datetime.
+        :return: Seconds to cache the response for, or None to cache it forever.
+        """
+        if self.date_format is None:
+            return self.current_ttl
+
+        try:
+            file_date = datetime.strptime(self.regex.search(url).group('date'), self.date_format)
+        except (AttributeError, IndexError, ValueError):
+            return self.current_ttl
+
+        if file_date + self.covers + self.settled_after < utcnow:
+            return None
+        return self.current_ttl
+
+
+class BaseCache(object):
+    """
+    Base class for HTTP response caches used by BaseClient.request.
+    """
+    def get(self, key):
+        """
+        :param str key: The cache key, from make_key.
+        :return: The cached response, or None if there is no fresh entry.
+        :rtype: requests.Response
+        """
+        raise NotImplementedError('Derived classes must implement the get method.')
+
+    def set(self, key, response, ttl):
+        """
+        :param str key: The cache key, from make_key.
+        :param requests.Response response: A successful response.
+        :param int ttl: Seconds until the entry expires, or None if it never expires.
+        """
+        raise NotImplementedError('Derived classes must implement the set method.')
+
+    def clear(self):
+        """Removes all entries."""
+        raise NotImplementedError('Derived classes must implement the clear method.')
+
+    @staticmethod
+    def make_key(url, params=None):
+        """
+        :param str url: The request URL.
+        :param dict params: The request query parameters, if any.
+        :return: A key that is the same for equivalent requests.
+        :rtype: str
+        """
+        if not params:
+            return url
+        return url + '?' + json.dumps(sorted((str(k), str(v)) for k, v in params.items()))
+
+    @staticmethod
+    def build_response(url, status_code, headers, content, encoding):
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_code
+        response.headers.update(headers)
+        response._content = content
+        response.encoding = encoding
+        response.from_cache = True
+        return response
+
+
+class SQLiteCache(BaseCache):
+    """
+    Stores responses in a single SQLite file on the local filesystem.
+    When the total size of stored content exceeds max_bytes, the least recently used entries are evicted.
+    """
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        """
+        :param str path: Path of the SQLite database file. Parent directories are created if needed.
+        :param int max_bytes: Upper bound on the total size of cached response bodies.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        dir_name = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('CREATE TABLE IF NOT EXISTS responses ('
+                             'key TEXT PRIMARY KEY, url TEXT, status_code INTEGER, headers TEXT, '
+                             'encoding TEXT, content BLOB, size INTEGER, expires REAL, accessed REAL)')
+                conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        now = time()
+        with self.lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT url, status_code, headers, encoding, content, expires '
+                                   'FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+
+                url, status_code, headers, encoding, content, expires = row
+                if expires is not None and expires < now:
+                    conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    conn.commit()
+                    return None
+
+                conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+                conn.commit()
+            finally:
+                conn.close()
+
+        return self.build_response(url, status_code, json.loads(headers), bytes(content), encoding)
+
+    def set(self, key, response, ttl):
+        now = time()
+        expires = None if ttl is None else now + ttl
+        content = response.content
+        if len(content) > self.max_bytes:
+            LOGGER.debug('Not caching %s: %d bytes exceeds cache size' % (key, len(content)))
+            return
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             (key, response.url, response.status_code, json.dumps(dict(response.headers)),
+                              response.encoding, sqlite3.Binary(content), len(content), expires, now))
+                self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _evict(self, conn, now):
+        # expired entries first
+        conn.execute('DELETE FROM responses WHERE expires IS NOT NULL AND expires < ?', (now,))
+
+        # then least recently used, until under the size bound
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evict_keys = []
+        for key, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed ASC').fetchall():
+            if total <= self.max_bytes:
+                break
+            evict_keys.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM responses WHERE key = ?', evict_keys)
+
+    def clear(self):
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM responses')
+                conn.commit()
+            finally:
+                conn.close()
+
+
+class SQLiteReportStore(object):
+    """
+    Stores data parsed from report files that are updated in place (e.g. a yearly report that gains an hour
+    of data every hour), together with the HTTP validators of the file it was parsed from.
+    Clients can then revalidate the file with a conditional request and parse only what is new.
+    """
+    def __init__(self, path):
+        """
+        :param str path: Path of the SQLite database file. Parent directories are created if needed.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+        dir_name = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('CREATE TABLE IF NOT EXISTS reports ('
+                             'key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, data TEXT, updated REAL)')
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        """
+        :param str key: The report key, usually its URL.
+        :return: Dict with keys etag, last_modified (either may be None) and data (a JSON-decoded value),
+            or None if nothing is stored for the key.
+        :rtype: dict
+        """
+        with self.lock:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT etag, last_modified, data FROM reports WHERE key = ?', (key,)).fetchone()
+            finally:
+                conn.close()
+
+        if row is None:
+            return None
+        etag, last_modified, data = row
+        return {'etag': etag, 'last_modified': last_modified, 'data': json.loads(data)}
+
+    def set(self, key, data, etag=None, last_modified=None):
+        """
+        :param str key: The report key, usually its URL.
+        :param data: A JSON-serializable value.
+        :param str etag: The ETag header of the report response, if any.
+        :param str last_modified: The Last-Modified header of the report response, if any.
+        """
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)',
+                             (key, etag, last_modified, json.dumps(data), time()))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def clear(self):
+        """Removes all entries."""
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM reports')
+                conn.commit()
+            finally:
+                conn.close()
+
+
+# caches shared by all clients, keyed by path
+_shared_caches = {}
+_shared_report_stores = {}
+_shared_caches_lock = threading.Lock()
+
+
+def default_cache():
+    """
+    Returns the cache configured by the PYISO_CACHE_PATH environment variable, or None if it is not set.
+    The size bound defaults to 512MB and can be set in megabytes with PYISO_CACHE_MAX_MB.
+    """
+    path = os.environ.get('PYISO_CACHE_PATH')
+    if not path:
+        return None
+
+    with _shared_caches_lock:
+        if path not in _shared_caches:
+            max_bytes = int(float(os.environ.get('PYISO_CACHE_MAX_MB', 512)) * 1024 * 1024)
+            _shared_caches[path] = SQLiteCache(path, max_bytes=max_bytes)
+        return _shared_caches[path]
+
+
+def default_report_store():
+    """
+    Returns the report store kept alongside the cache configured by the PYISO_CACHE_PATH environment variable,
+    or None if it is not set.
+    """
+    path = os.environ.get('PYISO_CACHE_PATH')
+    if not path:
+        return None
+
+    with _shared_caches_lock:
+        if path not in _shared_report_stores:
+            _shared_report_stores[path] = SQLiteReportStore(path)
+        return _shared_report_stores[path]
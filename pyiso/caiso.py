@@ -1,14 +1,19 @@
 import copy
 import re
+from collections import OrderedDict
 from datetime import datetime, timedelta, time
 from io import BytesIO, StringIO
+from timeit import default_timer
 
+import numpy as np
 import pandas as pd
 import pytz
 from bs4 import BeautifulSoup
+from lxml import etree
 
 from pyiso import LOGGER
 from pyiso.base import BaseClient
+from pyiso.cache import CacheRule
 
 
 class CAISOClient(BaseClient):
@@ -29,6 +34,14 @@ class CAISOClient(BaseClient):
 
     TZ_NAME = 'America/Los_Angeles'
 
+    # a day's DailyRenewablesWatch file is published on the next day
+    STORE_SETTLED_AFTER = timedelta(days=2)
+
+    # renewables watch files for past days do not change
+    CACHE_RULES = [
+        CacheRule(r'/(?P<date>\d{8})_DailyRenewablesWatch\.txt$', date_format='%Y%m%d'),
+    ]
+
     fuels = {
         'GEOTHERMAL': 'geo',
         'BIOMASS': 'biomass',
@@ -43,6 +56,38 @@ class CAISOClient(BaseClient):
         'HYDRO': 'hydro',
     }
 
+    # line that separates DailyRenewablesWatch files when they are parsed together
+    RENEWABLES_FILE_MARKER = '#file'
+
+    # engine used to parse OASIS XML: 'lxml' (streaming, columnar) or 'bs4' (BeautifulSoup elements)
+    OASIS_PARSER = 'lxml'
+
+    # report format requested from OASIS for start_at/end_at queries: 'csv' or 'xml'
+    OASIS_RANGE_FORMAT = 'csv'
+
+    # longest range OASIS accepts in one query; longer ranges are split into windows of this length
+    OASIS_MAX_RANGE = timedelta(days=31)
+
+    # maximum number of windows requested at once. OASIS throttles clients that make
+    # many requests in a short time, so keep this small.
+    OASIS_MAX_WORKERS = 2
+
+    # REPORT_DATA fields that identify a data point, used to dedupe results from adjacent windows
+    oasis_key_columns = ['INTERVAL_START_GMT', 'DATA_ITEM', 'RESOURCE_NAME', 'RENEWABLE_TYPE', 'TRADING_HUB',
+                         'MARKET_RUN_ID']
+
+    # OASIS CSV column names that differ from the corresponding XML REPORT_DATA field names
+    # in order of preference, since some reports have both TAC_AREA_NAME and TAC_ZONE_NAME
+    oasis_csv_columns = [
+        ('INTERVALSTARTTIME_GMT', 'INTERVAL_START_GMT'),
+        ('INTERVALENDTIME_GMT', 'INTERVAL_END_GMT'),
+        ('OPR_DT', 'OPR_DATE'),
+        ('XML_DATA_ITEM', 'DATA_ITEM'),
+        ('MW', 'VALUE'),
+        ('TAC_AREA_NAME', 'RESOURCE_NAME'),
+        ('TAC_ZONE_NAME', 'RESOURCE_NAME'),
+    ]
+
     oasis_markets = {  # {'RT5M': 'RTM', 'DAHR': 'DAM', 'RTHR': 'HASP'}
         BaseClient.MARKET_CHOICES.hourly: 'HASP',
         BaseClient.MARKET_CHOICES.fivemin: 'RTM',  # There are actually three codes used: RTPD (Real-time Pre-dispatch), RTD (real-time dispatch), and RTM (Real-Time Market). I can't figure out what the difference is.
@@ -81,12 +126,27 @@ class CAISOClient(BaseClient):
                             start_at=start_at, end_at=end_at, **kwargs)
 
         if self.options['latest']:
-            return self._generation_latest()
+            return self.format_output(self._generation_latest())
         elif self.options['forecast'] or self.options['market'] == self.MARKET_CHOICES.dam:
-            return self._generation_forecast()
+            return self.format_output(self._generation_forecast())
         else:
             return self._generation_historical()
 
+    def iter_generation(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='gen', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        if self.options['forecast'] or self.options['market'] == self.MARKET_CHOICES.dam:
+            # OASIS queries are split into daily requests
+            for chunk in super(CAISOClient, self).iter_generation(start_at=start_at, end_at=end_at, **kwargs):
+                yield chunk
+        else:
+            # yield each DailyRenewablesWatch file as soon as it is parsed
+            for df in self._iter_generation_historical():
+                if len(df) > 0:
+                    yield self._serialize_generation_historical(df)
+
     def get_load(self, latest=False,
                  start_at=False, end_at=False, **kwargs):
         # set args
@@ -95,7 +155,7 @@ class CAISOClient(BaseClient):
 
         # construct and execute OASIS request
         payload = self.construct_oasis_payload('SLD_FCST')
-        oasis_data = self.fetch_oasis(payload=payload)
+        oasis_data = self.fetch_oasis_data(payload)
 
         # parse data
         parsed_data = self.parse_oasis_demand_forecast(oasis_data)
@@ -112,12 +172,12 @@ class CAISOClient(BaseClient):
 
             # return latest
             if latest_dp:
-                return [latest_dp]
+                return self.format_output([latest_dp])
             else:
-                return []
+                return self.format_output([])
         else:
             # return all data
-            return parsed_data
+            return self.format_output(parsed_data)
 
     def get_trade(self, latest=False,
                   start_at=False, end_at=False, **kwargs):
@@ -127,7 +187,7 @@ class CAISOClient(BaseClient):
 
         # construct and execute OASIS request
         payload = self.construct_oasis_payload('ENE_SLRS')
-        oasis_data = self.fetch_oasis(payload=payload)
+        oasis_data = self.fetch_oasis_data(payload)
 
         # parse data
         parsed_data = self.parse_oasis_slrs(oasis_data)
@@ -144,12 +204,12 @@ class CAISOClient(BaseClient):
 
             # return latest
             if latest_dp:
-                return [latest_dp]
+                return self.format_output([latest_dp])
             else:
-                return []
+                return self.format_output([])
         else:
             # return all data
-            return parsed_data
+            return self.format_output(parsed_data)
 
     def construct_oasis_payload(self, queryname, **kwargs):
         # get start and end times
@@ -200,78 +260,135 @@ class CAISOClient(BaseClient):
         return df
 
     def _generation_historical(self):
-        # set up storage
-        parsed_data = []
-
-        # collect data
+        # fetch every DailyRenewablesWatch file in the range, then parse them all at once
+        dates = self.renewables_watch_dates()
+        responses = self.map_concurrently(self.request, [self.renewables_watch_url(d) for d in dates])
+        files = [(d, response.text) for d, response in zip(dates, responses) if response]
+        df = self.parse_daily_renewables_watch(files)
+
+        # serialize and return
+        if len(df) == 0:
+            return self.format_output([])
+        return self._serialize_generation_historical(df)
+
+    def _serialize_generation_historical(self, df):
+        return self.serialize_faster(df, extras={'ba_name': self.NAME,
+                                                 'market': self.MARKET_CHOICES.hourly,
+                                                 'freq': self.FREQUENCY_CHOICES.hourly})
+
+    def _iter_generation_historical(self):
+        """Yields a sliced DataFrame for each DailyRenewablesWatch file in the requested range."""
+        for request_date in self.renewables_watch_dates():
+            response = self.request(self.renewables_watch_url(request_date))
+            if response:
+                yield self.parse_daily_renewables_watch([(request_date, response.text)])
+
+    def renewables_watch_dates(self):
+        """Returns the local dates of the DailyRenewablesWatch files that cover the requested range."""
         request_date = self.options['start_at'].astimezone(self.ca_tz).date()
         local_end_at = self.options['end_at'].astimezone(self.ca_tz).date()
+        dates = []
         while request_date <= local_end_at:
-            # set up request
-            url_file = request_date.strftime('%Y%m%d_DailyRenewablesWatch.txt')
-            url = self.base_url_gen + url_file
-
-            # carry out request
-            response = self.request(url)
-            if not response:
-                request_date += timedelta(days=1)
-                continue
-
-            dst_error_text = 'The supplied DateTime represents an invalid time.  For example, when the clock is ' \
-                             'adjusted forward, any time in the period that is skipped is invalid.'
-            header_idx = 1
-            for part in [1, 2]:  # process both halves of page (i.e. two parts)
-                num_data_rows = 24
-
-                # The day transitioning to daylight saving time adds extra erroneous lines of text.
-                if part == 1 and dst_error_text in response.text:
-                    num_data_rows = 29
-
-                df = self.parse_to_df(response.text, nrows=num_data_rows, header=header_idx, delimiter='\t+')
-
-                # The day transitioning to daylight saving time has errors in part two of the file that need removal.
-                if part == 2:
-                    df = df[df.THERMAL.map(str) != '#VALUE!']
-
-                # combine date with hours to index
-                try:
-                    indexed = self.set_dt_index(df, request_date, df['Hour'])
-                except Exception as e:
-                    LOGGER.error(e)
-                    continue
-
-                # original header is fuel names
-                indexed.rename(columns=self.fuels, inplace=True)
-
-                # remove non-fuel cols
-                fuel_cols = list(set(self.fuels.values()) & set(indexed.columns))
-                subsetted = indexed[fuel_cols]
-
-                # pivot
-                pivoted = self.unpivot(subsetted)
-                pivoted.rename(columns={'level_1': 'fuel_name', 0: 'gen_MW'}, inplace=True)
-
-                # slice times
-                sliced = self.slice_times(pivoted)
-
-                # store
-                parsed_data += self.serialize(sliced,
-                                      header=['timestamp', 'fuel_name', 'gen_MW'],
-                                      extras={'ba_name': self.NAME,
-                                              'market': self.MARKET_CHOICES.hourly,
-                                              'freq': self.FREQUENCY_CHOICES.hourly})
-
-                # If processing the first part, set the header index for second part.
-                if part == 1:
-                    header_idx = num_data_rows + 3
-
-            # finish day
+            dates.append(request_date)
             request_date += timedelta(days=1)
+        return dates
 
-        # return
-        return parsed_data
+    def renewables_watch_url(self, request_date):
+        return self.base_url_gen + request_date.strftime('%Y%m%d_DailyRenewablesWatch.txt')
 
-    def fetch_oasis(self, payload={}, return_all_files=False):
+    def parse_daily_renewables_watch(self, files):
+        """
+        Parses any number of DailyRenewablesWatch files in one pass.
+
+        Each file has two tab-separated tables, hourly renewables by resource and hourly total production by
+        resource type, each with a header line starting with 'Hour' and one line per hour ending.
+        The lines of all files are split into fields by one C parser pass, empty fields are squeezed out,
+        and the hourly lines of every table are unpivoted together onto one combined index of local hours.
+        Hours that do not exist in local time (on the day daylight saving time starts) and values that are
+        not numbers (e.g. '#VALUE!') are dropped; hours that occur twice (on the day it ends) are taken
+        as daylight saving time.
+
+        :param list files: List of (date, text) tuples of each file's local date and content.
+        :return: DataFrame with a UTC DatetimeIndex named timestamp and columns fuel_name and gen_MW,
+            sliced to the start_at and end_at options. Rows are in the order of the files, then tables,
+            then hours.
+        :rtype: pandas.DataFrame
+        """
+        start = default_timer()
+        empty = pd.DataFrame({'fuel_name': [], 'gen_MW': []},
+                             index=pd.DatetimeIndex([], tz='UTC', name='timestamp'))[['fuel_name', 'gen_MW']]
+        if len(files) == 0:
+            return empty
+
+        # split the lines of all files into fields, with a marker line before each file
+        text = ''.join('%s\t%d\n%s\n' % (self.RENEWABLES_FILE_MARKER, file_idx, content)
+                       for file_idx, (request_date, content) in enumerate(files))
+        num_cols = max(line.count('\t') for line in text.splitlines()) + 1
+        fields = pd.read_csv(StringIO(text), sep='\t', header=None, names=list(range(num_cols)), dtype=str,
+                             engine='c').values
+
+        # squeeze out the empty fields of repeated tabs, keeping the order of the others
+        order = np.argsort(pd.isnull(fields), axis=1, kind='mergesort')
+        tokens = fields[np.arange(len(fields))[:, None], order]
+        first = pd.Series(tokens[:, 0])
+
+        # file and table header of each line
+        is_marker = (first == self.RENEWABLES_FILE_MARKER).values
+        file_idx = pd.Series(np.where(is_marker, tokens[:, 1], None)).ffill().astype(int).values
+        is_header = (first == 'Hour').values
+        header_row = pd.Series(np.where(is_header, np.arange(len(tokens)), np.where(is_marker, -1, np.nan)))
+        header_row = header_row.ffill().fillna(-1).astype(int).values
+        hours = pd.to_numeric(first, errors='coerce').values
+        is_data = ~np.isnan(hours) & (header_row >= 0)
+
+        # unpivot the fuel columns of the tables with the same header together
+        headers = {}
+        for row in np.unique(header_row[is_data]):
+            headers.setdefault(tuple(t for t in tokens[row, 1:] if pd.notnull(t)), []).append(row)
+        rows, cols, fuel_names, values = [], [], [], []
+        for header, header_rows in headers.items():
+            fuel_cols = [(col, self.fuels[name]) for col, name in enumerate(header, start=1) if name in self.fuels]
+            if not fuel_cols:
+                continue
+            table_rows = np.flatnonzero(is_data & pd.Series(header_row).isin(header_rows).values)
+            block = pd.DataFrame(tokens[table_rows][:, [col for col, name in fuel_cols]])
+            rows.append(np.repeat(table_rows, len(fuel_cols)))
+            cols.append(np.tile([col for col, name in fuel_cols], len(table_rows)))
+            fuel_names.append(np.tile([name for col, name in fuel_cols], len(table_rows)))
+            values.append(block.apply(pd.to_numeric, errors='coerce').values.astype('float64').ravel())
+        if not rows:
+            return empty
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        fuel_names, values = np.concatenate(fuel_names), np.concatenate(values)
+        sort_idx = np.lexsort((cols, rows))
+        rows, fuel_names, values = rows[sort_idx], fuel_names[sort_idx], values[sort_idx]
+
+        # localize each distinct local hour once; hours are hour ending
+        dates = np.array([request_date.strftime('%Y-%m-%d') for request_date, content in files], dtype='datetime64[h]')
+        local = dates[file_idx[rows]] + (hours[rows].astype('int64') - 1).astype('timedelta64[h]')
+        local_hours, hour_idx = np.unique(local.astype('datetime64[ns]'), return_inverse=True)
+
+        # drop points in hours that do not exist locally (skipped at the start of DST),
+        # which do not survive a localize round trip
+        tz = pytz.timezone(self.TZ_NAME)
+        exists = np.array([tz.normalize(tz.localize(hour)).replace(tzinfo=None) == hour
+                           for hour in pd.DatetimeIndex(local_hours).to_pydatetime()], dtype=bool)
+        valid = exists[hour_idx]
+        fuel_names, values, hour_idx = fuel_names[valid], values[valid], hour_idx[valid]
+        utc_hours = pd.DatetimeIndex(local_hours[exists]).tz_localize(
+            self.TZ_NAME, ambiguous=np.ones(exists.sum(), dtype=bool)).tz_convert('UTC')
+        timestamps = utc_hours[(np.cumsum(exists) - 1)[hour_idx]]
+
+        # drop invalid points and slice times
+        keep = ~np.isnan(values)
+        keep &= (timestamps >= self.options['start_at']) & (timestamps <= self.options['end_at'])
+        df = pd.DataFrame({'fuel_name': fuel_names[keep], 'gen_MW': values[keep]},
+                          index=timestamps[keep].rename('timestamp'))[['fuel_name', 'gen_MW']]
+
+        self.record_phase('parse_daily_renewables_watch', default_timer() - start, rows=len(df))
+        return df
+
+    def fetch_oasis(self, payload={}, return_all_files=False, parser=None):
         """
         Returns a list of report data elements, or an empty list if an error was encountered.
 
@@ -279,6 +396,10 @@ class CAISOClient(BaseClient):
         this is the default behavior and was used in earlier versions of this function.
 
         If return_all_files=True, will return an array representing the content from each file.
+
+        The report data is parsed by the parser engine, which defaults to the 'oasis_parser' option
+        if set, otherwise OASIS_PARSER. With 'lxml', each file's report data is a DataFrame with one column per
+        REPORT_DATA field (see parse_oasis_xml). With 'bs4', it is a list of BeautifulSoup REPORT_DATA elements.
         """
         # set up storage
         raw_data = []
@@ -288,6 +409,9 @@ class CAISOClient(BaseClient):
         else:
             default_return_val = ''
 
+        if parser is None:
+            parser = self.options.get('oasis_parser', self.OASIS_PARSER)
+
         # try get
         response = self.request(self.base_url_oasis, params=payload)
         if not response:
@@ -299,6 +423,18 @@ class CAISOClient(BaseClient):
         if not content:
             return default_return_val
 
+        if parser == 'lxml':
+            # CSV files are returned as is; any file that is XML instead (OASIS may send an XML error report
+            # or XML data for a CSV request) is parsed, checking for errors
+            csv_requested = payload.get('resultformat', False) == 6
+            try:
+                files = [thisfile if csv_requested and not self.is_xml(thisfile) else self.parse_oasis_xml(thisfile)
+                         for thisfile in (content if return_all_files else content[:1])]
+            except (ValueError, etree.XMLSyntaxError) as e:
+                LOGGER.error('XML error for CAISO OASIS with payload %s: %s' % (payload, e))
+                return default_return_val
+            return files if return_all_files else files[0]
+
         # check xml content for errors
         soup = BeautifulSoup(content[0], 'xml')
         error = soup.find(['error', 'ERROR'])
@@ -324,8 +460,168 @@ class CAISOClient(BaseClient):
                 raw_data = soup.find_all(['REPORT_DATA', 'report_data'])
                 return raw_data
 
+    @staticmethod
+    def is_xml(content):
+        """Returns whether file content from an OASIS zip is XML rather than CSV."""
+        return content.lstrip().startswith(b'<')
+
+    def fetch_oasis_data(self, payload):
+        """
+        Returns the report data for a payload from construct_oasis_payload, in the format expected by the
+        parse_oasis_* methods.
+
+        Queries for a start_at/end_at range are split into windows no longer than OASIS_MAX_RANGE,
+        which are fetched concurrently (see the 'oasis_max_workers' option, default OASIS_MAX_WORKERS)
+        and merged. They request the smaller CSV format and parse it with parse_oasis_csv,
+        unless the 'oasis_format' option (default OASIS_RANGE_FORMAT) is 'xml'.
+        Other queries use fetch_oasis.
+        """
+        if not self.options.get('sliceable', False):
+            return self.fetch_oasis(payload=payload)
+
+        # one payload per window
+        payloads = [dict(payload,
+                         startdatetime=window_start.strftime(self.oasis_request_time_format),
+                         enddatetime=window_end.strftime(self.oasis_request_time_format))
+                    for window_start, window_end in self.oasis_windows(payload)]
+
+        # fetch windows concurrently
+        if self.options.get('oasis_format', self.OASIS_RANGE_FORMAT) == 'csv':
+            def fetch_window(window_payload):
+                files = self.fetch_oasis(payload=dict(window_payload, resultformat=6),
+                                         return_all_files=True, parser='lxml')
+                # files that were XML are already parsed
+                return [content if isinstance(content, pd.DataFrame) else self.parse_oasis_csv(content)
+                        for content in files]
+        else:
+            def fetch_window(window_payload):
+                return [self.fetch_oasis(payload=window_payload)]
+        max_workers = self.options.get('oasis_max_workers', self.OASIS_MAX_WORKERS)
+        pieces = [piece for window_pieces in self.map_concurrently(fetch_window, payloads, max_workers=max_workers)
+                  for piece in window_pieces]
+
+        # merge
+        return self.merge_oasis_data(pieces)
+
+    def oasis_windows(self, payload):
+        """
+        Splits the startdatetime..enddatetime range of an OASIS payload into consecutive windows
+        no longer than OASIS_MAX_RANGE.
+
+        :param dict payload: Payload from construct_oasis_payload.
+        :return: List of (start, end) naive UTC datetimes.
+        :rtype: list
+        """
+        range_start = datetime.strptime(payload['startdatetime'], self.oasis_request_time_format)
+        range_end = datetime.strptime(payload['enddatetime'], self.oasis_request_time_format)
+
+        windows = []
+        window_start = range_start
+        while window_start < range_end:
+            window_end = min(window_start + self.OASIS_MAX_RANGE, range_end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        # empty range: keep the single request
+        if len(windows) == 0:
+            windows.append((range_start, range_end))
+        return windows
+
+    def merge_oasis_data(self, pieces):
+        """
+        Combines report data from several fetches into one result of the same type.
+        DataFrames are concatenated and, if there is more than one, deduped on oasis_key_columns,
+        keeping the last row for each key. Lists of BeautifulSoup elements are concatenated.
+        """
+        # drop failed fetches
+        pieces = [piece for piece in pieces if len(piece) > 0]
+        if len(pieces) == 0:
+            return []
+
+        if isinstance(pieces[0], pd.DataFrame):
+            df = pd.concat(pieces, ignore_index=True)
+            key_columns = [column for column in self.oasis_key_columns if column in df.columns]
+            if len(pieces) > 1 and key_columns:
+                df = df.drop_duplicates(subset=key_columns, keep='last').reset_index(drop=True)
+            return df
+
+        merged = []
+        for piece in pieces:
+            merged.extend(piece)
+        return merged
+
+    def parse_oasis_csv(self, content):
+        """
+        Parse an OASIS CSV report with the C parser engine.
+
+        :param bytes content: The CSV report.
+        :return: DataFrame with one row per report data point and the same column names
+            as the DataFrames from parse_oasis_xml (e.g. DATA_ITEM, INTERVAL_START_GMT, VALUE).
+        :rtype: pandas.DataFrame
+        """
+        df = pd.read_csv(BytesIO(content), engine='c')
+
+        # rename columns to xml field names, keeping any that are already present
+        columns = {}
+        for csv_name, xml_name in self.oasis_csv_columns:
+            if csv_name in df.columns and xml_name not in df.columns and xml_name not in columns.values():
+                columns[csv_name] = xml_name
+        return df.rename(columns=columns)
+
+    def parse_oasis_xml(self, content):
+        """
+        Parse an OASIS XML report in a single streaming pass.
+        Each REPORT_DATA element is cleared as soon as its fields have been read,
+        so memory use does not grow with the size of the report tree.
+
+        :param bytes content: The XML report.
+        :return: DataFrame with one row per REPORT_DATA element and one string column per field,
+            with upper case field names (e.g. DATA_ITEM, INTERVAL_START_GMT, VALUE).
+        :rtype: pandas.DataFrame
+        :raises ValueError: If the report is an OASIS error report.
+        """
+        columns = OrderedDict()
+        n_rows = 0
+
+        # recover from malformed markup, as BeautifulSoup did
+        for event, elem in etree.iterparse(BytesIO(content), events=('end',), recover=True):
+            name = etree.QName(elem).localname.upper()
+
+            if name == 'REPORT_DATA':
+                # store fields
+                for child in elem:
+                    field = etree.QName(child).localname.upper()
+                    column = columns.setdefault(field, [])
+                    if len(column) < n_rows:
+                        # field missing from earlier rows
+                        column.extend([None] * (n_rows - len(column)))
+                    column.append(child.text)
+                n_rows += 1
+
+                # free memory used by this and preceding elements
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+            elif name == 'ERROR':
+                fields = dict((etree.QName(child).localname.upper(), child.text) for child in elem)
+                raise ValueError('%s %s' % (fields.get('ERR_CODE'), fields.get('ERR_DESC')))
+
+        # fields missing from the last rows
+        for column in columns.values():
+            column.extend([None] * (n_rows - len(column)))
+
+        return pd.DataFrame(columns)
+
+    def _oasis_frame_timestamps(self, df):
+        """Returns a list of UTC datetimes parsed from the INTERVAL_START_GMT column."""
+        return list(pd.to_datetime(df['INTERVAL_START_GMT'], utc=True).dt.to_pydatetime())
+
     def parse_oasis_renewable(self, raw_data):
         """Parse raw data output of fetch_oasis for renewables."""
+        if isinstance(raw_data, pd.DataFrame):
+            return self._parse_oasis_renewable_frame(raw_data)
+
         # set up storage
         preparsed_data = {}
         parsed_data = []
@@ -368,6 +664,32 @@ class CAISOClient(BaseClient):
         # return
         return parsed_data
 
+    def _parse_oasis_renewable_frame(self, df):
+        """Columnar version of parse_oasis_renewable, for DataFrames from parse_oasis_xml."""
+        freq = self.options.get('freq', self.FREQUENCY_CHOICES.hourly)
+        market = self.options.get('market', self.MARKET_CHOICES.hourly)
+        if len(df) == 0:
+            return []
+
+        # sum values by timestamp and fuel
+        timestamps = self._oasis_frame_timestamps(df)
+        values = pd.DataFrame({
+            'timestamp': timestamps,
+            'fuel_name': df['RENEWABLE_TYPE'].str.lower().values,
+            'gen_MW': pd.to_numeric(df['VALUE'], errors='coerce').values,
+        }).dropna()
+        totals = values.groupby(['timestamp', 'fuel_name'])['gen_MW'].sum().to_dict()
+
+        # collect values into dps, in order of first appearance
+        parsed_data = []
+        for ts in OrderedDict.fromkeys(timestamps):
+            for fuel_name in ['wind', 'solar']:
+                parsed_data.append({'timestamp': ts, 'freq': freq, 'market': market, 'ba_name': self.NAME,
+                                    'fuel_name': fuel_name, 'gen_MW': float(totals.get((ts, fuel_name), 0))})
+
+        # return
+        return parsed_data
+
     def parse_oasis_slrs(self, raw_data):
         """Parse raw data output of fetch_oasis for System Load and Resource Schedules."""
         # set strings to search on
@@ -384,9 +706,47 @@ class CAISOClient(BaseClient):
         freq = self.options.get('freq', self.FREQUENCY_CHOICES.fivemin)
         market = self.options.get('market', self.MARKET_CHOICES.fivemin)
 
+        if isinstance(raw_data, pd.DataFrame):
+            extracted_data = self._extract_oasis_slrs_frame(raw_data, data_items)
+        else:
+            extracted_data = self._extract_oasis_slrs_soup(raw_data, data_items)
+
+        # assemble data
+        parsed_data = []
+        for ts in sorted(extracted_data.keys()):
+            parsed_dp = {data_label: extracted_data[ts]}
+            parsed_dp.update({'timestamp': ts, 'freq': freq, 'market': market, 'ba_name': self.NAME})
+            if self.options['data'] == 'gen':
+                parsed_dp.update({'fuel_name': 'other'})
+
+            # add to storage
+            parsed_data.append(parsed_dp)
+
+        # return
+        return parsed_data
+
+    def _extract_oasis_slrs_frame(self, df, data_items):
+        """Returns a dict from timestamp to summed value of data_items, with imports negated."""
+        if len(df) == 0:
+            return {}
+
+        # filter rows
+        df = df[df['DATA_ITEM'].isin(data_items)]
+        if len(df) == 0:
+            return {}
+
+        # parse values, imports are negative exports
+        values = pd.to_numeric(df['VALUE'])
+        values = values.where(df['DATA_ITEM'] != 'ISO_TOT_IMP_MW', -values)
+
+        # sum by timestamp
+        totals = pd.Series(values.values, index=self._oasis_frame_timestamps(df)).groupby(level=0).sum()
+        return dict(zip(totals.index.to_pydatetime(), totals.values.tolist()))
+
+    def _extract_oasis_slrs_soup(self, raw_data, data_items):
+        """Returns a dict from timestamp to summed value of data_items, with imports negated."""
         # set up storage
         extracted_data = {}
-        parsed_data = []
 
         # extract values from xml
         for raw_soup_dp in raw_data:
@@ -407,18 +767,8 @@ class CAISOClient(BaseClient):
                 except KeyError:
                     extracted_data[ts] = val
 
-        # assemble data
-        for ts in sorted(extracted_data.keys()):
-            parsed_dp = {data_label: extracted_data[ts]}
-            parsed_dp.update({'timestamp': ts, 'freq': freq, 'market': market, 'ba_name': self.NAME})
-            if self.options['data'] == 'gen':
-                parsed_dp.update({'fuel_name': 'other'})
-
-            # add to storage
-            parsed_data.append(parsed_dp)
-
         # return
-        return parsed_data
+        return extracted_data
 
     def parse_oasis_demand_forecast(self, raw_data):
         """Parse raw data output of fetch_oasis for system-wide 5-min RTM demand forecast."""
@@ -433,6 +783,19 @@ class CAISOClient(BaseClient):
         else:
             data_item_key = 'SYS_FCST_5MIN_MW'
 
+        if isinstance(raw_data, pd.DataFrame):
+            if len(raw_data) == 0:
+                return []
+
+            # filter rows
+            df = raw_data[(raw_data['DATA_ITEM'] == data_item_key) & (raw_data['RESOURCE_NAME'] == 'CA ISO-TAC')]
+
+            # collect values into dps
+            for ts, load_MW in zip(self._oasis_frame_timestamps(df), pd.to_numeric(df['VALUE']).tolist()):
+                parsed_data.append({'timestamp': ts, 'freq': freq, 'market': market, 'ba_name': self.NAME,
+                                    'load_MW': load_MW})
+            return parsed_data
+
         # extract values from xml
         for raw_soup_dp in raw_data:
             if raw_soup_dp.find(['DATA_ITEM', 'data_item']).string == data_item_key and \
@@ -555,12 +918,12 @@ class CAISOClient(BaseClient):
 
         # get OASIS total gen data
         gen_payload = self.construct_oasis_payload(queryname='ENE_SLRS', schedule='ALL')
-        gen_oasis_data = self.fetch_oasis(payload=gen_payload)
+        gen_oasis_data = self.fetch_oasis_data(gen_payload)
         gen_dps = self.parse_oasis_slrs(gen_oasis_data)
 
         # get OASIS renewable gen data
         ren_payload = self.construct_oasis_payload(queryname='SLD_REN_FCST')
-        ren_oasis_data = self.fetch_oasis(payload=ren_payload)
+        ren_oasis_data = self.fetch_oasis_data(ren_payload)
         ren_dps = self.parse_oasis_renewable(ren_oasis_data)
 
         # set of times with both gen and renewable data
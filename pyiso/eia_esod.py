@@ -1,5 +1,7 @@
 from pyiso.base import BaseClient
 import json
+import numpy as np
+import pandas as pd
 from os import environ
 from dateutil.parser import parse as dateutil_parse
 from datetime import datetime, timedelta
@@ -31,6 +33,12 @@ class EIAClient(BaseClient):
 
     FUEL_CHOICES = ['other']
 
+    # hourly data is published about a day late
+    STORE_SETTLED_AFTER = timedelta(days=2)
+
+    # maximum number of series the EIA API accepts in one request
+    EIA_MAX_SERIES_PER_REQUEST = 100
+
     EIA_BAs = ['AEC', 'AECI', 'AESO', 'AVA', 'AZPS', 'BANC', 'BCTC',
                'BPAT', 'CISO', 'CFE', 'CHPD', 'CISO', 'CPLE', 'CPLW',
                'DEAA', 'DOPD', 'DUK', 'EEI', 'EPE', 'ERCO', 'FMPP',
@@ -57,6 +65,10 @@ class EIAClient(BaseClient):
 
         self.TZ_NAME = 'UTC'
 
+    def store_name(self):
+        # one client serves many BAs
+        return '%s.%s' % (self.NAME, getattr(self, 'BA', None))
+
     def set_ba(self, bal_auth):
         if bal_auth in self.EIA_BAs:
             self.BA = bal_auth
@@ -122,6 +134,106 @@ class EIAClient(BaseClient):
             LOGGER.error('No results for %s' % self.BA)
             return []
 
+    def get_generation_many(self, bas=None, latest=False, yesterday=False,
+                            start_at=False, end_at=False, **kwargs):
+        """
+        Scrape and parse generation fuel mix data for several BAs at once.
+
+        :param list bas: BAs from EIA_BAs. If not provided, all of them.
+        :return: The data points of all BAs, each with its BA as ba_name, in the format set by the output option.
+        """
+        return self._get_many(bas, data='gen', latest=latest, yesterday=yesterday,
+                              start_at=start_at, end_at=end_at, **kwargs)
+
+    def get_load_many(self, bas=None, latest=False, yesterday=False, start_at=False,
+                      end_at=False, forecast=False, **kwargs):
+        """
+        Scrape and parse load data for several BAs at once.
+
+        :param list bas: BAs from EIA_BAs. If not provided, all of them.
+        :return: The data points of all BAs, each with its BA as ba_name, in the format set by the output option.
+        """
+        return self._get_many(bas, data='load', latest=latest, yesterday=yesterday,
+                              start_at=start_at, end_at=end_at, forecast=forecast, **kwargs)
+
+    def get_trade_many(self, bas=None, latest=False, yesterday=False, start_at=False,
+                       end_at=False, **kwargs):
+        """
+        Scrape and parse import/export data for several BAs at once.
+
+        :param list bas: BAs from EIA_BAs. If not provided, all of them.
+        :return: The data points of all BAs, each with its BA as ba_name, in the format set by the output option.
+        """
+        return self._get_many(bas, data='trade', latest=latest, yesterday=yesterday,
+                              start_at=start_at, end_at=end_at, **kwargs)
+
+    def _get_many(self, bas, **kwargs):
+        """
+        Requests the series of all BAs in batches of up to EIA_MAX_SERIES_PER_REQUEST series,
+        fetched concurrently, and formats each BA's series as its get_* method would.
+        BAs whose data is not available for the options are skipped.
+        """
+        if bas is None:
+            bas = sorted(set(self.EIA_BAs))
+        for ba in bas:
+            if ba not in self.EIA_BAs:
+                LOGGER.error('Unknown BA: %s' % ba)
+                raise ValueError('Unknown BA: %s' % ba)
+        if len(bas) == 0:
+            return []
+
+        original_ba = getattr(self, 'BA', None)
+        try:
+            self.BA = bas[0]
+            self.handle_options(**kwargs)
+            suffix = self.series_suffix()
+
+            supported_bas = []
+            for ba in bas:
+                self.BA = ba
+                try:
+                    self.handle_ba_limitations()
+                except ValueError as e:
+                    LOGGER.warn('Skipping %s: %s' % (ba, e))
+                    continue
+                supported_bas.append(ba)
+
+            # request batches concurrently
+            batches = [supported_bas[i:i + self.EIA_MAX_SERIES_PER_REQUEST]
+                       for i in range(0, len(supported_bas), self.EIA_MAX_SERIES_PER_REQUEST)]
+            urls = [self.series_url(['EBA.%s%s' % (ba, suffix) for ba in batch]) for batch in batches]
+            responses = self.map_concurrently(lambda url: self.request(url), urls)
+
+            series_by_ba = {}
+            for batch, response in zip(batches, responses):
+                if response is None:
+                    LOGGER.error('No results for %s' % ', '.join(batch))
+                    continue
+                result_json = json.loads(response.text)
+                batch_series_ids = dict(('EBA.%s%s' % (ba, suffix), ba) for ba in batch)
+                for series in result_json.get('series', []):
+                    if series.get('series_id') in batch_series_ids:
+                        series_by_ba[batch_series_ids[series['series_id']]] = (result_json.get('request'), series)
+
+            # format each BA's series
+            frames = []
+            for ba in supported_bas:
+                if ba not in series_by_ba:
+                    LOGGER.error('No results for %s' % ba)
+                    continue
+                self.BA = ba
+                request, series = series_by_ba[ba]
+                frames.append(self.format_result_df({'request': request, 'series': [series]}))
+        finally:
+            if original_ba is None:
+                del self.BA
+            else:
+                self.BA = original_ba
+
+        if self.options.get('output', 'list') != 'list':
+            return self.format_output(pd.concat(frames, ignore_index=True) if frames else [])
+        return [dp for df in frames for dp in df.to_dict(orient='records')]
+
     def handle_options(self, **kwargs):
         """
         Process and store keyword argument options.
@@ -178,22 +290,30 @@ class EIAClient(BaseClient):
             raise ValueError('Data not currently supported for Canada and Mexico')
 
     def set_url(self, type, series_id_suffix):
-        url_format = '{base_url}/series/?api_key={api_key}&series_id=EBA.{ba}{suffix}'
-        self.url = url_format.format(base_url=self.base_url, api_key=self.auth, ba=self.BA, suffix=series_id_suffix)
+        self.url = self.series_url(['EBA.{ba}{suffix}'.format(ba=self.BA, suffix=series_id_suffix)])
+
+    def series_url(self, series_ids):
+        """Returns the EIA API URL requesting all of series_ids."""
+        url_format = '{base_url}/series/?api_key={api_key}&series_id={series_ids}'
+        return url_format.format(base_url=self.base_url, api_key=self.auth, series_ids=';'.join(series_ids))
 
     def format_url(self):
         """Set EIA API URL based on options"""
+        self.set_url('series', self.series_suffix())
+
+    def series_suffix(self):
+        """Returns the part of the EIA series ID after the BA (e.g. '-ALL.D.H') for the options"""
         if self.options['data'] == 'gen':
             if self.options['forecast']:
                 LOGGER.error('Forecast not supported for generation.')
                 raise ValueError('Forecast not supported for generation.')
             else:
-                self.set_url('series', '-ALL.NG.H')
+                return '-ALL.NG.H'
         elif self.options['data'] == 'load':
             if self.options['forecast']:
-                    self.set_url('series', '-ALL.DF.H')
+                    return '-ALL.DF.H'
             else:
-                self.set_url('series', '-ALL.D.H')
+                return '-ALL.D.H'
         elif self.options['data'] == 'trade':
             if self.options['forecast']:
                 LOGGER.error('Forecast not supported for generation.')
@@ -203,21 +323,9 @@ class EIAClient(BaseClient):
                     LOGGER.error('Forecast not supported for generation.')
                     raise ValueError('Forecast not supported for trade.')
                 else:
-                    self.set_url('series', '-ALL.TI.H')
+                    return '-ALL.TI.H'
             else:
-                self.set_url('series', '-ALL.TI.H')
-
-    def format_data(self, data):
-        """Convert load data to int, handle None"""
-        if data is None:
-            return 0
-        else:
-            return int(data)
-
-    def add_gen_data(self, data_list):
-        for i in data_list:
-            i['fuel_name'] = 'other'
-        return data_list
+                return '-ALL.TI.H'
 
     def _set_market(self):
         if self.options['forecast']:
@@ -235,69 +343,30 @@ class EIAClient(BaseClient):
             data_type = 'load_MW'
         return data_type
 
-    def _format_list(self, data, timestamp, d_type, mkt):
-        pyiso_format = {
-                        'ba_name': self.BA,
-                        'timestamp': timestamp,
-                        'freq': self.options['freq'],
-                        d_type: data,
-                        'market': mkt
-                    }
-        return pyiso_format
-
-    def _format_latest(self, data, d_type, mkt):
-        formatted_list = []
-        last_datapoint = data['series'][0]['data'][0]
-        timestamp = self.utcify(dateutil_parse(last_datapoint[0]))
-        data = self.format_data(last_datapoint[1])
-        formatted = self._format_list(data, timestamp, d_type, mkt)
-        formatted_list.append(formatted)  # will be just one
-        return formatted_list
-
-    def _format_yesterday(self, data, d_type, mkt):
-        formatted_list = []
-        yesterday = self.local_now() - timedelta(days=1)
-        for i in data['series']:
-            for j in i['data']:
-                timestamp = self.utcify(dateutil_parse(j[0]))
-                data = self.format_data(j[1])
-                if timestamp.year == yesterday.year and \
-                   timestamp.month == yesterday.month and \
-                   timestamp.day == yesterday.day:
-                    formatted = self._format_list(data, timestamp, d_type, mkt)
-                    formatted_list.append(formatted)
-        return formatted_list
-
-    def _format_general(self, data, d_type, mkt):
-        formatted_list = []
-        for i in data['series']:
-            for j in i['data']:
-                timestamp = self.utcify(dateutil_parse(j[0]))
-                data = self.format_data(j[1])
-                formatted = self._format_list(data, timestamp, d_type, mkt)
-                formatted_list.append(formatted)
-        return formatted_list
-
-    def _format_start_end(self, data):
-        formatted_sliced = []
-        if 'gen' not in self.options['data']:
-            formatted_sliced = [i for i in data if i['timestamp'] >= self.options['start_at'] and i['timestamp'] <= self.options['end_at']]
-        else:
-            try:
-                yesterday = (self.local_now() - timedelta(days=2)).replace(hour=0, minute=0,
-                                                                           second=0, microsecond=0)
-                tomorrow = (self.local_now() + timedelta(days=1)).replace(hour=23, minute=0,
-                                                                          second=0, microsecond=0)
-                assert ((self.options['start_at'] >= yesterday) and (self.options['end_at'] <= tomorrow))
-                formatted_sliced = [i for i in data if i['timestamp'] >= self.options['start_at'] and i['timestamp'] <= self.options['end_at']]
-            except:
-                LOGGER.error('Generation data error for %s' % self.BA)
-                raise ValueError('Generation data is available for the \
-                                 previous and current day.', self.options)
-        return formatted_sliced
-
-    def format_result(self, data):
-        """Output EIA API results in pyiso format"""
+    def _parse_timestamps(self, timestamps):
+        """Parse EIA timestamp strings into a tz-aware UTC DatetimeIndex"""
+        try:
+            # hourly series use the compact UTC format, e.g. 20171120T23Z
+            return pd.to_datetime(timestamps, format='%Y%m%dT%HZ', utc=True)
+        except ValueError:
+            return pd.to_datetime([self.utcify(dateutil_parse(ts)) for ts in timestamps], utc=True)
+
+    def _check_gen_range(self):
+        """Raise ValueError unless start_at and end_at are within the days that have generation data"""
+        yesterday = (self.local_now() - timedelta(days=2)).replace(hour=0, minute=0,
+                                                                   second=0, microsecond=0)
+        tomorrow = (self.local_now() + timedelta(days=1)).replace(hour=23, minute=0,
+                                                                  second=0, microsecond=0)
+        if not ((self.options['start_at'] >= yesterday) and (self.options['end_at'] <= tomorrow)):
+            LOGGER.error('Generation data error for %s' % self.BA)
+            raise ValueError('Generation data is available for the \
+                             previous and current day.', self.options)
+
+    def format_result_df(self, data):
+        """
+        Output EIA API results as a DataFrame in pyiso format, with one row per data point.
+        The timestamps of all points are parsed at once and filtered with boolean masks.
+        """
         try:
             assert('series' in data)
         except:
@@ -305,16 +374,47 @@ class EIAClient(BaseClient):
             raise ValueError('Query error for %s:' % data['request'])
         market = self._set_market()
         data_type = self._set_data_type()
-        data_formatted = []
+
         if self.options['latest']:
-            data_formatted = self._format_latest(data, data_type, market)
-        elif self.options['yesterday']:
-            data_formatted = self._format_yesterday(data, data_type, market)
+            points = data['series'][0]['data'][:1]
         else:
-            data_formatted = self._format_general(data, data_type, market)
+            points = [point for series in data['series'] for point in series['data']]
+        timestamps = self._parse_timestamps([point[0] for point in points])
+
+        # missing values are 0
+        values = np.array([point[1] for point in points], dtype='float64')
+        values = np.nan_to_num(values).astype('int64')
+
+        mask = np.ones(len(points), dtype=bool)
+        if self.options['latest']:
+            pass
+        elif self.options['yesterday']:
+            yesterday = self.local_now() - timedelta(days=1)
+            yesterday_start = pd.Timestamp(datetime(yesterday.year, yesterday.month, yesterday.day), tz=pytz.utc)
+            mask &= (timestamps >= yesterday_start) & (timestamps < yesterday_start + timedelta(days=1))
 
         if self.options['start_at'] and self.options['end_at']:
-            data_formatted = self._format_start_end(data_formatted)
+            if 'gen' in self.options['data']:
+                self._check_gen_range()
+            mask &= (timestamps >= self.options['start_at']) & (timestamps <= self.options['end_at'])
+
+        df = pd.DataFrame({
+            'ba_name': self.BA,
+            'timestamp': timestamps[mask],
+            'freq': self.options['freq'],
+            data_type: values[mask],
+            'market': market,
+        }, columns=['ba_name', 'timestamp', 'freq', data_type, 'market'])
         if self.options['data'] == 'gen':
-            data_formatted = self.add_gen_data(data_formatted)
-        return data_formatted
+            df['fuel_name'] = 'other'
+        return df
+
+    def format_result(self, data):
+        """
+        Output EIA API results in pyiso format: a list of dicts,
+        or a DataFrame or record array if requested by the output option.
+        """
+        df = self.format_result_df(data)
+        if self.options.get('output', 'list') != 'list':
+            return self.format_output(df)
+        return df.to_dict(orient='records')
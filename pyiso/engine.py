@@ -0,0 +1,91 @@
+import threading
+from multiprocessing.pool import ThreadPool
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pyiso import BALANCING_AUTHORITIES, LOGGER, client_factory
+
+
+# maximum number of open connections to any one host
+PER_HOST_CONNECTIONS = 4
+
+# data type -> client method
+GETTERS = {
+    'gen': 'get_generation',
+    'load': 'get_load',
+    'trade': 'get_trade',
+}
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def shared_session():
+    """
+    Returns a requests.Session shared by all clients used by fetch_all, creating it if needed.
+    Its connection pools keep connections to every host alive between sweeps, and block rather than open
+    more than PER_HOST_CONNECTIONS connections to one host.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(BALANCING_AUTHORITIES),
+                                  pool_maxsize=PER_HOST_CONNECTIONS, pool_block=True)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _shared_session = session
+        return _shared_session
+
+
+def fetch_all(data='gen', latest=True, ba_names=None, max_workers=None, session=None, **kwargs):
+    """
+    Get data for many balancing authorities at once.
+    Every balancing authority is polled concurrently, and all clients share one pooled session,
+    so a sweep of latest data takes roughly as long as the slowest single balancing authority.
+
+    :param str data: One of 'gen', 'load' or 'trade'.
+    :param bool latest: Passed to each client's get_* method.
+    :param list ba_names: Balancing authorities to poll. Defaults to all keys of BALANCING_AUTHORITIES.
+    :param int max_workers: Maximum number of balancing authorities polled at the same time.
+        Defaults to one per balancing authority.
+    :param requests.Session session: Session to make requests with. Defaults to shared_session().
+    :param kwargs: Other options passed to each client's get_* method.
+    :return: Dict from balancing authority name to the data returned by its client.
+        Balancing authorities that do not provide the data type, or whose client raised an error, are omitted.
+    :rtype: dict
+    """
+    try:
+        method_name = GETTERS[data]
+    except KeyError:
+        raise ValueError('data must be one of %s, not %s' % (sorted(GETTERS.keys()), data))
+
+    if ba_names is None:
+        ba_names = sorted(BALANCING_AUTHORITIES.keys())
+    if session is None:
+        session = shared_session()
+
+    def fetch(ba_name):
+        try:
+            client = client_factory(ba_name)
+            client.session = session
+            return ba_name, getattr(client, method_name)(latest=latest, **kwargs)
+        except NotImplementedError:
+            LOGGER.debug('%s: %s not implemented' % (ba_name, method_name))
+        except Exception as e:
+            LOGGER.error('%s: error in %s: %s' % (ba_name, method_name, e))
+        return ba_name, None
+
+    num_workers = min(max_workers or len(ba_names), len(ba_names))
+    if num_workers <= 1:
+        results = [fetch(ba_name) for ba_name in ba_names]
+    else:
+        pool = ThreadPool(num_workers)
+        try:
+            results = pool.map(fetch, ba_names, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    return dict((ba_name, result) for ba_name, result in results if result is not None)
@@ -1,6 +1,7 @@
 import time
 from pyiso.base import BaseClient
 from pyiso import LOGGER
+from pyiso.ratelimit import shared_rate_limiter
 import requests
 import pandas as pd
 import numpy as np
@@ -8,7 +9,8 @@ from io import StringIO
 from datetime import datetime, timedelta
 import pytz
 from os import environ
-from lxml import objectify
+from lxml import etree
+from timeit import default_timer
 import re
 
 
@@ -40,6 +42,15 @@ class EUClient(BaseClient):
     TZ_NAME = 'UTC'
     base_url = 'https://transparency.entsoe.eu/api'
 
+    # longest range the API accepts in one query; longer ranges are split into windows of this length
+    ENTSOE_MAX_RANGE = timedelta(days=365)
+
+    # maximum number of queries requested at once
+    ENTSOE_MAX_WORKERS = 8
+
+    # requests allowed per security token per minute, shared by all clients using the token
+    ENTSOE_MAX_REQUESTS_PER_MINUTE = 400
+
     CONTROL_AREAS = {
         'AL': {'country': 'Albania', 'Code': 'CTA|AL',
             'ENTSOe_ID': '10YAL-KESH-----5',
@@ -48,7 +59,7 @@ class EUClient(BaseClient):
             'ENTSOe_ID': '10YAT-APG------L',
             'gen_freq': '15m', 'gen_market': 'RTPD'},
         'BY': {'country': 'Belarus', 'Code': 'CTA|BY',
-            'ENSTOe_ID': '10Y1001A1001S51S',
+            'ENTSOe_ID': '10Y1001A1001S51S',
             'gen_freq': '1hr', 'gen_market': 'RTHR'},
         'BE': {'country': 'Belgium', 'Code': 'CTA|BE',
             'ENTSOe_ID': '10YBE----------2',
@@ -216,16 +227,42 @@ class EUClient(BaseClient):
         self.handle_options(data='load', start_at=start_at, end_at=end_at, forecast=forecast,
                             latest=latest, control_area=control_area, **kwargs)
 
-        response = self.fetch_entsoe()
-        return self.parse_response(response)
+        return self.fetch_and_parse([self.options['control_area']])
 
     def get_generation(self, control_area=None, latest=False, yesterday=False, start_at=False, 
                        end_at=False, forecast=False, **kwargs):
         self.handle_options(data='gen', start_at=start_at, end_at=end_at, yesterday=yesterday, 
                             latest=latest, control_area=control_area, forecast=False, **kwargs)
 
-        response = self.fetch_entsoe()
-        return self.parse_response(response)
+        return self.fetch_and_parse([self.options['control_area']])
+
+    def get_load_many(self, control_areas=None, latest=False, start_at=None, end_at=None,
+                      forecast=False, **kwargs):
+        """
+        Get load for several control areas at once, with the same options as get_load.
+
+        :param list control_areas: Control area codes, keys of CONTROL_AREAS. If not provided, all control areas.
+        :return: The combined data points of all control areas, each with its control area as ba_name,
+            in the format set by the output option.
+        """
+        self.handle_options(data='load', start_at=start_at, end_at=end_at, forecast=forecast,
+                            latest=latest, **kwargs)
+
+        return self.fetch_and_parse(control_areas)
+
+    def get_generation_many(self, control_areas=None, latest=False, yesterday=False, start_at=False,
+                            end_at=False, **kwargs):
+        """
+        Get generation for several control areas at once, with the same options as get_generation.
+
+        :param list control_areas: Control area codes, keys of CONTROL_AREAS. If not provided, all control areas.
+        :return: The combined data points of all control areas, each with its control area as ba_name,
+            in the format set by the output option.
+        """
+        self.handle_options(data='gen', start_at=start_at, end_at=end_at, yesterday=yesterday,
+                            latest=latest, forecast=False, **kwargs)
+
+        return self.fetch_and_parse(control_areas)
 
     def handle_options(self, **kwargs):
         # regular handle options
@@ -240,16 +277,91 @@ class EUClient(BaseClient):
         if 'forecast' in kwargs and kwargs['forecast']:
             self.options['forecast'] = True
 
-    def fetch_entsoe(self):
+    def fetch_and_parse(self, control_areas=None):
+        """
+        Fetch and parse the data requested by the options for each control area.
+        Each control area's range is split into windows no longer than ENTSOE_MAX_RANGE,
+        and the queries for all areas and windows are requested concurrently
+        (see the 'entsoe_max_workers' option, default ENTSOE_MAX_WORKERS).
+
+        :param list control_areas: Control area codes. If not provided, all control areas.
+        :return: The data points of all control areas in the format set by the output option.
+        """
+        if control_areas is None:
+            control_areas = sorted(self.CONTROL_AREAS.keys())
+
+        # check all control areas before making any request
+        for control_area in control_areas:
+            self.get_tso_id(control_area)
+
+        queries = [(control_area, window_start, window_end)
+                   for control_area in control_areas
+                   for window_start, window_end in self.entsoe_windows()]
+        max_workers = self.options.get('entsoe_max_workers', self.ENTSOE_MAX_WORKERS)
+        responses = self.map_concurrently(lambda query: self.fetch_entsoe(*query), queries, max_workers=max_workers)
+
+        frames = []
+        for (control_area, window_start, window_end), response in zip(queries, responses):
+            if response is None:
+                LOGGER.warn('%s: no data for %s from %s to %s' % (self.NAME, control_area, window_start, window_end))
+                continue
+            try:
+                frames.append(self.parse_response_to_df(response, control_area=control_area))
+            except Exception as e:
+                # one bad document must not lose the data of the other queries
+                LOGGER.error('%s: error parsing %s from %s to %s: %s: %s' % (self.NAME, control_area, window_start,
+                                                                          window_end, type(e).__name__, e))
+
+        if self.options.get('output', 'list') != 'list':
+            return self.format_output(pd.concat(frames, ignore_index=True) if frames else [])
+        return [dp for df in frames for dp in df.to_dict(orient='records')]
+
+    def entsoe_windows(self):
+        """
+        Splits the start_at..end_at range of the options into consecutive windows no longer than ENTSOE_MAX_RANGE.
+
+        :return: List of (start, end) datetimes.
+        :rtype: list
+        """
+        windows = []
+        window_start = self.options['start_at']
+        while window_start < self.options['end_at']:
+            window_end = min(window_start + self.ENTSOE_MAX_RANGE, self.options['end_at'])
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        # empty range: keep the single request
+        if len(windows) == 0:
+            windows.append((self.options['start_at'], self.options['end_at']))
+        return windows
+
+    def get_rate_limiter(self):
+        """
+        Returns the pyiso.ratelimit.RateLimiter shared by all EU clients that use this security token.
+        """
+        return shared_rate_limiter('ENTSOe:' + environ['ENTSOe_SECURITY_TOKEN'],
+                                   self.ENTSOE_MAX_REQUESTS_PER_MINUTE, period=60.0)
+
+    def fetch_entsoe(self, control_area=None, start_at=None, end_at=None):
+        """
+        Request the data set by the options for one control area and range.
+        Waits for the rate limiter of the security token first.
+
+        :param str control_area: Control area code. If not provided, the 'control_area' option.
+        :param datetime start_at: Start of the range. If not provided, the 'start_at' option.
+        :param datetime end_at: End of the range. If not provided, the 'end_at' option.
+        :return: The XML response, or None if the request failed.
+        :rtype: bytes
+        """
         payload = {
             'securityToken': environ['ENTSOe_SECURITY_TOKEN']
         }
 
         format_str = "%Y%m%d%H00"
-        date_from = self.options['start_at'].strftime(format_str)
-        date_to = self.options['end_at'].strftime(format_str)
+        date_from = (start_at or self.options['start_at']).strftime(format_str)
+        date_to = (end_at or self.options['end_at']).strftime(format_str)
 
-        TSO_ID = self.get_tso_id()
+        TSO_ID = self.get_tso_id(control_area)
 
         if self.options['data'] == 'load':
             domainType = 'outBiddingZone_Domain'
@@ -274,7 +386,13 @@ class EUClient(BaseClient):
           'periodEnd': date_to
         })
 
+        waited = self.get_rate_limiter().acquire()
+        if waited:
+            self.record_phase('rate_limit', waited)
+
         r = self.request(self.base_url, params=payload)
+        if r is None:
+            return None
         # For some reason lxml gets pernikity about the XML with a header.
         return r.text.encode('ascii')
 
@@ -282,39 +400,89 @@ class EUClient(BaseClient):
         """
         Take the XML repsonse, pull out the required components
         and return a list of dicts containing the data requested
+        (or a DataFrame or record array, if requested by the output option)
         """
-        data = []
-        xmldoc = objectify.fromstring(response)
-        for ts in xmldoc.TimeSeries:
-            for period in ts.Period:
-                initialOffset = self.utcify(period.timeInterval.start.text)
-                resolution = self.parse_resolution(period.resolution.text)
+        df = self.parse_response_to_df(response)
+        if self.options.get('output', 'list') != 'list':
+            return self.format_output(df)
+        return df.to_dict(orient='records')
+
+    def parse_response_to_df(self, response, control_area=None):
+        """
+        Parse the XML response into a DataFrame with one row per nonzero point.
+        The positions and quantities of each Period are read into arrays at once,
+        and the timestamps of all points computed together from their Period's start and resolution.
+
+        :param bytes response: The GL_MarketDocument XML.
+        :param str control_area: Control area code of the response. If not provided, the 'control_area' option.
+        :return: DataFrame with columns ba_name, market, timestamp (UTC), freq and load_MW,
+            or gen_MW and fuel_name if the data option is 'gen'.
+        :rtype: pandas.DataFrame
+        """
+        start = default_timer()
+        root = etree.fromstring(response)
+        ns = {'ns': etree.QName(root).namespace}
+        positions_path = etree.XPath('ns:Point/ns:position/text()', namespaces=ns, smart_strings=False)
+        quantities_path = etree.XPath('ns:Point/ns:quantity/text()', namespaces=ns, smart_strings=False)
+        is_gen = self.options['data'] == 'gen'
+
+        starts, resolutions, positions, values, fuel_names, counts = [], [], [], [], [], []
+        resolution_cache = {}
+        for ts in root.iterfind('ns:TimeSeries', ns):
+            fuel_name = self.fuels[ts.findtext('ns:MktPSRType/ns:psrType', namespaces=ns)] if is_gen else None
+            for period in ts.iterfind('ns:Period', ns):
+                period_positions = np.array(positions_path(period), dtype='int64')
+                quantities = quantities_path(period)
+                try:
+                    quantities = np.array(quantities, dtype='int64')
+                except ValueError:
+                    quantities = np.array(quantities, dtype='float64')
                 if self.options['latest']:
-                  points = [ period.Point[-1] ]
-                else:
-                  points = period.Point
-                for point in points:
-                    if int(point.quantity.text) == 0:
-                      continue
-                    timestamp = initialOffset + resolution * point.position
-                    datapoint = {
-                        'ba_name': self.options['control_area'],
-                        'market': 'RTHR',
-                        'timestamp': timestamp,
-                        'freq': 'n/a',
-                    }
-                    if (self.options['forecast']):
-                        datapoint['market'] = 'DAM'
-                    if self.options['data'] == 'gen':
-                      datapoint['market'] = self.CONTROL_AREAS[self.options['control_area']]['gen_market']
-                      datapoint['freq'] = self.CONTROL_AREAS[self.options['control_area']]['gen_freq']
-                      datapoint['gen_MW'] = int(point.quantity.text)
-                      datapoint['fuel_name'] = self.fuels[ts.MktPSRType.psrType.text]
-                    elif self.options['data'] == 'load':
-                      datapoint['load_MW'] = int(point.quantity.text)
-                    data.append(datapoint)
-        return data
+                    period_positions = period_positions[-1:]
+                    quantities = quantities[-1:]
+
+                resolution = period.findtext('ns:resolution', namespaces=ns)
+                if resolution not in resolution_cache:
+                    resolution_cache[resolution] = pd.Timedelta(self.parse_resolution(resolution)).to_timedelta64()
+
+                nonzero = quantities != 0
+                starts.append(period.findtext('ns:timeInterval/ns:start', namespaces=ns))
+                resolutions.append(resolution_cache[resolution])
+                positions.append(period_positions[nonzero])
+                values.append(quantities[nonzero])
+                fuel_names.append(fuel_name)
+                counts.append(nonzero.sum())
+
+        # position 1 is the first interval of a period, stamped with its end
+        if counts:
+            try:
+                # period starts are UTC, e.g. 2017-10-29T20:00Z
+                starts = np.array([start.rstrip('Z') for start in starts], dtype='datetime64[ns]')
+            except ValueError:
+                starts = pd.to_datetime(starts, utc=True).tz_convert(None).values
+            timestamps = np.repeat(starts, counts) + np.concatenate(positions) * np.repeat(resolutions, counts)
+            values = np.concatenate(values)
+        else:
+            timestamps = np.array([], dtype='datetime64[ns]')
+            values = np.array([], dtype='int64')
+
+        ca_name = control_area or self.options['control_area']
+        df = pd.DataFrame({
+            'ba_name': ca_name,
+            'market': 'DAM' if self.options['forecast'] else 'RTHR',
+            'timestamp': pd.to_datetime(timestamps, utc=True),
+            'freq': 'n/a',
+        }, columns=['ba_name', 'market', 'timestamp', 'freq'])
+        if is_gen:
+            df['market'] = self.CONTROL_AREAS[ca_name]['gen_market']
+            df['freq'] = self.CONTROL_AREAS[ca_name]['gen_freq']
+            df['gen_MW'] = values
+            df['fuel_name'] = np.repeat(np.array(fuel_names, dtype=object), counts)
+        else:
+            df['load_MW'] = values
 
+        self.record_phase('parse_response', default_timer() - start, bytes=len(response), rows=len(df))
+        return df
 
     def parse_resolution(self, resolution):
         """
@@ -337,12 +505,13 @@ class EUClient(BaseClient):
         return timedelta(days=days, hours=float(matched['hour']),
                minutes=float(matched['minute']), seconds=float(matched['second']))
 
-    def get_tso_id(self):
+    def get_tso_id(self, control_area=None):
         # TSO ID from control area code
+        control_area = control_area or self.options['control_area']
         try:
-            return self.CONTROL_AREAS[self.options['control_area']]['ENTSOe_ID']
+            return self.CONTROL_AREAS[control_area]['ENTSOe_ID']
         except KeyError:
-            msg = 'Control area code not found for %s. Options are %s' % (self.options['control_area'],
+            msg = 'Control area code not found for %s. Options are %s' % (control_area,
                                                                           sorted(self.CONTROL_AREAS.keys()))
             raise ValueError(msg)
 
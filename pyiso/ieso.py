@@ -1,13 +1,15 @@
 from collections import OrderedDict
 from datetime import datetime
 from datetime import timedelta
+from io import BytesIO
 
 import pytz
-from lxml import objectify
+from lxml import etree, objectify
 from pandas import Timestamp
 
 from pyiso import LOGGER
 from pyiso.base import BaseClient
+from pyiso.cache import CacheRule, default_report_store
 
 
 class IESOClient(BaseClient):
@@ -21,6 +23,14 @@ class IESOClient(BaseClient):
 
     base_url = 'http://reports.ieso.ca/public/'
 
+    # yearly, daily and hourly report files for past periods do not change
+    CACHE_RULES = [
+        CacheRule(r'_(?P<date>\d{4})\.xml$', date_format='%Y', covers=timedelta(days=366)),
+        CacheRule(r'_(?P<date>\d{8})\.xml$', date_format='%Y%m%d'),
+        # hourly files are numbered by hour ending, 01 to 24, which strptime cannot parse, so they settle with their day
+        CacheRule(r'_(?P<date>\d{8})\d{2}\.xml$', date_format='%Y%m%d'),
+    ]
+
     fuels = {
         'NUCLEAR': 'nuclear',
         'GAS': 'natgas',
@@ -31,8 +41,21 @@ class IESOClient(BaseClient):
         'OTHER': 'other'
     }
 
+    # reports that are updated in place, and are kept in the report store if one is configured
+    INCREMENTAL_REPORT_INTERVALS = ['yearly']
+
+    # default XML parser used by the report handlers: 'iterparse' or 'objectify'. objectify is faster on most reports,
+    # so iterparse, which uses far less memory, is only used for reports of at least REPORT_ITERPARSE_MIN_BYTES
+    REPORT_PARSER = 'objectify'
+    REPORT_ITERPARSE_MIN_BYTES = 1024 * 1024
+
+    # reports of a time range are requested this many at a time, with up to REPORT_MAX_WORKERS concurrent requests
+    REPORT_BATCH_SIZE = 24
+    REPORT_MAX_WORKERS = 8
+
     def __init__(self):
         super(IESOClient, self).__init__()
+        self.report_store = default_report_store()
         self.local_now = self.local_now()  # timezone aware
         self.local_start_of_day = self.local_now.replace(hour=0, minute=0, second=0, microsecond=0)
         self.local_end_of_day = self.local_now.replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -50,38 +73,13 @@ class IESOClient(BaseClient):
         generation_ts = list([])
         self.handle_options(latest=latest, yesterday=yesterday, start_at=start_at, end_at=end_at, **kwargs)
 
-        gen_out_cap_handler = GeneratorOutputCapabilityReportHandler(ieso_client=self)
-        gen_out_by_fuel_handler = GeneratorOutputByFuelHourlyReportHandler(ieso_client=self)
-        adequacy_handler = AdequacyReportHandler(ieso_client=self)
-
         if self.options.get('latest', False):
+            gen_out_cap_handler = GeneratorOutputCapabilityReportHandler(ieso_client=self)
             self._get_latest_report_trimmed(result_ts=generation_ts, report_handler=gen_out_cap_handler,
                                             parser_format=ParserFormat.generation)
         elif self.options.get('start_at', None) and self.options.get('end_at', None):
-            # For long time ranges more than hour ending 1, seven days in the past, it is more efficient to request the
-            # Generator Output by Fuel Type Hourly Report rather than repeated calls to the Generator Output and
-            # Capability Report.
-            # TODO Minor optimization, but this actually check if the start/end range is greater than 7 days.
-            if self.options['start_at'] < self.local_start_of_day.replace(hour=1) - timedelta(days=7):
-                self.timeout_seconds = 90  # These reports can get rather large ~7MB for a full year.
-                range_start = max(self.options['start_at'], gen_out_by_fuel_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], gen_out_by_fuel_handler.latest_available_datetime())
-                self._get_report_range(result_ts=generation_ts, report_handler=gen_out_by_fuel_handler,
-                                       parser_format=ParserFormat.generation, range_start=range_start,
-                                       range_end=range_end)
-            elif self.options.get('historical', False):
-                range_start = max(self.options['start_at'], gen_out_cap_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], gen_out_cap_handler.latest_available_datetime())
-                self._get_report_range(result_ts=generation_ts, report_handler=gen_out_cap_handler,
-                                       parser_format=ParserFormat.generation, range_start=range_start,
-                                       range_end=range_end)
-
-            if self.options.get('forecast', False):
-                range_start = max(self.options['start_at'], self.local_now)
-                range_end = min(self.options['end_at'], adequacy_handler.latest_available_datetime())
-                self._get_report_range(result_ts=generation_ts, report_handler=adequacy_handler,
-                                       parser_format=ParserFormat.generation, range_start=range_start,
-                                       range_end=range_end)
+            for report_range in self._generation_report_ranges():
+                self._get_report_range(generation_ts, *report_range)
         else:
             LOGGER.warn('No valid options were supplied.')
         return generation_ts
@@ -89,24 +87,14 @@ class IESOClient(BaseClient):
     def get_load(self, latest=False, yesterday=False, start_at=None, end_at=None, **kwargs):
         load_ts = list([])
         self.handle_options(latest=latest, yesterday=yesterday, start_at=start_at, end_at=end_at, **kwargs)
-        rt_const_totals_handler = RealTimeConstrainedTotalsReportHandler(ieso_client=self)
-        predisp_const_totals_handler = PredispatchConstrainedTotalsReportHandler(ieso_client=self)
 
         if self.options.get('latest', False):
+            rt_const_totals_handler = RealTimeConstrainedTotalsReportHandler(ieso_client=self)
             self._get_latest_report_trimmed(result_ts=load_ts, report_handler=rt_const_totals_handler,
                                             parser_format=ParserFormat.load)
         elif self.options.get('start_at', None) and self.options.get('end_at', None):
-            if self.options.get('historical', False):
-                range_start = max(self.options['start_at'], rt_const_totals_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], rt_const_totals_handler.latest_available_datetime())
-                self._get_report_range(result_ts=load_ts, report_handler=rt_const_totals_handler,
-                                       parser_format=ParserFormat.load, range_start=range_start, range_end=range_end)
-            if self.options.get('forecast', False):
-                range_start = max(self.options['start_at'], rt_const_totals_handler.latest_available_datetime(),
-                                  predisp_const_totals_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], predisp_const_totals_handler.latest_available_datetime())
-                self._get_report_range(result_ts=load_ts, report_handler=predisp_const_totals_handler,
-                                       parser_format=ParserFormat.load, range_start=range_start, range_end=range_end)
+            for report_range in self._load_report_ranges():
+                self._get_report_range(load_ts, *report_range)
         else:
             LOGGER.warn('No valid options were supplied.')
         return load_ts
@@ -114,28 +102,109 @@ class IESOClient(BaseClient):
     def get_trade(self, latest=False, yesterday=False, start_at=None, end_at=None, **kwargs):
         trade_ts = list([])
         self.handle_options(latest=latest, yesterday=yesterday, start_at=start_at, end_at=end_at, **kwargs)
-        inter_sched_flow_handler = IntertieScheduleFlowReportHandler(ieso_client=self)
-        adequacy_handler = AdequacyReportHandler(ieso_client=self)
 
         if self.options.get('latest', False):
+            inter_sched_flow_handler = IntertieScheduleFlowReportHandler(ieso_client=self)
             self._get_latest_report_trimmed(result_ts=trade_ts, report_handler=inter_sched_flow_handler,
                                             parser_format=ParserFormat.trade)
         elif self.options.get('start_at', None) and self.options.get('end_at', None):
-            if self.options.get('historical', False):
-                range_start = max(self.options['start_at'], inter_sched_flow_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], inter_sched_flow_handler.latest_available_datetime())
-                self._get_report_range(result_ts=trade_ts, report_handler=inter_sched_flow_handler,
-                                       parser_format=ParserFormat.trade, range_start=range_start, range_end=range_end)
-            if self.options.get('forecast', False):
-                range_start = max(self.options['start_at'], inter_sched_flow_handler.latest_available_datetime(),
-                                  adequacy_handler.earliest_available_datetime())
-                range_end = min(self.options['end_at'], adequacy_handler.latest_available_datetime())
-                self._get_report_range(result_ts=trade_ts, report_handler=adequacy_handler,
-                                       parser_format=ParserFormat.trade, range_start=range_start, range_end=range_end)
+            for report_range in self._trade_report_ranges():
+                self._get_report_range(trade_ts, *report_range)
         else:
             LOGGER.warn('No valid options were supplied.')
         return trade_ts
 
+    def iter_generation(self, start_at=None, end_at=None, **kwargs):
+        self.handle_options(latest=False, start_at=start_at, end_at=end_at, **kwargs)
+        for report_range in self._generation_report_ranges():
+            for report_ts in self._iter_report_range(*report_range):
+                yield report_ts
+
+    def iter_load(self, start_at=None, end_at=None, **kwargs):
+        self.handle_options(latest=False, start_at=start_at, end_at=end_at, **kwargs)
+        for report_range in self._load_report_ranges():
+            for report_ts in self._iter_report_range(*report_range):
+                yield report_ts
+
+    def iter_trade(self, start_at=None, end_at=None, **kwargs):
+        self.handle_options(latest=False, start_at=start_at, end_at=end_at, **kwargs)
+        for report_range in self._trade_report_ranges():
+            for report_ts in self._iter_report_range(*report_range):
+                yield report_ts
+
+    def _generation_report_ranges(self):
+        """
+        :return: A list of (report_handler, parser_format, range_start, range_end) tuples covering the requested
+            start_at/end_at options with generation reports.
+        :rtype: list
+        """
+        report_ranges = []
+        gen_out_cap_handler = GeneratorOutputCapabilityReportHandler(ieso_client=self)
+        gen_out_by_fuel_handler = GeneratorOutputByFuelHourlyReportHandler(ieso_client=self)
+        adequacy_handler = AdequacyReportHandler(ieso_client=self)
+
+        # For long time ranges more than hour ending 1, seven days in the past, it is more efficient to request the
+        # Generator Output by Fuel Type Hourly Report rather than repeated calls to the Generator Output and
+        # Capability Report.
+        # TODO Minor optimization, but this actually check if the start/end range is greater than 7 days.
+        if self.options['start_at'] < self.local_start_of_day.replace(hour=1) - timedelta(days=7):
+            self.timeout_seconds = 90  # These reports can get rather large ~7MB for a full year.
+            range_start = max(self.options['start_at'], gen_out_by_fuel_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], gen_out_by_fuel_handler.latest_available_datetime())
+            report_ranges.append((gen_out_by_fuel_handler, ParserFormat.generation, range_start, range_end))
+        elif self.options.get('historical', False):
+            range_start = max(self.options['start_at'], gen_out_cap_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], gen_out_cap_handler.latest_available_datetime())
+            report_ranges.append((gen_out_cap_handler, ParserFormat.generation, range_start, range_end))
+
+        if self.options.get('forecast', False):
+            range_start = max(self.options['start_at'], self.local_now)
+            range_end = min(self.options['end_at'], adequacy_handler.latest_available_datetime())
+            report_ranges.append((adequacy_handler, ParserFormat.generation, range_start, range_end))
+        return report_ranges
+
+    def _load_report_ranges(self):
+        """
+        :return: A list of (report_handler, parser_format, range_start, range_end) tuples covering the requested
+            start_at/end_at options with load reports.
+        :rtype: list
+        """
+        report_ranges = []
+        rt_const_totals_handler = RealTimeConstrainedTotalsReportHandler(ieso_client=self)
+        predisp_const_totals_handler = PredispatchConstrainedTotalsReportHandler(ieso_client=self)
+
+        if self.options.get('historical', False):
+            range_start = max(self.options['start_at'], rt_const_totals_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], rt_const_totals_handler.latest_available_datetime())
+            report_ranges.append((rt_const_totals_handler, ParserFormat.load, range_start, range_end))
+        if self.options.get('forecast', False):
+            range_start = max(self.options['start_at'], rt_const_totals_handler.latest_available_datetime(),
+                              predisp_const_totals_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], predisp_const_totals_handler.latest_available_datetime())
+            report_ranges.append((predisp_const_totals_handler, ParserFormat.load, range_start, range_end))
+        return report_ranges
+
+    def _trade_report_ranges(self):
+        """
+        :return: A list of (report_handler, parser_format, range_start, range_end) tuples covering the requested
+            start_at/end_at options with trade reports.
+        :rtype: list
+        """
+        report_ranges = []
+        inter_sched_flow_handler = IntertieScheduleFlowReportHandler(ieso_client=self)
+        adequacy_handler = AdequacyReportHandler(ieso_client=self)
+
+        if self.options.get('historical', False):
+            range_start = max(self.options['start_at'], inter_sched_flow_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], inter_sched_flow_handler.latest_available_datetime())
+            report_ranges.append((inter_sched_flow_handler, ParserFormat.trade, range_start, range_end))
+        if self.options.get('forecast', False):
+            range_start = max(self.options['start_at'], inter_sched_flow_handler.latest_available_datetime(),
+                              adequacy_handler.earliest_available_datetime())
+            range_end = min(self.options['end_at'], adequacy_handler.latest_available_datetime())
+            report_ranges.append((adequacy_handler, ParserFormat.trade, range_start, range_end))
+        return report_ranges
+
     def _get_report_range(self, result_ts, report_handler, parser_format, range_start, range_end):
         """
         :param list result_ts: The timeseries which results which data will be appended to.
@@ -144,13 +213,129 @@ class IESOClient(BaseClient):
         :param datetime range_start: The start of the time range that report data should be requested for.
         :param datetime range_end: The end of the time range that report data should be requested for.
         """
+        for report_ts in self._iter_report_range(report_handler=report_handler, parser_format=parser_format,
+                                                 range_start=range_start, range_end=range_end):
+            result_ts.extend(report_ts)
+
+    def _iter_report_range(self, report_handler, parser_format, range_start, range_end):
+        """
+        Requests and parses the reports covering a time range, yielding each report's timeseries in chronological
+        order. Reports are requested REPORT_BATCH_SIZE at a time, concurrently (see the 'ieso_max_workers' option,
+        default REPORT_MAX_WORKERS), and each batch is parsed in order once it has been received.
+
+        :param BaseIesoReportHandler report_handler: The report handler to be used for the time range.
+        :param str parser_format: The WattTime client format the data should be parsed into.
+        :param datetime range_start: The start of the time range that report data should be requested for.
+        :param datetime range_end: The end of the time range that report data should be requested for.
+        """
+        report_urls = self._report_urls(report_handler=report_handler, range_start=range_start, range_end=range_end)
+
+        # reports that are updated in place are revalidated one at a time against the report store
+        if self.report_store is not None and report_handler.report_interval() in self.INCREMENTAL_REPORT_INTERVALS:
+            for report_url in report_urls:
+                report_ts = [dp for dp in self._get_stored_report(report_handler, parser_format, report_url)
+                             if range_start <= dp['timestamp'] <= range_end]
+                if len(report_ts) > 0:
+                    yield report_ts
+            return
+
+        max_workers = self.options.get('ieso_max_workers', self.REPORT_MAX_WORKERS)
+        for i in range(0, len(report_urls), self.REPORT_BATCH_SIZE):
+            batch_urls = report_urls[i:i + self.REPORT_BATCH_SIZE]
+            responses = self.map_concurrently(lambda url: self.request(url=url), batch_urls, max_workers=max_workers)
+            for report_url, response in zip(batch_urls, responses):
+                if not response:
+                    LOGGER.warn('%s: skipping report %s' % (self.NAME, report_url))
+                    continue
+                report_ts = list([])
+                report_handler.parse_report(xml_content=response.content, result_ts=report_ts,
+                                            parser_format=parser_format, min_datetime=range_start,
+                                            max_datetime=range_end)
+                if len(report_ts) > 0:
+                    yield report_ts
+
+    def _report_urls(self, report_handler, range_start, range_end):
+        """
+        :param BaseIesoReportHandler report_handler: The report handler to be used for the time range.
+        :param datetime range_start: The start of the time range that report data should be requested for.
+        :param datetime range_end: The end of the time range that report data should be requested for.
+        :return: The URLs of the reports covering the time range, in chronological order.
+        :rtype: list
+        """
+        report_urls = []
         report_datetime = range_start.astimezone(pytz.timezone(self.TZ_NAME))
         while report_datetime <= min(range_end, report_handler.latest_available_datetime()):
-            report_url = report_handler.report_url(report_datetime=report_datetime)
-            response = self.request(url=report_url)
-            report_handler.parse_report(xml_content=response.content, result_ts=result_ts, parser_format=parser_format,
-                                        min_datetime=range_start, max_datetime=range_end)
+            report_urls.append(report_handler.report_url(report_datetime=report_datetime))
             report_datetime = report_handler.datetime_for_next_report_request(tz_aware_dt=report_datetime)
+        return report_urls
+
+    def _get_stored_report(self, report_handler, parser_format, report_url):
+        """
+        Returns all data in a report that is updated in place, using the report store.
+        The report is revalidated with a conditional request. If it has changed, only data after the latest stored
+        timestamp is parsed and added to the store.
+
+        :param BaseIesoReportHandler report_handler: The report handler for the report.
+        :param str parser_format: The WattTime client format the data should be parsed into.
+        :param str report_url: The report URL.
+        :return: The report's timeseries, in chronological order.
+        :rtype: list
+        """
+        store_key = report_url + '#' + parser_format
+        stored = self.report_store.get(store_key)
+        stored_ts = self._decode_report_ts(stored['data']) if stored else []
+
+        # revalidate
+        headers = {}
+        if stored and stored['etag']:
+            headers['If-None-Match'] = stored['etag']
+        if stored and stored['last_modified']:
+            headers['If-Modified-Since'] = stored['last_modified']
+        response = self.request(url=report_url, headers=headers)
+        if not response or response.status_code == 304:
+            return stored_ts
+
+        # parse data after the latest stored timestamp
+        if stored_ts:
+            min_datetime = stored_ts[-1]['timestamp'] + timedelta(microseconds=1)
+        else:
+            min_datetime = datetime(1900, 1, 1, tzinfo=pytz.utc)
+        new_ts = list([])
+        report_handler.parse_report(xml_content=response.content, result_ts=new_ts, parser_format=parser_format,
+                                    min_datetime=min_datetime, max_datetime=report_handler.latest_available_datetime())
+        result_ts = stored_ts + sorted(self._decode_report_ts(self._encode_report_ts(new_ts)),
+                                       key=lambda dp: dp['timestamp'])
+
+        # store
+        self.report_store.set(store_key, self._encode_report_ts(result_ts),
+                              etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+        return result_ts
+
+    @staticmethod
+    def _encode_report_ts(result_ts):
+        """Converts a timeseries to JSON-serializable dicts, with ISO format timestamps and float values."""
+        encoded = []
+        for dp in result_ts:
+            encoded_dp = {}
+            for key, value in dp.items():
+                if key == 'timestamp':
+                    encoded_dp[key] = value.isoformat()
+                elif key.endswith('_MW'):
+                    encoded_dp[key] = float(value)
+                else:
+                    encoded_dp[key] = value
+            encoded.append(encoded_dp)
+        return encoded
+
+    @staticmethod
+    def _decode_report_ts(encoded):
+        """Reverses _encode_report_ts."""
+        result_ts = []
+        for encoded_dp in encoded:
+            dp = dict(encoded_dp)
+            dp['timestamp'] = Timestamp(dp['timestamp']).tz_convert(pytz.utc)
+            result_ts.append(dp)
+        return result_ts
 
     def _get_latest_report_trimmed(self, result_ts, report_handler, parser_format):
         """
@@ -235,6 +420,11 @@ class BaseIesoReportHandler(object):
         Parses the report content and appends them to a timeseries of results, in one of several WattTime client
         formats.
 
+        The report is parsed with the client's 'ieso_parser' option if set, otherwise with 'iterparse' if it has at
+        least IESOClient.REPORT_ITERPARSE_MIN_BYTES bytes, or IESOClient.REPORT_PARSER.
+        'iterparse' streams the report (see parse_report_iterparse); 'objectify' builds the whole document tree
+        first (see parse_report_objectify).
+
         :param str xml_content: The XML response body of the report.
         :param list result_ts: The timeseries (a list of dicts) which results should be appended to. Timestamps are in
             UTC.
@@ -242,7 +432,72 @@ class BaseIesoReportHandler(object):
         :param datetime min_datetime: The minimum datetime that can be appended to the results.
         :param datetime max_datetime: The maximum datetime that can be appended to the results.
         """
-        raise NotImplementedError('Derived classes must implement the parse_report method.')
+        parser = self.ieso_client.options.get('ieso_parser')
+        if parser is None:
+            min_bytes = self.ieso_client.REPORT_ITERPARSE_MIN_BYTES
+            if min_bytes is not None and len(xml_content) >= min_bytes:
+                parser = 'iterparse'
+            else:
+                parser = self.ieso_client.REPORT_PARSER
+        if parser == 'objectify':
+            self.parse_report_objectify(xml_content=xml_content, result_ts=result_ts, parser_format=parser_format,
+                                        min_datetime=min_datetime, max_datetime=max_datetime)
+        else:
+            self.parse_report_iterparse(xml_content=xml_content, result_ts=result_ts, parser_format=parser_format,
+                                        min_datetime=min_datetime, max_datetime=max_datetime)
+
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        """
+        Implements parse_report with a single streaming pass over the report (see iter_report_elements).
+        Takes the same parameters as parse_report.
+        """
+        raise NotImplementedError('Derived classes must implement the parse_report_iterparse method.')
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        """
+        Implements parse_report by walking the objectified document tree. Takes the same parameters as parse_report.
+        """
+        raise NotImplementedError('Derived classes must implement the parse_report_objectify method.')
+
+    @staticmethod
+    def iter_report_elements(xml_content, tags, discard_tags=()):
+        """
+        Streams the elements of a report whose local (namespace-free) names are in tags, in document order.
+        Each element is cleared and removed from the document, along with the siblings parsed before it,
+        once the caller has consumed it. Elements in discard_tags are removed the same way without being yielded,
+        so that sections of the report which are not needed do not stay in memory.
+        Matching happens inside lxml, so elements with other names cost no Python-level work.
+
+        :param bytes xml_content: The XML report.
+        :param tuple tags: Local names of elements to yield. They must not be nested in each other.
+        :param tuple discard_tags: Local names of other elements to remove once parsed.
+        :return: Generator of (local name, element) tuples.
+        """
+        if not isinstance(xml_content, bytes):
+            xml_content = xml_content.encode('utf-8')
+
+        match_tags = ['{*}' + tag for tag in tuple(tags) + tuple(discard_tags)]
+        for event, elem in etree.iterparse(BytesIO(xml_content), events=('end',), tag=match_tags):
+            name = etree.QName(elem).localname
+            if name in tags:
+                yield name, elem
+
+            # free memory used by this and preceding elements
+            elem.clear()
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+
+    @staticmethod
+    def report_number(text):
+        """
+        Converts the text of a numeric report element to an int, or a float if it is not integral,
+        as objectify does.
+        """
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
 
     def append_generation(self, result_ts, tz_aware_dt, gen_mw, fuel):
         """
@@ -403,34 +658,66 @@ class IntertieScheduleFlowReportHandler(BaseIesoReportHandler):
     def report_interval(self):
         return ReportFileInterval.daily
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        if parser_format == ParserFormat.trade:
+            doc_date_local = None
+            # per-zone elements are discarded unread; only the Totals element is kept in memory
+            for name, elem in self.iter_report_elements(xml_content, ('Date', 'Totals'),
+                                                          discard_tags=('IntertieZone',)):
+                if name == 'Date':
+                    doc_date_local = elem.text  # %Y%m%d
+                else:
+                    for actual in elem.iterfind('{*}Actuals/{*}Actual'):
+                        self.append_actual(result_ts=result_ts, doc_date_local=doc_date_local,
+                                           hour=self.report_number(actual.findtext('{*}Hour')),
+                                           interval=self.report_number(actual.findtext('{*}Interval')),
+                                           net_exp_mw=self.report_number(actual.findtext('{*}Flow')),
+                                           min_datetime=min_datetime, max_datetime=max_datetime)
+        else:
+            raise RuntimeError('Intertie Schedule Flow Report can only be parsed using trade format.')
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         if parser_format == ParserFormat.trade:
             document = objectify.fromstring(xml_content)
             doc_body = document.IMODocBody
             doc_date_local = doc_body.Date  # %Y%m%d
 
             for actual in doc_body.Totals.Actuals.Actual:
-                net_exp_mw = actual.Flow
-                hour_local = str(actual.Hour - 1).zfill(2)
-                minutes = actual.Interval * 5  # Interval 1 is minute 05. Interval 12 is minute 60 (ie. 00:00 next hour)
-                hr_start_str = doc_date_local + ' ' + hour_local + ':00'
-                row_datetime = self.ieso_client.utcify(local_ts_str=hr_start_str) + timedelta(minutes=minutes)
-
-                # For the current day the report fills  "Actual" elements in the future with the value 0. Batches of
-                # 5-minute observations are posted hourly, at the end of the hour. Furthermore, the time between the
-                # end of an hour and the report's availability online is typically 30 minutes. The end-of-hour
-                # reporting schedule combined with time lag before the report is available online means that
-                # ~1.5 hours of "recent" observations could be filled with 0 values. Although a bit hacky, it's
-                # unlikely that net exports are exactly 0MW for an interval, so skip recording data in these cases.
-                skip = False
-                if net_exp_mw == 0 and row_datetime > (self.ieso_client.local_now - timedelta(hours=2)):
-                    skip = True
-
-                if min_datetime <= row_datetime <= max_datetime and not skip:
-                    self.append_trade(result_ts=result_ts, tz_aware_dt=row_datetime, net_exp_mw=net_exp_mw)
+                self.append_actual(result_ts=result_ts, doc_date_local=doc_date_local, hour=actual.Hour,
+                                   interval=actual.Interval, net_exp_mw=actual.Flow, min_datetime=min_datetime,
+                                   max_datetime=max_datetime)
         else:
             raise RuntimeError('Intertie Schedule Flow Report can only be parsed using trade format.')
 
+    def append_actual(self, result_ts, doc_date_local, hour, interval, net_exp_mw, min_datetime, max_datetime):
+        """
+        Appends the net exports of one five-minute interval of the Totals element to the results, if it is in range.
+        :param list result_ts: The timeseries (a list of dicts) which results should be appended to.
+        :param str doc_date_local: The report date.
+        :param int hour: The interval's hour ending.
+        :param int interval: The interval number, 1 to 12.
+        :param float net_exp_mw: The net exported megawatts (MW).
+        :param datetime min_datetime: The minimum datetime that can be appended to the results.
+        :param datetime max_datetime: The maximum datetime that can be appended to the results.
+        """
+        hour_local = str(hour - 1).zfill(2)
+        minutes = interval * 5  # Interval 1 is minute 05. Interval 12 is minute 60 (ie. 00:00 next hour)
+        hr_start_str = doc_date_local + ' ' + hour_local + ':00'
+        row_datetime = self.ieso_client.utcify(local_ts_str=hr_start_str) + timedelta(minutes=minutes)
+
+        # For the current day the report fills  "Actual" elements in the future with the value 0. Batches of
+        # 5-minute observations are posted hourly, at the end of the hour. Furthermore, the time between the
+        # end of an hour and the report's availability online is typically 30 minutes. The end-of-hour
+        # reporting schedule combined with time lag before the report is available online means that
+        # ~1.5 hours of "recent" observations could be filled with 0 values. Although a bit hacky, it's
+        # unlikely that net exports are exactly 0MW for an interval, so skip recording data in these cases.
+        skip = False
+        if net_exp_mw == 0 and row_datetime > (self.ieso_client.local_now - timedelta(hours=2)):
+            skip = True
+
+        if min_datetime <= row_datetime <= max_datetime and not skip:
+            self.append_trade(result_ts=result_ts, tz_aware_dt=row_datetime, net_exp_mw=net_exp_mw)
+
 
 class AdequacyReportHandler(BaseIesoReportHandler):
     def report_interval(self):
@@ -463,7 +750,41 @@ class AdequacyReportHandler(BaseIesoReportHandler):
     def market(self):
         return BaseClient.MARKET_CHOICES.dam
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        if parser_format == ParserFormat.generation:
+            tags = ('DeliveryDate', 'InternalResource')
+        elif parser_format == ParserFormat.trade:
+            tags = ('DeliveryDate', 'TotalImports', 'TotalExports')
+        else:
+            raise RuntimeError('Adequacy Report should only be parsed using generation or trade formats.')
+
+        day_start_str = None
+        imports_exports = OrderedDict()  # {'ts_local':{'import'|'export',val_mw}}
+        # skip the other sections of the report
+        discard_tags = ('InternalResource', 'ZonalImport', 'ZonalExport', 'ForecastSupply', 'ForecastDemand')
+        for name, elem in self.iter_report_elements(xml_content, tags, discard_tags):
+            if name == 'DeliveryDate':
+                day_start_str = elem.text + ' 00:00:00'
+            elif name == 'InternalResource':
+                fuel = str.upper(elem.findtext('{*}FuelType'))
+                if fuel != 'DISPATCHABLE LOAD':  # TODO What to do about dispatchable load? Skipping for now.
+                    for schedule in elem.iterfind('{*}Schedules/{*}Schedule'):
+                        fuel_gen_mw = self.report_number(schedule.findtext('{*}EnergyMW'))
+                        hr_ending = self.report_number(schedule.findtext('{*}DeliveryHour'))
+                        row_datetime = self.ieso_client.utcify(local_ts_str=day_start_str) + timedelta(hours=hr_ending)
+                        if min_datetime <= row_datetime <= max_datetime:
+                            self.append_generation(result_ts=result_ts, tz_aware_dt=row_datetime, fuel=fuel,
+                                                   gen_mw=fuel_gen_mw)
+            else:
+                direction = 'import' if name == 'TotalImports' else 'export'
+                for schedule in elem.iterfind('{*}Schedules/{*}Schedule'):
+                    hr_ending = self.report_number(schedule.findtext('{*}DeliveryHour'))
+                    row_datetime = self.ieso_client.utcify(local_ts_str=day_start_str) + timedelta(hours=hr_ending)
+                    imports_exports.setdefault(row_datetime, {})[direction] = \
+                        self.report_number(schedule.findtext('{*}EnergyMW'))
+        self.append_net_exports(result_ts, imports_exports, min_datetime, max_datetime)
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         document = objectify.fromstring(xml_content)
         doc_body = document.DocBody
         day_start_str = doc_body.DeliveryDate + ' 00:00:00'
@@ -491,14 +812,24 @@ class AdequacyReportHandler(BaseIesoReportHandler):
                 hr_entry = imports_exports.get(row_datetime)
                 hr_entry.update({'export': export_schedule.EnergyMW.pyval})
                 imports_exports[row_datetime] = hr_entry
-            for row_datetime, imp_exp in imports_exports.items():
-                # Handle export passed as positive/negative value.
-                net_exp_mw = abs(imp_exp.get('export', 0)) - abs(imp_exp.get('import', 0))
-                if min_datetime <= row_datetime <= max_datetime:
-                    self.append_trade(result_ts=result_ts, tz_aware_dt=row_datetime, net_exp_mw=net_exp_mw)
+            self.append_net_exports(result_ts, imports_exports, min_datetime, max_datetime)
         else:
             raise RuntimeError('Adequacy Report should only be parsed using generation or trade formats.')
 
+    def append_net_exports(self, result_ts, imports_exports, min_datetime, max_datetime):
+        """
+        Appends the net exports of each hour to the results, if it is in range.
+        :param list result_ts: The timeseries (a list of dicts) which results should be appended to.
+        :param OrderedDict imports_exports: Dict from hour ending datetime to a dict of its 'import' and 'export' MW.
+        :param datetime min_datetime: The minimum datetime that can be appended to the results.
+        :param datetime max_datetime: The maximum datetime that can be appended to the results.
+        """
+        for row_datetime, imp_exp in imports_exports.items():
+            # Handle export passed as positive/negative value.
+            net_exp_mw = abs(imp_exp.get('export', 0)) - abs(imp_exp.get('import', 0))
+            if min_datetime <= row_datetime <= max_datetime:
+                self.append_trade(result_ts=result_ts, tz_aware_dt=row_datetime, net_exp_mw=net_exp_mw)
+
     def frequency(self):
         return BaseClient.FREQUENCY_CHOICES.hourly
 
@@ -520,7 +851,31 @@ class RealTimeConstrainedTotalsReportHandler(BaseIesoReportHandler):
     def latest_available_datetime(self):
         return self.ieso_client.local_now
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        if parser_format == ParserFormat.load:
+            day = None
+            hour_local = None
+            tags = ('DeliveryDate', 'DeliveryHour', 'IntervalEnergy')
+            for name, elem in self.iter_report_elements(xml_content, tags):
+                if name == 'DeliveryDate':
+                    day = elem.text
+                elif name == 'DeliveryHour':
+                    hour_local = str(self.report_number(elem.text) - 1).zfill(2)
+                else:
+                    # Interval 1 is minute 05. Interval 12 is minute 60 (ie. 00:00 next hour)
+                    minutes = self.report_number(elem.findtext('{*}Interval')) * 5
+                    hr_start_str = day + ' ' + hour_local + ':00'
+                    for mq in elem.iterfind('{*}MQ'):
+                        if mq.findtext('{*}MarketQuantity') == 'ONTARIO DEMAND':
+                            load_mw = self.report_number(mq.findtext('{*}EnergyMW'))
+                            row_datetime = self.ieso_client.utcify(local_ts_str=hr_start_str) + \
+                                timedelta(minutes=minutes)
+                            if min_datetime <= row_datetime <= max_datetime:
+                                self.append_load(result_ts=result_ts, tz_aware_dt=row_datetime, load_mw=load_mw)
+        else:
+            raise RuntimeError('Realtime Constrained Totals Report can only be parsed using load format.')
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         document = objectify.fromstring(xml_content)
         doc_body = document.DocBody
         day = doc_body.DeliveryDate
@@ -556,7 +911,25 @@ class PredispatchConstrainedTotalsReportHandler(BaseIesoReportHandler):
     def market(self):
         return BaseClient.MARKET_CHOICES.hourly
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        if parser_format == ParserFormat.load:
+            day_start_str = None
+            for name, elem in self.iter_report_elements(xml_content, ('DeliveryDate', 'HourlyConstrainedEnergy')):
+                if name == 'DeliveryDate':
+                    day_start_str = elem.text + ' 00:00:00'
+                else:
+                    hr_ending = self.report_number(elem.findtext('{*}DeliveryHour'))
+                    for mq in elem.iterfind('{*}MQ'):
+                        if mq.findtext('{*}MarketQuantity') == 'Total Load':
+                            load_mw = self.report_number(mq.findtext('{*}EnergyMW'))
+                            row_datetime = self.ieso_client.utcify(local_ts_str=day_start_str) + \
+                                timedelta(hours=hr_ending)
+                            if min_datetime <= row_datetime <= max_datetime:
+                                self.append_load(result_ts=result_ts, tz_aware_dt=row_datetime, load_mw=load_mw)
+        else:
+            raise RuntimeError('Predispatch Constrained Totals Report can only be parsed using load format.')
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         document = objectify.fromstring(xml_content)
         doc_body = document.DocBody
         day_start_str = doc_body.DeliveryDate + ' 00:00:00'
@@ -602,14 +975,34 @@ class GeneratorOutputCapabilityReportHandler(BaseIesoReportHandler):
     def market(self):
         return BaseClient.MARKET_CHOICES.hourly
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        if parser_format == ParserFormat.generation:
+            day_start_str = None
+            fuels_hourly = self.empty_fuels_hourly()
+
+            # Add each generator's hourly output to its fuel's totals as soon as the generator has been parsed.
+            for name, elem in self.iter_report_elements(xml_content, ('Date', 'Generator')):
+                if name == 'Date':
+                    day_start_str = elem.text + ' 00:00:00'
+                else:
+                    fuel_hour_endings = fuels_hourly[elem.findtext('{*}FuelType')]
+                    for output in elem.iterfind('{*}Outputs/{*}Output'):
+                        hr_ending = self.report_number(output.findtext('{*}Hour'))
+                        # Inexplicably, some 'Output' elements are missing 'EnergyMW' child element.
+                        gen_mw_text = output.findtext('{*}EnergyMW')
+                        gen_mw = 0 if gen_mw_text is None else self.report_number(gen_mw_text)
+                        fuel_hour_endings[hr_ending] = fuel_hour_endings.get(hr_ending, 0) + gen_mw
+
+            self.append_fuels_hourly(result_ts, day_start_str, fuels_hourly, min_datetime, max_datetime)
+        else:
+            raise RuntimeError('Generator Output Capability Report can only be parsed using generation format.')
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         if parser_format == ParserFormat.generation:
             imo_document = objectify.fromstring(xml_content)
             imo_doc_body = imo_document.IMODocBody
             day_start_str = imo_doc_body.Date + ' 00:00:00'
-            fuels_hourly = {}
-            for fuel in IESOClient.fuels.keys():
-                fuels_hourly[fuel] = {}
+            fuels_hourly = self.empty_fuels_hourly()
 
             # Iterate over each hourly value for each generator, creating a dictionary keyed by fuel and values are
             # lists containing generation by hour-of-day.
@@ -625,16 +1018,38 @@ class GeneratorOutputCapabilityReportHandler(BaseIesoReportHandler):
                     existing_gen_mw = fuel_hour_endings.get(hr_ending, 0)
                     fuel_hour_endings[hr_ending] = existing_gen_mw + gen_mw
 
-            # Iterate over aggregated results to create generation fuel mix format
-            for fuel, fuel_hour_endings in fuels_hourly.items():
-                for fuel_hr_ending, fuel_gen_mw in fuel_hour_endings.items():
-                    row_datetime = self.ieso_client.utcify(local_ts_str=day_start_str) + timedelta(hours=fuel_hr_ending)
-                    if min_datetime <= row_datetime <= max_datetime:
-                        self.append_generation(result_ts=result_ts, tz_aware_dt=row_datetime, fuel=fuel,
-                                               gen_mw=fuel_gen_mw)
+            self.append_fuels_hourly(result_ts, day_start_str, fuels_hourly, min_datetime, max_datetime)
         else:
             raise RuntimeError('Generator Output Capability Report can only be parsed using generation format.')
 
+    @staticmethod
+    def empty_fuels_hourly():
+        """
+        :return: Dict from each IESO fuel name to an empty dict, to be filled with generation by hour ending.
+        :rtype: dict
+        """
+        fuels_hourly = {}
+        for fuel in IESOClient.fuels.keys():
+            fuels_hourly[fuel] = {}
+        return fuels_hourly
+
+    def append_fuels_hourly(self, result_ts, day_start_str, fuels_hourly, min_datetime, max_datetime):
+        """
+        Appends aggregated generation by fuel and hour ending to the results, if it is in range.
+        :param list result_ts: The timeseries (a list of dicts) which results should be appended to.
+        :param str day_start_str: The start of the report day, in local time.
+        :param dict fuels_hourly: Dict from IESO fuel name to a dict from hour ending to generation in MW.
+        :param datetime min_datetime: The minimum datetime that can be appended to the results.
+        :param datetime max_datetime: The maximum datetime that can be appended to the results.
+        """
+        # Iterate over aggregated results to create generation fuel mix format
+        for fuel, fuel_hour_endings in fuels_hourly.items():
+            for fuel_hr_ending, fuel_gen_mw in fuel_hour_endings.items():
+                row_datetime = self.ieso_client.utcify(local_ts_str=day_start_str) + timedelta(hours=fuel_hr_ending)
+                if min_datetime <= row_datetime <= max_datetime:
+                    self.append_generation(result_ts=result_ts, tz_aware_dt=row_datetime, fuel=fuel,
+                                           gen_mw=fuel_gen_mw)
+
     def report_url(self, report_datetime=None):
         filename = 'PUB_GenOutputCapability.xml'
         if report_datetime is not None:
@@ -684,7 +1099,23 @@ class GeneratorOutputByFuelHourlyReportHandler(BaseIesoReportHandler):
     def latest_available_datetime(self):
         return self.ieso_client.local_now
 
-    def parse_report(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+    def parse_report_iterparse(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
+        day_start = None
+        for name, elem in self.iter_report_elements(xml_content, ('Day', 'HourlyData'), discard_tags=('DailyData',)):
+            if name == 'Day':
+                day_start = self.ieso_client.utcify(local_ts_str=elem.text + ' 00:00:00')
+            else:
+                hr_ending = self.report_number(elem.findtext('{*}Hour'))
+                row_datetime = day_start + timedelta(hours=hr_ending)
+                if min_datetime <= row_datetime <= max_datetime:
+                    for fuel_total in elem.iterfind('{*}FuelTotal'):
+                        # When 'OutputQuality' value is -1, there is not 'Output' element.
+                        output_text = fuel_total.findtext('{*}EnergyValue/{*}Output')
+                        fuel_gen_mw = 0 if output_text is None else self.report_number(output_text)
+                        self.append_generation(result_ts=result_ts, tz_aware_dt=row_datetime,
+                                               fuel=fuel_total.findtext('{*}Fuel'), gen_mw=fuel_gen_mw)
+
+    def parse_report_objectify(self, xml_content, result_ts, parser_format, min_datetime, max_datetime):
         document = objectify.fromstring(xml_content)
         doc_body = document.DocBody
         for daily_data in doc_body.DailyData:
@@ -69,7 +69,7 @@ class ISONEClient(BaseClient):
         try:
             df = self._parse_json(raw_data)
         except ValueError:
-            return []
+            return self.format_output([])
         df = self.slice_times(df)
 
         # return
@@ -100,7 +100,7 @@ class ISONEClient(BaseClient):
         try:
             df = self._parse_json(raw_data)
         except ValueError:
-            return []
+            return self.format_output([])
         df = self.slice_times(df)
 
         # return
@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+
+
+class CallStats(object):
+    """
+    Wall time, bytes and row counts of each phase of one get_* call of a client.
+    A client starts a new CallStats in handle_options; read it from the client's stats attribute after the call.
+    Phases that run several times in a call (e.g. one request per day) are added up.
+    """
+    def __init__(self, ba_name):
+        """
+        :param str ba_name: Name of the client's balancing authority.
+        """
+        self.ba_name = ba_name
+        self.phases = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, phase, seconds, bytes=None, rows=None):
+        """
+        Adds one run of a phase.
+
+        :param str phase: The phase name, e.g. 'request'.
+        :param float seconds: Wall time taken.
+        :param int bytes: Bytes transferred or read, if known.
+        :param int rows: Rows produced, if known.
+        """
+        with self._lock:
+            totals = self.phases.setdefault(phase, {'calls': 0, 'seconds': 0.0, 'bytes': 0, 'rows': 0})
+            totals['calls'] += 1
+            totals['seconds'] += seconds
+            totals['bytes'] += bytes or 0
+            totals['rows'] += rows or 0
+
+    def seconds(self, phase=None):
+        """
+        :param str phase: If provided, the phase to return the wall time of. Otherwise the total of all phases.
+        :return: Wall time in seconds.
+        :rtype: float
+        """
+        if phase is not None:
+            return self.phases.get(phase, {}).get('seconds', 0.0)
+        return sum(totals['seconds'] for totals in self.phases.values())
+
+    def as_dict(self):
+        """
+        :return: Dict from phase name to a dict of its calls, seconds, bytes and rows.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict((phase, dict(totals)) for phase, totals in self.phases.items())
+
+    def __repr__(self):
+        return '<CallStats %s: %s>' % (self.ba_name, ', '.join(
+            '%s %.3fs' % (phase, totals['seconds']) for phase, totals in self.phases.items()))
+
+
+class BaseMetricsSink(object):
+    """
+    Receives a measurement for every phase a client runs, tagged with the client's balancing authority
+    and the phase name, in the style of statsd or Prometheus clients.
+    Subclass this to forward measurements to a metrics system.
+    """
+    def timing(self, name, seconds, tags):
+        """
+        :param str name: Metric name, e.g. 'pyiso.phase.seconds'.
+        :param float seconds: Wall time taken.
+        :param dict tags: Dict of tag names to values, with keys 'ba_name' and 'phase'.
+        """
+        raise NotImplementedError('Derived classes must implement the timing method.')
+
+    def count(self, name, value, tags):
+        """
+        :param str name: Metric name, e.g. 'pyiso.phase.rows'.
+        :param int value: Amount to add to the counter.
+        :param dict tags: Dict of tag names to values, with keys 'ba_name' and 'phase'.
+        """
+        raise NotImplementedError('Derived classes must implement the count method.')
+
+
+class InMemoryMetricsSink(BaseMetricsSink):
+    """
+    Keeps running totals of every metric in memory, per combination of tags.
+    """
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name, value, tags):
+        key = (name,) + tuple(sorted(tags.items()))
+        with self._lock:
+            metric = self.metrics.setdefault(key, {'count': 0, 'total': 0, 'max': None})
+            metric['count'] += 1
+            metric['total'] += value
+            if metric['max'] is None or value > metric['max']:
+                metric['max'] = value
+
+    def timing(self, name, seconds, tags):
+        self._add(name, seconds, tags)
+
+    def count(self, name, value, tags):
+        self._add(name, value, tags)
+
+    def get(self, name, **tags):
+        """
+        :param str name: Metric name.
+        :param tags: Tag values of the metric, e.g. ba_name='CAISO', phase='request'.
+        :return: Dict with the number of measurements (count), their total and their maximum,
+            or None if nothing was measured.
+        :rtype: dict
+        """
+        with self._lock:
+            metric = self.metrics.get((name,) + tuple(sorted(tags.items())))
+            return dict(metric) if metric is not None else None
+
+    def clear(self):
+        with self._lock:
+            self.metrics = {}
+
+
+_default_sink = InMemoryMetricsSink()
+
+
+def default_metrics_sink():
+    """
+    Returns the metrics sink used by clients whose metrics_sink attribute is not set.
+    This is an InMemoryMetricsSink unless set_default_metrics_sink has been called.
+    """
+    return _default_sink
+
+
+def set_default_metrics_sink(sink):
+    """
+    Sends the measurements of all clients whose metrics_sink attribute is not set to sink.
+
+    :param BaseMetricsSink sink: The sink.
+    """
+    global _default_sink
+    _default_sink = sink
+
@@ -1,5 +1,6 @@
 from collections import namedtuple
 from pyiso.base import BaseClient
+from pyiso.cache import CacheRule
 from pyiso import LOGGER
 import pandas as pd
 from io import BytesIO
@@ -28,6 +29,11 @@ class MISOClient(BaseClient):
     # Due to a legacy problem, pytz time zones names are sign reversed
     TZ_NAME = 'Etc/GMT+5'
 
+    # day-ahead reports for past days do not change
+    CACHE_RULES = [
+        CacheRule(r'/(?P<date>\d{8})_da_ex\.xls$', date_format='%Y%m%d'),
+    ]
+
     MARKET_CHOICES = IntervalChoices(hourly='RTHR', fivemin='RT5M', tenmin='RT5M', na='RT5M',
                                      dam='DAHR', hourly_prelim='RTHR_prelim',
                                      dam_exante='DAHR_exante')
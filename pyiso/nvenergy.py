@@ -30,24 +30,10 @@ class NVEnergyClient(BaseClient):
         self.handle_options(data='load', latest=latest,
                             start_at=start_at, end_at=end_at, **kwargs)
 
-        # set up storage
-        parsed_data = []
-
         # collect data
-        for this_date in self.dates():
-            # fetch
-            try:
-                df, mode = self.fetch_df(this_date)
-            except (HTTPError, ValueError):
-                LOGGER.warn('No data available in NVEnergy at %s' % this_date)
-                continue
-
-            # store
-            try:
-                parsed_data += self.parse_load(df, this_date, mode)
-            except KeyError:
-                LOGGER.warn('Unparseable data available in NVEnergy at %s for mode %s: %s' % (this_date, mode, df))
-                continue
+        parsed_data = []
+        for data in self._iter_dates(self.parse_load):
+            parsed_data += data
 
         # return
         return self.time_subset(parsed_data)
@@ -58,10 +44,41 @@ class NVEnergyClient(BaseClient):
         self.handle_options(data='trade', latest=latest,
                             start_at=start_at, end_at=end_at, **kwargs)
 
-        # set up storage
+        # collect data
         parsed_data = []
+        for data in self._iter_dates(self.parse_trade):
+            parsed_data += data
 
-        # collect data
+        # return
+        return self.time_subset(parsed_data)
+
+    def iter_load(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='load', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        # yield data for each day
+        for data in self._iter_dates(self.parse_load):
+            subset = self.time_subset(data)
+            if len(subset) > 0:
+                yield subset
+
+    def iter_trade(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='trade', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        # yield data for each day
+        for data in self._iter_dates(self.parse_trade):
+            subset = self.time_subset(data)
+            if len(subset) > 0:
+                yield subset
+
+    def _iter_dates(self, parser):
+        """
+        Fetches and parses the file for each date in self.dates(), yielding the parsed list for each date.
+        Dates with missing or unparseable data are skipped.
+        """
         for this_date in self.dates():
             # fetch
             try:
@@ -70,15 +87,14 @@ class NVEnergyClient(BaseClient):
                 LOGGER.warn('No data available in NVEnergy at %s' % this_date)
                 continue
 
-            # store
+            # parse
             try:
-                parsed_data += self.parse_trade(df, this_date, mode)
+                data = parser(df, this_date, mode)
             except KeyError:
-                LOGGER.warn('Unparseable data available in NVEnergy at %s: %s' % (this_date, df))
+                LOGGER.warn('Unparseable data available in NVEnergy at %s for mode %s: %s' % (this_date, mode, df))
                 continue
 
-        # return
-        return self.time_subset(parsed_data)
+            yield data
 
     def data_url(self, ts, mode=None):
         # today's date in local time
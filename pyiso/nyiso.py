@@ -1,7 +1,9 @@
 from pyiso.base import BaseClient
+from pyiso.cache import CacheRule
 from pyiso import LOGGER
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from datetime import timedelta
 
 
@@ -12,6 +14,12 @@ class NYISOClient(BaseClient):
 
     TZ_NAME = 'America/New_York'
 
+    # monthly zips and daily csvs for past dates do not change
+    CACHE_RULES = [
+        CacheRule(r'/(?P<date>\d{8})\w+_csv\.zip$', date_format='%Y%m%d', covers=timedelta(days=31)),
+        CacheRule(r'/(?P<date>\d{8})\w+\.csv$', date_format='%Y%m%d'),
+    ]
+
     fuel_names = {
         'Other Fossil Fuels': 'fossil',  # coal or oil
         'Other Renewables': 'renewable',  # solar, methane, refuse, wood
@@ -52,25 +60,8 @@ class NYISOClient(BaseClient):
                             start_at=start_at, end_at=end_at, **kwargs)
 
         # get data
-        if self.options['forecast']:
-            # always include today
-            dates_list = self.dates() + [self.local_now().date()]
-
-            # get data
-            df = self.get_any('isolf', self.parse_load_forecast, dates_list=dates_list)
-            extras = {
-                'ba_name': self.NAME,
-                'freq': self.FREQUENCY_CHOICES.hourly,
-                'market': self.MARKET_CHOICES.dam,
-            }
-        else:
-            # get data
-            df = self.get_any('pal', self.parse_load_rtm)
-            extras = {
-                'ba_name': self.NAME,
-                'freq': self.FREQUENCY_CHOICES.fivemin,
-                'market': self.MARKET_CHOICES.fivemin,
-            }
+        label, parser, dates_list, extras = self.load_source()
+        df = self.get_any(label, parser, dates_list=dates_list)
 
         # serialize and return
         return self.serialize_faster(df, extras=extras)
@@ -82,14 +73,9 @@ class NYISOClient(BaseClient):
 
         # get data
         df = self.get_any('ExternalLimitsFlows', self.parse_trade)
-        extras = {
-            'ba_name': self.NAME,
-            'freq': self.FREQUENCY_CHOICES.fivemin,
-            'market': self.MARKET_CHOICES.fivemin,
-        }
 
         # serialize and return
-        return self.serialize_faster(df, extras=extras)
+        return self.serialize_faster(df, extras=self.fivemin_extras())
 
     def get_generation(self, latest=False, start_at=False, end_at=False, **kwargs):
         # set args
@@ -98,15 +84,59 @@ class NYISOClient(BaseClient):
 
         # get data
         df = self.get_any('rtfuelmix', self.parse_genmix)
-        extras = {
+
+        # serialize and return
+        return self.serialize_faster(df, extras=self.fivemin_extras())
+
+    def iter_load(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='load', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        # yield data for each csv
+        label, parser, dates_list, extras = self.load_source()
+        for df in self.iter_any(label, parser, dates_list=dates_list):
+            yield self.serialize_faster(df, extras=extras)
+
+    def iter_trade(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='trade', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        # yield data for each csv
+        for df in self.iter_any('ExternalLimitsFlows', self.parse_trade):
+            yield self.serialize_faster(df, extras=self.fivemin_extras())
+
+    def iter_generation(self, start_at=False, end_at=False, **kwargs):
+        # set args
+        self.handle_options(data='gen', latest=False,
+                            start_at=start_at, end_at=end_at, **kwargs)
+
+        # yield data for each csv
+        for df in self.iter_any('rtfuelmix', self.parse_genmix):
+            yield self.serialize_faster(df, extras=self.fivemin_extras())
+
+    def load_source(self):
+        """Returns the csv label, parser, list of dates and serialization extras for load data."""
+        if self.options['forecast']:
+            # always include today
+            dates_list = self.dates() + [self.local_now().date()]
+            extras = {
+                'ba_name': self.NAME,
+                'freq': self.FREQUENCY_CHOICES.hourly,
+                'market': self.MARKET_CHOICES.dam,
+            }
+            return 'isolf', self.parse_load_forecast, dates_list, extras
+        else:
+            return 'pal', self.parse_load_rtm, None, self.fivemin_extras()
+
+    def fivemin_extras(self):
+        return {
             'ba_name': self.NAME,
             'freq': self.FREQUENCY_CHOICES.fivemin,
             'market': self.MARKET_CHOICES.fivemin,
         }
 
-        # serialize and return
-        return self.serialize_faster(df, extras=extras)
-
     def get_any(self, label, parser, dates_list=None):
         # set up storage
         pieces = []
@@ -115,21 +145,11 @@ class NYISOClient(BaseClient):
         if not dates_list:
             dates_list = self.dates()
 
-        # fetch and parse all csvs
-        for date in dates_list:
-            for csv in self.fetch_csvs(date, label):
-
-                try:
-                    pieces.append(parser(csv))
-                except AttributeError:
-                    pass
-
-            # if fetch_csvs cannot get the individual days, it gets the whole month
-            # Shortcut the loop if any call to fetch_csvs gets all dates in dates_list
+        # fetch all csvs concurrently, then parse them in date order
+        for csv in self.fetch_csvs_range(sorted(set(dates_list)), label):
             try:
-                if (pieces[-1].index[-1] - timedelta(days=1)).date() > max(dates_list):
-                    break
-            except IndexError:
+                pieces.append(parser(csv))
+            except AttributeError:
                 pass
 
         # combine pieces
@@ -138,18 +158,95 @@ class NYISOClient(BaseClient):
         else:
             return pd.DataFrame()
 
+        # dedup, slice and return
+        return self.slice_times(self.drop_duplicate_fuels(df))
+
+    def iter_any(self, label, parser, dates_list=None):
+        """
+        Like get_any, but yields a sliced DataFrame for each csv as soon as it is parsed.
+        Csvs are fetched one month at a time, concurrently within each month.
+        """
+        # get dates
+        if not dates_list:
+            dates_list = self.dates()
+
+        # group dates by month
+        months = OrderedDict()
+        for date in sorted(set(dates_list)):
+            months.setdefault(date.replace(day=1), []).append(date)
+
+        # fetch and parse one month at a time
+        for month_dates in months.values():
+            for csv in self.fetch_csvs_range(month_dates, label):
+                try:
+                    df = parser(csv)
+                except AttributeError:
+                    continue
+
+                sliced = self.slice_times(self.drop_duplicate_fuels(df))
+                if len(sliced) > 0:
+                    yield sliced
+
+    def drop_duplicate_fuels(self, df):
         # genmix may have repeated times, so dedup
         if 'fuel_name' in df.columns:
             # can't drop dups on index, only columns
             df['dummy_timestamp'] = df.index
             df.drop_duplicates(subset=['dummy_timestamp', 'fuel_name'], inplace=True, keep='last')
             del df['dummy_timestamp']
-
-        # slice and return
-        sliced = self.slice_times(df)
-        return sliced
+        return df
+
+    def fetch_csvs_range(self, dates_list, label):
+        """
+        Fetch csv content for every date in a sorted list of dates, making requests concurrently.
+        Returns a list of csv content strings in date order.
+
+        The daily csv for the first date in each month is requested first. If it is missing,
+        the zipped monthly data covers the whole month, so no other daily csvs are requested for that month.
+        Zipped monthly data is requested at most once per month, and when it is found it replaces
+        the month's daily csvs, so that no date is returned twice.
+        """
+        # group dates by month
+        months = OrderedDict()
+        for date in dates_list:
+            months.setdefault(date.replace(day=1), []).append(date)
+
+        # request daily csvs for the first date in each month
+        first_dates = [month_dates[0] for month_dates in months.values()]
+        daily = dict(zip(first_dates, self.map_concurrently(lambda d: self.fetch_daily_csv(d, label), first_dates)))
+
+        # request remaining daily csvs, only in months where daily data exists
+        rest_dates = []
+        for month_dates in months.values():
+            if daily[month_dates[0]] is not None:
+                rest_dates += month_dates[1:]
+        daily.update(zip(rest_dates, self.map_concurrently(lambda d: self.fetch_daily_csv(d, label), rest_dates)))
+
+        # request zipped monthly data wherever a daily csv is missing
+        zip_months = [month for month, month_dates in months.items()
+                      if any(daily.get(date) is None for date in month_dates)]
+        monthly = dict(zip(zip_months, self.map_concurrently(lambda m: self.fetch_monthly_csvs(m, label), zip_months)))
+
+        # assemble in date order
+        csvs = []
+        for month, month_dates in months.items():
+            if monthly.get(month):
+                csvs += monthly[month]
+            else:
+                csvs += [daily[date] for date in month_dates if daily.get(date) is not None]
+        return csvs
 
     def fetch_csvs(self, date, label):
+        # try daily data
+        csv = self.fetch_daily_csv(date, label)
+        if csv is not None:
+            return [csv]
+
+        # if failure, try zipped monthly data
+        return self.fetch_monthly_csvs(date, label)
+
+    def fetch_daily_csv(self, date, label):
+        """Returns the content of the daily csv, or None if it could not be found."""
         # construct url
         datestr = date.strftime('%Y%m%d')
         url = '%s/%s/%s%s.csv' % (self.base_url, label, datestr, label)
@@ -159,9 +256,12 @@ class NYISOClient(BaseClient):
 
         # if 200, return
         if response and response.status_code == 200:
-            return [response.text]
+            return response.text
+        return None
 
-        # if failure, try zipped monthly data
+    def fetch_monthly_csvs(self, date, label):
+        """Returns a list with the content of each csv in the zipped data for the month containing date."""
+        # construct url
         datestr = date.strftime('%Y%m01')
         url = '%s/%s/%s%s_csv.zip' % (self.base_url, label, datestr, label)
 
@@ -206,16 +206,16 @@ class PJMClient(BaseClient):
                 load_ts, load_val = self.fetch_oasis_data()
             if not (load_ts and load_val):
                 LOGGER.warn('No PJM latest load data')
-                return []
+                return self.format_output([])
 
             # format and return
-            return [{
+            return self.format_output([{
                 'timestamp': load_ts,
                 'freq': self.FREQUENCY_CHOICES.fivemin,
                 'market': self.MARKET_CHOICES.fivemin,
                 'load_MW': load_val,
                 'ba_name': self.NAME,
-            }]
+            }])
 
     def get_trade(self, latest=False, **kwargs):
         # set args
@@ -229,15 +229,15 @@ class PJMClient(BaseClient):
 
         # format and return
         if ts and val:
-            return [{
+            return self.format_output([{
                     'timestamp': ts,
                     'freq': self.FREQUENCY_CHOICES.fivemin,
                     'market': self.MARKET_CHOICES.fivemin,
                     'net_exp_MW': -val,
                     'ba_name': self.NAME,
-                    }]
+                    }])
         else:
-            return []
+            return self.format_output([])
 
     def handle_options(self, **kwargs):
         super(PJMClient, self).handle_options(**kwargs)
@@ -369,7 +369,7 @@ class PJMClient(BaseClient):
         if soup:
             data = self.parse_realtime_genmix(soup)
         else:
-            return []
+            return self.format_output([])
 
         # return
-        return data
+        return self.format_output(data)
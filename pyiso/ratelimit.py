@@ -0,0 +1,65 @@
+import threading
+from collections import deque
+from time import sleep
+from timeit import default_timer
+
+
+class RateLimiter(object):
+    """
+    Limits calls to at most ``max_calls`` in any ``period`` seconds.
+    Callers block in acquire until a call is allowed. The limiter is thread safe, so one limiter can be
+    shared by every thread making requests with the same API key.
+    """
+    def __init__(self, max_calls, period=60.0, clock=default_timer, sleep=sleep):
+        """
+        :param int max_calls: Maximum number of calls in any period.
+        :param float period: Length of the period in seconds.
+        :param callable clock: Function returning the current time in seconds.
+        :param callable sleep: Function that waits a number of seconds.
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self._clock = clock
+        self._sleep = sleep
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a call is allowed, then counts the call.
+
+        :return: Seconds spent waiting.
+        :rtype: float
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                while self._calls and self._calls[0] <= now - self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return waited
+                wait = self._calls[0] + self.period - now
+            self._sleep(wait)
+            waited += wait
+
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(key, max_calls, period=60.0):
+    """
+    Returns the RateLimiter shared by all clients that use key (e.g. an API token),
+    creating it with max_calls and period the first time.
+
+    :param str key: Identifies the rate limited account.
+    :param int max_calls: Maximum number of calls in any period.
+    :param float period: Length of the period in seconds.
+    :rtype: RateLimiter
+    """
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = RateLimiter(max_calls, period=period)
+        return _shared_limiters[key]
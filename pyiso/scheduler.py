@@ -0,0 +1,254 @@
+import hashlib
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from time import sleep
+
+import pytz
+
+from pyiso import BALANCING_AUTHORITIES, LOGGER, client_class, pooled_client
+from pyiso.engine import GETTERS
+from pyiso.watch import ResponseHashes, UnchangedResponses
+
+
+# period of each FREQUENCY_CHOICES interval
+CHOICE_PERIODS = {
+    'hourly': timedelta(hours=1),
+    'fivemin': timedelta(minutes=5),
+    'tenmin': timedelta(minutes=10),
+    'fifteenmin': timedelta(minutes=15),
+    'dam': timedelta(hours=1),
+}
+
+# publication period of latest data where it differs from the freq of the data, by (balancing authority, data type);
+# a data type of None applies to all data types
+KNOWN_PERIODS = dict([
+    (('CAISO', 'gen'), timedelta(minutes=10)),
+    (('NYISO', None), timedelta(minutes=5)),
+    (('PJM', 'gen'), timedelta(hours=1)),
+] + [((ba_name, None), timedelta(minutes=5))
+     for ba_name, client_vals in BALANCING_AUTHORITIES.items() if client_vals['module'] == 'sveri'])
+
+# period used until the freq of a job's data is known
+DEFAULT_PERIOD = timedelta(minutes=5)
+
+# publish lag assumed until one has been observed
+DEFAULT_LAG = timedelta(minutes=1)
+
+# time added to the observed publish lag, so that polls land just after publication
+LAG_MARGIN = timedelta(seconds=30)
+
+# number of recent publish lag observations kept per job
+LAG_SAMPLES = 12
+
+
+class PollJob(object):
+    """
+    Latest data of one data type of one balancing authority, with its schedule.
+    """
+    def __init__(self, ba_name, data, period=None, lag=DEFAULT_LAG, **kwargs):
+        """
+        :param str ba_name: The balancing authority, as for client_factory.
+        :param str data: One of 'gen', 'load' or 'trade'.
+        :param timedelta period: Publication period. If not provided, a known period for the balancing authority
+            is used, otherwise the period of the freq of the first data polled.
+        :param timedelta lag: Publish lag assumed until one has been observed.
+        :param kwargs: Other options passed to the client's get_* method.
+        """
+        if data not in GETTERS:
+            raise ValueError('data must be one of %s, not %s' % (sorted(GETTERS.keys()), data))
+        self.ba_name = ba_name
+        self.data = data
+        self.kwargs = kwargs
+        self.period = period or KNOWN_PERIODS.get((ba_name.upper(), data), KNOWN_PERIODS.get((ba_name.upper(), None)))
+        self.period_known = self.period is not None
+        self.default_lag = lag
+        self.lags = deque(maxlen=LAG_SAMPLES)
+        self.last_timestamp = None
+        self.last_hash = None
+        self.next_run = None
+
+        # hashes of the raw responses of the last poll, so unchanged responses are not parsed again
+        self.response_hashes = ResponseHashes()
+
+        # whether a poll since the last new data point came back without a new point
+        self.missed = False
+
+    def get_period(self):
+        return self.period or DEFAULT_PERIOD
+
+    def get_lag(self):
+        """Returns the publish lag: the shortest recently observed, or the default if none has been observed."""
+        return min(self.lags) if self.lags else self.default_lag
+
+    def retry_interval(self):
+        """Returns how long to wait before polling again when the expected data was not there yet."""
+        return max(self.get_period() // 5, timedelta(minutes=1))
+
+    def __repr__(self):
+        return '<PollJob %s %s next %s>' % (self.ba_name, self.data, self.next_run)
+
+
+def freq_period(client, freq):
+    """
+    :param BaseClient client: The client whose FREQUENCY_CHOICES freq is from.
+    :param str freq: The freq of a data point, e.g. '5m'.
+    :return: The period of freq, or None if it is not known.
+    :rtype: timedelta
+    """
+    for choice, period in CHOICE_PERIODS.items():
+        if getattr(client.FREQUENCY_CHOICES, choice, None) == freq:
+            return period
+    return None
+
+
+def content_hash(data):
+    """Returns a hash of the data points returned by a client, which is the same when the data is unchanged."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def utcnow():
+    return datetime.now(pytz.utc)
+
+
+class PollingScheduler(object):
+    """
+    Polls the latest data of many balancing authorities, each just after new data is expected to be published.
+
+    After each poll that returns a new data point, the next poll is planned for the next expected timestamp
+    (the newest timestamp plus the job's period) plus the job's publish lag.
+    The lag is learned from how long after its timestamp each new data point was first seen on a retry,
+    after an earlier poll for it came back without it; points found on time say nothing new about the lag.
+    When the expected data is not there yet, the job is polled again after a fraction of its period.
+    Polls whose data hashes the same as the previous poll's are not passed to the callback.
+    With the default fetch, responses that are byte for byte the same as the previous poll's are not parsed either;
+    they are still downloaded, since most sources do not answer conditional requests.
+    """
+    def __init__(self, callback, jobs=None, fetch=None, clock=utcnow, sleep=sleep):
+        """
+        :param callable callback: Called as callback(job, data) with the data of each poll that changed.
+        :param list jobs: PollJobs to schedule. More can be added with add.
+        :param callable fetch: Called as fetch(job) to get the data of a job.
+            Defaults to calling the job's get_* method with latest=True on a pooled client.
+        :param callable clock: Returns the current tz-aware datetime.
+        :param callable sleep: Waits a number of seconds.
+        """
+        self.callback = callback
+        self.jobs = list(jobs or [])
+        self.fetch = fetch or self.fetch_latest
+        self._clock = clock
+        self._sleep = sleep
+
+    def add(self, ba_name, data='gen', **kwargs):
+        """
+        Adds a PollJob, first polled at the next call to run_pending.
+
+        :return: The job.
+        :rtype: PollJob
+        """
+        job = PollJob(ba_name, data, **kwargs)
+        self.jobs.append(job)
+        return job
+
+    @staticmethod
+    def fetch_latest(job):
+        """
+        :raises UnchangedResponses: if the responses are the same as in the previous poll of the job.
+        """
+        with pooled_client(job.ba_name) as client:
+            job.response_hashes.start_call()
+            client.response_hashes = job.response_hashes
+            return getattr(client, GETTERS[job.data])(latest=True, **job.kwargs)
+
+    def due(self, now):
+        return [job for job in self.jobs if job.next_run is None or job.next_run <= now]
+
+    def run_pending(self):
+        """
+        Polls the jobs that are due.
+
+        :return: Number of jobs polled.
+        :rtype: int
+        """
+        jobs = self.due(self._clock())
+        for job in jobs:
+            self.poll(job)
+        return len(jobs)
+
+    def run(self, stop_event=None, max_sleep=60):
+        """
+        Polls jobs as they become due until stop_event is set.
+
+        :param threading.Event stop_event: Event that stops the loop. If not provided, runs forever.
+        :param float max_sleep: Longest time in seconds to wait between checks for due jobs.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.run_pending()
+            next_runs = [job.next_run for job in self.jobs if job.next_run is not None]
+            wait = max_sleep
+            if next_runs:
+                wait = min(max((min(next_runs) - self._clock()).total_seconds(), 0), max_sleep)
+            self._sleep(wait)
+
+    def poll(self, job):
+        """
+        Polls one job, passes its data to the callback if it changed, and plans its next poll.
+        """
+        fetched_at = self._clock()
+        try:
+            data = self.fetch(job)
+        except UnchangedResponses:
+            LOGGER.debug('%s: %s responses unchanged' % (job.ba_name, job.data))
+            job.missed = True
+            self.plan(job, fetched_at)
+            return
+        except Exception as e:
+            LOGGER.error('%s: error polling %s: %s' % (job.ba_name, job.data, e))
+            data = None
+
+        if not data:
+            job.missed = True
+            self.plan(job, fetched_at)
+            return
+
+        # learn the period from the data
+        if not job.period_known:
+            period = freq_period(client_class(job.ba_name), data[-1].get('freq'))
+            if period is not None:
+                job.period = period
+                job.period_known = True
+
+        # new data point found on a retry: observe the publish lag
+        newest = max(dp['timestamp'] for dp in data)
+        is_new = job.last_timestamp is None or newest > job.last_timestamp
+        if is_new:
+            if job.last_timestamp is not None and job.missed and newest <= fetched_at:
+                job.lags.append(fetched_at - newest)
+            job.last_timestamp = newest
+            job.missed = False
+        else:
+            job.missed = True
+
+        # pass on changed content
+        data_hash = content_hash(data)
+        if data_hash != job.last_hash:
+            job.last_hash = data_hash
+            self.callback(job, data)
+        else:
+            LOGGER.debug('%s: %s unchanged' % (job.ba_name, job.data))
+
+        self.plan(job, fetched_at)
+
+    def plan(self, job, fetched_at):
+        """
+        Plans the next poll of a job: when its next data point is expected, or after its retry interval
+        if that time has passed or no data point has been seen yet.
+        """
+        expected_at = None
+        if job.last_timestamp is not None:
+            expected_at = job.last_timestamp + job.get_period() + job.get_lag() + LAG_MARGIN
+        if expected_at is None or expected_at <= fetched_at:
+            expected_at = fetched_at + job.retry_interval()
+        job.next_run = expected_at
@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+from pyiso import LOGGER
+
+
+# fields of data points that hold values; the other fields identify the point
+VALUE_FIELDS = frozenset(['gen_MW', 'load_MW', 'imp_MW', 'exp_MW', 'net_exp_MW', 'lmp', 'price'])
+
+# sortable text format of UTC timestamps in the store
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# gaps between covered intervals shorter than this are not fetched
+MIN_GAP = timedelta(microseconds=1)
+
+
+def format_timestamp(ts):
+    return ts.astimezone(pytz.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def parse_timestamp(ts_str):
+    return pytz.utc.localize(datetime.strptime(ts_str, TIMESTAMP_FORMAT))
+
+
+def _json_default(value):
+    # numpy scalars
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class SQLiteTimeSeriesStore(object):
+    """
+    Stores the data points returned by clients' get_* methods in a single SQLite file, keyed by balancing authority,
+    data type, query options (such as market and freq) and timestamp, along with the time intervals that have been
+    fetched for each key. Clients use it to fetch only the parts of a requested range that are not stored yet.
+    """
+    def __init__(self, path):
+        """
+        :param str path: Path of the SQLite database file. Parent directories are created if needed.
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+        dir_name = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('CREATE TABLE IF NOT EXISTS points ('
+                             'ba_name TEXT, data TEXT, options TEXT, timestamp TEXT, series TEXT, point TEXT, '
+                             'PRIMARY KEY (ba_name, data, options, timestamp, series))')
+                conn.execute('CREATE TABLE IF NOT EXISTS coverage ('
+                             'ba_name TEXT, data TEXT, options TEXT, start_at TEXT, end_at TEXT)')
+                conn.execute('CREATE INDEX IF NOT EXISTS coverage_key ON coverage (ba_name, data, options, start_at)')
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def options_key(options):
+        """
+        :param dict options: The options of a get_* call other than its time range, e.g. market and freq.
+        :return: A key that is the same for equivalent options.
+        :rtype: str
+        """
+        return json.dumps(sorted((str(k), str(v)) for k, v in (options or {}).items()))
+
+    def covered(self, ba_name, data, options, start_at, end_at):
+        """
+        :return: Sorted list of (start_at, end_at) tuples of the stored intervals that overlap the range.
+        :rtype: list
+        """
+        with self.lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT start_at, end_at FROM coverage '
+                                    'WHERE ba_name = ? AND data = ? AND options = ? AND start_at <= ? AND end_at >= ? '
+                                    'ORDER BY start_at',
+                                    (ba_name, data, self.options_key(options),
+                                     format_timestamp(end_at), format_timestamp(start_at))).fetchall()
+            finally:
+                conn.close()
+        return [(parse_timestamp(start), parse_timestamp(end)) for start, end in rows]
+
+    def gaps(self, ba_name, data, options, start_at, end_at):
+        """
+        :param str ba_name: The balancing authority.
+        :param str data: One of 'gen', 'load' or 'trade'.
+        :param dict options: The options of the get_* call other than its time range.
+        :param datetime start_at: Start of the range, tz-aware.
+        :param datetime end_at: End of the range, tz-aware.
+        :return: Sorted list of (start_at, end_at) tuples of the parts of the range that are not stored.
+        :rtype: list
+        """
+        gaps = []
+        gap_start = start_at
+        for covered_start, covered_end in self.covered(ba_name, data, options, start_at, end_at):
+            if covered_start - gap_start >= MIN_GAP:
+                gaps.append((gap_start, covered_start))
+            gap_start = max(gap_start, covered_end)
+        if end_at - gap_start >= MIN_GAP:
+            gaps.append((gap_start, end_at))
+        return gaps
+
+    def add(self, ba_name, data, options, points, start_at=None, end_at=None):
+        """
+        Stores data points, replacing stored points with the same timestamp and identifying fields,
+        and marks the interval they were fetched for as stored.
+
+        :param str ba_name: The balancing authority.
+        :param str data: One of 'gen', 'load' or 'trade'.
+        :param dict options: The options of the get_* call other than its time range.
+        :param list points: List of dicts of data points, as returned by get_*.
+        :param datetime start_at: Start of the interval that was fetched. If either end is not provided,
+            no interval is marked as stored.
+        :param datetime end_at: End of the interval that was fetched.
+        """
+        options_key = self.options_key(options)
+        rows = []
+        for point in points:
+            series = json.dumps(sorted((k, v) for k, v in point.items() if k not in VALUE_FIELDS and k != 'timestamp'),
+                                default=_json_default)
+            stored_point = dict((k, v) for k, v in point.items() if k != 'timestamp')
+            rows.append((ba_name, data, options_key, format_timestamp(point['timestamp']), series,
+                         json.dumps(stored_point, default=_json_default)))
+
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.executemany('INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?, ?)', rows)
+                if start_at is not None and end_at is not None:
+                    self._add_coverage(conn, ba_name, data, options_key, start_at, end_at)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def add_coverage(self, ba_name, data, options, intervals):
+        """
+        Marks intervals as stored, without storing any data points.
+
+        :param list intervals: List of (start_at, end_at) tuples of tz-aware datetimes.
+        """
+        options_key = self.options_key(options)
+        with self.lock:
+            conn = self._connect()
+            try:
+                for start_at, end_at in intervals:
+                    self._add_coverage(conn, ba_name, data, options_key, start_at, end_at)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _add_coverage(self, conn, ba_name, data, options_key, start_at, end_at):
+        # merge with the intervals it overlaps or touches
+        key = (ba_name, data, options_key)
+        overlapping = conn.execute('SELECT start_at, end_at FROM coverage '
+                                   'WHERE ba_name = ? AND data = ? AND options = ? AND start_at <= ? AND end_at >= ?',
+                                   key + (format_timestamp(end_at + MIN_GAP),
+                                          format_timestamp(start_at - MIN_GAP))).fetchall()
+        start_str = min([format_timestamp(start_at)] + [start for start, end in overlapping])
+        end_str = max([format_timestamp(end_at)] + [end for start, end in overlapping])
+        conn.executemany('DELETE FROM coverage WHERE ba_name = ? AND data = ? AND options = ? AND start_at = ?',
+                         [key + (start,) for start, end in overlapping])
+        conn.execute('INSERT INTO coverage VALUES (?, ?, ?, ?, ?)', key + (start_str, end_str))
+
+    def get(self, ba_name, data, options, start_at, end_at):
+        """
+        :return: List of dicts of the stored data points with timestamps in the range, in chronological order.
+        :rtype: list
+        """
+        with self.lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute('SELECT timestamp, point FROM points '
+                                    'WHERE ba_name = ? AND data = ? AND options = ? AND timestamp >= ? AND timestamp <= ? '
+                                    'ORDER BY timestamp, series',
+                                    (ba_name, data, self.options_key(options),
+                                     format_timestamp(start_at), format_timestamp(end_at))).fetchall()
+            finally:
+                conn.close()
+
+        points = []
+        for ts_str, point_json in rows:
+            point = json.loads(point_json)
+            point['timestamp'] = parse_timestamp(ts_str)
+            points.append(point)
+        return points
+
+    def clear(self):
+        """Removes all entries."""
+        with self.lock:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM points')
+                conn.execute('DELETE FROM coverage')
+                conn.commit()
+            finally:
+                conn.close()
+
+
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+
+def default_store():
+    """
+    Returns the time series store configured by the PYISO_STORE_PATH environment variable, or None if it is not set.
+    """
+    path = os.environ.get('PYISO_STORE_PATH')
+    if not path:
+        return None
+
+    with _shared_stores_lock:
+        if path not in _shared_stores:
+            LOGGER.debug('Storing data points in %s' % path)
+            _shared_stores[path] = SQLiteTimeSeriesStore(path)
+        return _shared_stores[path]
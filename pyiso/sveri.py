@@ -73,7 +73,7 @@ class SVERIClient(BaseClient):
     def _clean_and_serialize(self, df):
         # if no data, nothing to do
         if len(df) == 0:
-            return []
+            return self.format_output([])
 
         # clean
         cleaned_df = self.clean_df(df)
@@ -98,10 +98,10 @@ class SVERIClient(BaseClient):
         response = self.request(self.BASE_URL, params=payloads[0])
         response2 = self.request(self.BASE_URL, params=payloads[1])
         if not response or not response2:
-            return []
+            return self.format_output([])
 
         if response.text == 'Invalid ids string.' or response2.text == 'Invalid ids string':
-            return []
+            return self.format_output([])
 
         # parse
         df = self.parse_to_df(response.content, header=0,
@@ -123,7 +123,7 @@ class SVERIClient(BaseClient):
         payload = self.get_load_payload()
         response = self.request(self.BASE_URL, params=payload)
         if not response:
-            return []
+            return self.format_output([])
 
         # parse
         df = self.parse_to_df(response.content, header=0, parse_dates=True, date_parser=self.date_parser, index_col=0)
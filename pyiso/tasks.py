@@ -1,6 +1,6 @@
 from __future__ import absolute_import
 from celery import shared_task
-from pyiso import client_factory
+from pyiso import engine, pooled_client
 import logging
 from datetime import datetime
 
@@ -11,8 +11,8 @@ logger = logging.getLogger(__name__)
 @shared_task
 def get_generation(ba_name, **kwargs):
     # get data
-    c = client_factory(ba_name)
-    data = c.get_generation(**kwargs)
+    with pooled_client(ba_name) as c:
+        data = c.get_generation(**kwargs)
 
     # log
     if len(data) == 0:
@@ -26,8 +26,8 @@ def get_generation(ba_name, **kwargs):
 @shared_task
 def get_load(ba_name, **kwargs):
     # get data
-    c = client_factory(ba_name)
-    data = c.get_load(**kwargs)
+    with pooled_client(ba_name) as c:
+        data = c.get_load(**kwargs)
 
     # log
     if len(data) == 0:
@@ -42,8 +42,8 @@ def get_load(ba_name, **kwargs):
 @shared_task
 def get_trade(ba_name, **kwargs):
     # get data
-    c = client_factory(ba_name)
-    data = c.get_trade(**kwargs)
+    with pooled_client(ba_name) as c:
+        data = c.get_trade(**kwargs)
 
     # log
     if len(data) == 0:
@@ -55,3 +55,17 @@ def get_trade(ba_name, **kwargs):
     return data
 
 
+@shared_task
+def fetch_all(data='gen', **kwargs):
+    # get data for all BAs over one shared connection pool
+    results = engine.fetch_all(data=data, **kwargs)
+
+    # log
+    for ba_name, ba_data in results.items():
+        if len(ba_data) == 0:
+            msg = '%s: No %s data at %s with args %s' % (ba_name, data, datetime.utcnow().isoformat(),
+                                                        kwargs)
+            logger.warn(msg)
+
+    # return
+    return results
@@ -0,0 +1,141 @@
+import hashlib
+from datetime import timedelta
+
+from pyiso import LOGGER, client_factory
+from pyiso.engine import GETTERS
+from pyiso.store import VALUE_FIELDS
+
+# how long before the last emitted timestamp revised points are still looked for
+REVISION_WINDOW = timedelta(days=1)
+
+
+class UnchangedResponses(Exception):
+    """
+    Raised by a client in watch mode when every response of a call is the same as in the previous call,
+    so that the responses are not parsed again.
+    """
+    pass
+
+
+class ResponseHashes(object):
+    """
+    Hashes of the response bodies of the previous and current call of a client, in the order they were requested.
+    Set a client's response_hashes attribute to one of these to have request raise UnchangedResponses
+    as soon as the call has received the same responses as the previous call.
+    """
+    def __init__(self):
+        self.previous = []
+        self.current = []
+
+    def start_call(self):
+        """Starts a new call, keeping the hashes of the last call to compare with."""
+        if self.current:
+            self.previous = self.current
+        self.current = []
+
+    def check(self, url, params, content):
+        """
+        Records the hash of a response body.
+
+        :param str url: The URL requested.
+        :param dict params: The query parameters of the request, if any.
+        :param bytes content: The response body.
+        :raises UnchangedResponses: if every response of the call so far is the same as in the previous call,
+            and the previous call had no further responses.
+        """
+        request_key = (url, tuple(sorted((params or {}).items())))
+        self.current.append((request_key, hashlib.sha1(content).hexdigest()))
+        if self.current == self.previous:
+            raise UnchangedResponses()
+
+
+class Watcher(object):
+    """
+    Polls the latest data of one balancing authority, and returns only the data points that are new or revised
+    since the previous poll.
+
+    The last emitted timestamp is kept per data type and market, along with the values of the points emitted
+    within REVISION_WINDOW of it. When the responses of a poll are byte for byte the same as the previous poll's,
+    they are not parsed and nothing is emitted.
+    """
+    def __init__(self, ba_name, client=None):
+        """
+        :param str ba_name: The balancing authority, as for client_factory.
+        :param BaseClient client: The client to poll with. If not provided, one is created with client_factory.
+        """
+        self.ba_name = ba_name
+        self.client = client or client_factory(ba_name)
+
+        # (data, call options) -> ResponseHashes
+        self.response_hashes = {}
+
+        # (data, market) -> last emitted timestamp
+        self.last_timestamps = {}
+
+        # (data, market) -> {point identity: point values}
+        self.emitted_values = {}
+
+    def poll(self, data='gen', **kwargs):
+        """
+        :param str data: One of 'gen', 'load' or 'trade'.
+        :param kwargs: Other options passed to the client's get_* method, which is called with latest=True.
+            The output option must be 'list', its default.
+        :return: List of dicts of the data points that are new or revised since the previous poll.
+        :rtype: list
+        """
+        if data not in GETTERS:
+            raise ValueError('data must be one of %s, not %s' % (sorted(GETTERS.keys()), data))
+        if kwargs.get('output', 'list') != 'list':
+            raise ValueError('Watcher only supports list output, not %s' % kwargs['output'])
+
+        call_key = (data, tuple(sorted(kwargs.items())))
+        response_hashes = self.response_hashes.setdefault(call_key, ResponseHashes())
+        response_hashes.start_call()
+        self.client.response_hashes = response_hashes
+        try:
+            points = getattr(self.client, GETTERS[data])(latest=True, **kwargs)
+        except UnchangedResponses:
+            LOGGER.debug('%s: %s responses unchanged' % (self.ba_name, data))
+            return []
+        finally:
+            self.client.response_hashes = None
+
+        if points is None:
+            return []
+        return self.changed(data, points)
+
+    def changed(self, data, points):
+        """
+        Remembers the points, and returns those that are new or revised.
+
+        :param str data: One of 'gen', 'load' or 'trade'.
+        :param list points: List of dicts of data points.
+        :rtype: list
+        """
+        result = []
+        for point in points:
+            key = (data, point.get('market'))
+            last_timestamp = self.last_timestamps.get(key)
+            identity = tuple(sorted((k, v) for k, v in point.items() if k not in VALUE_FIELDS))
+            values = tuple(sorted((k, v) for k, v in point.items() if k in VALUE_FIELDS))
+            emitted = self.emitted_values.setdefault(key, {})
+
+            if last_timestamp is not None and point['timestamp'] < last_timestamp - REVISION_WINDOW:
+                continue
+            if emitted.get(identity) == values:
+                continue
+            emitted[identity] = values
+            result.append(point)
+
+        # move the last emitted timestamps on, and forget values that can no longer be revised
+        for point in result:
+            key = (data, point.get('market'))
+            if key not in self.last_timestamps or point['timestamp'] > self.last_timestamps[key]:
+                self.last_timestamps[key] = point['timestamp']
+        for key, emitted in self.emitted_values.items():
+            if key in self.last_timestamps:
+                horizon = self.last_timestamps[key] - REVISION_WINDOW
+                for identity in [i for i in emitted if dict(i)['timestamp'] < horizon]:
+                    del emitted[identity]
+
+        return result
@@ -63,6 +63,12 @@ setup(
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
     test_suite='nose.collector',
+    extras_require={
+        'parquet': ['pyarrow'],
+    },
+    entry_points={
+        'console_scripts': ['pyiso-backfill = pyiso.backfill:main'],
+    },
     install_requires=[
         'beautifulsoup4>=4.5.0',
         'pandas>=0.18,<0.21',
@@ -3,12 +3,12 @@ import os
 
 def fixture_path(ba_name, filename):
     """
-    :param str ba_name: The balancing authority module name.
+    :param str ba_name: The balancing authority module name, e.g. 'caiso' or 'pyiso.caiso'.
     :param str filename: The fixture file you wish to find the path of.
     :return: The full path to the test file within the fixtures directory, regardless of working directory.
     :rtype: str
     """
-    fixtures_base_path = os.path.join(os.path.dirname(__file__), './fixtures', ba_name.lower())
+    fixtures_base_path = os.path.join(os.path.dirname(__file__), './fixtures', ba_name.lower().split('.')[-1])
     return os.path.join(fixtures_base_path, filename)
 
 
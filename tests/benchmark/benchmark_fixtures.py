@@ -0,0 +1,347 @@
+"""
+Replays the recorded payloads in tests/fixtures through their clients' parse paths, offline, and reports
+rows parsed, rows per second and peak memory for each case. Cases that go through a client's get_* method
+have their HTTP requests stubbed with the fixture.
+
+Peak memory is the peak of memory allocated through Python (including numpy and pandas buffers) while
+parsing, measured with tracemalloc; memory that libxml2 allocates for lxml document trees is not included
+(see benchmark_ieso_parser for resident set size measurements).
+
+Results are compared with the baselines saved in baselines.json next to this file. The benchmark exits with an
+error if a case raises, now parses a different number of rows, its throughput falls below the baseline divided by
+REGRESSION_FACTOR, or its peak memory grows above the baseline times REGRESSION_FACTOR.
+Throughput depends on the machine, so save new baselines with --save when a change is expected to move them,
+and review the diff of baselines.json with the change.
+
+Run from the repository root with:
+    python -m tests.benchmark.benchmark_fixtures [--save] [--case SUBSTRING]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+from io import BytesIO
+
+import pytz
+import requests_mock
+from pandas import ExcelFile
+
+from pyiso import client_factory, ieso
+from pyiso.ieso import ParserFormat
+from tests import fixture_path
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# the ISONE client needs credentials to be created, though the replayed requests do not check them
+os.environ.setdefault('ISONE_USERNAME', 'benchmark')
+os.environ.setdefault('ISONE_PASSWORD', 'benchmark')
+REPEAT = 10
+REGRESSION_FACTOR = 3.0
+
+
+class Case(object):
+    """
+    One fixture replayed through one parse path.
+    """
+    def __init__(self, name, ba_name, fixture, run, options=None, url=None):
+        """
+        :param str name: Unique case name, used as the baseline key.
+        :param str ba_name: Balancing authority, used to create the client.
+        :param str fixture: Fixture filename in the fixtures directory of the client's module.
+        :param callable run: Function of the client and the fixture content (bytes) that parses it and returns
+            the parsed rows (list or DataFrame).
+        :param dict options: If provided, the client's handle_options is called with them before parsing.
+        :param str url: If provided, requests to this URL are answered with the fixture content.
+        """
+        self.name = name
+        self.ba_name = ba_name
+        self.fixture = fixture
+        self.run = run
+        self.options = options
+        self.url = url
+
+    def content(self, client):
+        with open(fixture_path(client.__module__.split('.')[-1], self.fixture), 'rb') as f:
+            return f.read()
+
+    def client(self):
+        client = client_factory(self.ba_name)
+        if self.options is not None:
+            client.handle_options(**self.options)
+        return client
+
+    def parse(self, client, content):
+        if self.url is None:
+            return self.run(client, content)
+        with requests_mock.Mocker() as mocked_request:
+            mocked_request.get(self.url, content=content)
+            return self.run(client, content)
+
+
+def oasis_case(name, fixture, parser_name, options):
+    def run(client, content):
+        if fixture.endswith('.csv'):
+            data = client.parse_oasis_csv(content)
+        else:
+            data = client.parse_oasis_xml(content)
+        return getattr(client, parser_name)(data)
+    return Case(name, 'CAISO', fixture, run, options=options)
+
+
+def ieso_case(name, fixture, handler_name, parser_format):
+    min_datetime = datetime(2000, 1, 1, tzinfo=pytz.utc)
+    max_datetime = datetime(2100, 1, 1, tzinfo=pytz.utc)
+
+    def run(client, content):
+        result_ts = []
+        getattr(ieso, handler_name)(ieso_client=client).parse_report(
+            xml_content=content, result_ts=result_ts, parser_format=parser_format,
+            min_datetime=min_datetime, max_datetime=max_datetime)
+        return result_ts
+    return Case(name, 'IESO', fixture, run)
+
+
+def caiso_daily_renewables(client, content):
+    return client.get_generation(start_at='2017-11-06T00:00:00-08:00', end_at='2017-11-06T23:59:59-08:00',
+                                 market=client.MARKET_CHOICES.hourly, freq=client.FREQUENCY_CHOICES.hourly)
+
+
+def bpa_parse_wind(client, content):
+    df = client.parse_to_df(content, skiprows=6, header=0, delimiter='\t', index_col=0, parse_dates=True)
+    df.index = client.utcify_index(df.index)
+    return df
+
+
+def eu_parse_response(client, content):
+    # the EU client parses ASCII, as in fetch_entsoe
+    return client.parse_response(content.decode('utf-8').encode('ascii'))
+
+
+def latest(getter_name):
+    def run(client, content):
+        return getattr(client, getter_name)(latest=True)
+    return run
+
+
+def bchydro_trade_range(client, content):
+    # replay the spreadsheet, as of just after its last row
+    client.fetch_xls = lambda url: ExcelFile(BytesIO(content))
+    client.bc_now = client.bc_tz.localize(datetime(2017, 10, 16, 5, 43))
+    return client.get_trade(start_at=datetime(2017, 10, 13, 12, 45, tzinfo=pytz.utc),
+                            end_at=datetime(2017, 10, 15, 12, 45, tzinfo=pytz.utc))
+
+
+def nvenergy_parse(parser_name, this_date, mode):
+    def run(client, content):
+        df, df_mode = client.fetch_df(this_date, url=NVENERGY_URL, mode=mode)
+        return getattr(client, parser_name)(df, this_date, df_mode)
+    return run
+
+
+NVENERGY_URL = 'http://www.oasis.oati.com/NEVP/NEVPdocs/inetloading/benchmark.html'
+
+
+CAISO = client_factory('CAISO')
+AESO = client_factory('AESO')
+NBPOWER = client_factory('NBP')
+NLHYDRO = client_factory('NLH')
+PJM = client_factory('PJM')
+
+# the *_synthetic.csv fixtures were not recorded: they hold the data of the recorded XML fixtures in OASIS CSV layout
+CASES = [
+    oasis_case('caiso_ene_slrs_xml', 'ene_slrs.xml', 'parse_oasis_slrs',
+               {'data': 'trade', 'market': CAISO.MARKET_CHOICES.dam, 'freq': CAISO.FREQUENCY_CHOICES.dam}),
+    oasis_case('caiso_ene_slrs_csv', 'ene_slrs_synthetic.csv', 'parse_oasis_slrs',
+               {'data': 'trade', 'market': CAISO.MARKET_CHOICES.dam, 'freq': CAISO.FREQUENCY_CHOICES.dam}),
+    oasis_case('caiso_sld_forecast_xml', 'sld_forecast.xml', 'parse_oasis_demand_forecast',
+               {'market': CAISO.MARKET_CHOICES.fivemin, 'freq': CAISO.FREQUENCY_CHOICES.fivemin}),
+    oasis_case('caiso_sld_forecast_csv', 'sld_forecast_synthetic.csv', 'parse_oasis_demand_forecast',
+               {'market': CAISO.MARKET_CHOICES.fivemin, 'freq': CAISO.FREQUENCY_CHOICES.fivemin}),
+    oasis_case('caiso_sld_ren_forecast_xml', 'sld_ren_forecast.xml', 'parse_oasis_renewable',
+               {'data': 'gen', 'market': CAISO.MARKET_CHOICES.dam}),
+    oasis_case('caiso_sld_ren_forecast_csv', 'sld_ren_forecast_synthetic.csv', 'parse_oasis_renewable',
+               {'data': 'gen', 'market': CAISO.MARKET_CHOICES.dam}),
+    Case('caiso_daily_renewables_get_generation', 'CAISO', '20171106_DailyRenewablesWatch.txt',
+         caiso_daily_renewables, url='http://content.caiso.com/green/renewrpt/20171106_DailyRenewablesWatch.txt'),
+
+    Case('nyiso_genmix', 'NYISO', '20171122rtfuelmix.csv', lambda client, content: client.parse_genmix(content)),
+    Case('nyiso_load_rtm', 'NYISO', '20171122pal.csv', lambda client, content: client.parse_load_rtm(content)),
+    Case('nyiso_load_forecast', 'NYISO', '20171122isolf.csv',
+         lambda client, content: client.parse_load_forecast(content)),
+    Case('nyiso_trade', 'NYISO', '20171122ExternalLimitsFlows.csv',
+         lambda client, content: client.parse_trade(content)),
+
+    ieso_case('ieso_adequacy_generation', 'full_Adequacy2_20170618.xml', 'AdequacyReportHandler',
+              ParserFormat.generation),
+    ieso_case('ieso_adequacy_trade', 'full_Adequacy2_20170618.xml', 'AdequacyReportHandler', ParserFormat.trade),
+    ieso_case('ieso_intertie_schedule_flow', 'full_IntertieScheduleFlow_20170630.xml',
+              'IntertieScheduleFlowReportHandler', ParserFormat.trade),
+    ieso_case('ieso_predispatch_constrained_totals', 'full_PredispConstTotals_20170708.xml',
+              'PredispatchConstrainedTotalsReportHandler', ParserFormat.load),
+    ieso_case('ieso_realtime_constrained_totals', 'full_RealtimeConstTotals_2017070101.xml',
+              'RealTimeConstrainedTotalsReportHandler', ParserFormat.load),
+    ieso_case('ieso_generator_output_capability', 'reduced_GenOutputCapability_20160429.xml',
+              'GeneratorOutputCapabilityReportHandler', ParserFormat.generation),
+    ieso_case('ieso_generator_output_by_fuel_hourly', 'reduced_GenOutputbyFuelHourly_2016.xml',
+              'GeneratorOutputByFuelHourlyReportHandler', ParserFormat.generation),
+
+    Case('eu_gen', 'EU', 'de_gen.xml', eu_parse_response,
+         options={'start_at': '2016-01-01', 'end_at': '2016-01-02', 'control_area': 'DE(TenneT GER)', 'data': 'gen'}),
+    Case('eu_load', 'EU', 'de_load.xml', eu_parse_response,
+         options={'start_at': '2016-01-01', 'end_at': '2016-01-02', 'control_area': 'DE(TenneT GER)',
+                  'data': 'load'}),
+
+    Case('bpa_wind_tsv', 'BPA', 'wind_tsv.csv', bpa_parse_wind),
+
+    Case('aeso_gen_latest', 'AESO', 'latest_electricity_market_report.csv', latest('get_generation'),
+         url=AESO.LATEST_REPORT_URL),
+    Case('aeso_load_latest', 'AESO', 'latest_electricity_market_report.csv', latest('get_load'),
+         url=AESO.LATEST_REPORT_URL),
+    Case('aeso_trade_latest', 'AESO', 'latest_electricity_market_report.csv', latest('get_trade'),
+         url=AESO.LATEST_REPORT_URL),
+
+    Case('bchydro_trade_range', 'BCH', 'data1.xls', bchydro_trade_range),
+
+    Case('ercot_rtm_gen', 'ERCOT', 'real_time_system_conditions.html',
+         lambda client, content: client.parse_rtm(content), options={'data': 'gen', 'latest': True}),
+    Case('ercot_rtm_load', 'ERCOT', 'real_time_system_conditions.html',
+         lambda client, content: client.parse_rtm(content), options={'data': 'load', 'latest': True}),
+
+    Case('isone_morningreport', 'ISONE', 'morningreport_20160101.json',
+         lambda client, content: client.get_morningreport(day='20160101')['MorningReports']['MorningReport'],
+         url='https://webservices.iso-ne.com/api/v1.1/morningreport/day/20160101.json'),
+    Case('isone_sevendayforecast', 'ISONE', 'sevendayforecast_20160101.json',
+         lambda client, content: client.get_sevendayforecast(day='20160101')['SevenDayForecasts']['SevenDayForecast'],
+         url='https://webservices.iso-ne.com/api/v1.1/sevendayforecast/day/20160101.json'),
+
+    Case('nbpower_load_latest', 'NBP', 'SystemInformation_realtime.html', latest('get_load'),
+         url=NBPOWER.LATEST_REPORT_URL),
+    Case('nbpower_trade_latest', 'NBP', 'SystemInformation_realtime.html', latest('get_trade'),
+         url=NBPOWER.LATEST_REPORT_URL),
+
+    Case('nlhydro_load_latest', 'NLH', 'system-information-center.html', latest('get_load'),
+         url=NLHYDRO.SYSTEM_INFO_URL),
+
+    Case('nspower_gen_latest', 'NSP', 'currentmix.json', latest('get_generation'),
+         url='http://www.nspower.ca/system_report/today/currentmix.json'),
+    Case('nspower_load_latest', 'NSP', 'currentload.json', latest('get_load'),
+         url='http://www.nspower.ca/system_report/today/currentload.json'),
+
+    Case('nvenergy_load_day', 'NEVP', 'native system load and ties12_24_2017.html',
+         nvenergy_parse('parse_load', datetime(2017, 12, 24, 12, 34), 'recent'),
+         options={'start_at': datetime(2017, 12, 24, 8, tzinfo=pytz.utc),
+                  'end_at': datetime(2017, 12, 25, 8, tzinfo=pytz.utc)},
+         url=NVENERGY_URL),
+    Case('nvenergy_trade_month', 'NEVP', 'Monthly Ties and Loads_L11_01_2017.html',
+         nvenergy_parse('parse_trade', datetime(2017, 11, 24, 12, 34), 'historical'),
+         options={'start_at': datetime(2017, 11, 24, 8, tzinfo=pytz.utc),
+                  'end_at': datetime(2017, 11, 26, 8, tzinfo=pytz.utc)},
+         url=NVENERGY_URL),
+
+    Case('pei_gen_latest', 'PEI', 'chart-values.json', latest('get_generation'),
+         url='http://www.gov.pe.ca/windenergy/chart-values.php'),
+    Case('pei_load_latest', 'PEI', 'chart-values.json', latest('get_load'),
+         url='http://www.gov.pe.ca/windenergy/chart-values.php'),
+
+    Case('pjm_instantaneous_load', 'PJM', 'InstantaneousLoad.html',
+         lambda client, content: [client.fetch_edata_point('InstantaneousLoad', 'PJM RTO Total', 'MW')],
+         url=PJM.base_url + 'InstantaneousLoad.aspx'),
+    Case('pjm_forecasted_load_history', 'PJM', 'ForecastedLoadHistory.html',
+         lambda client, content: client.fetch_edata_series('ForecastedLoadHistory', {'name': 'PJM RTO Total'}),
+         url=PJM.base_url + 'ForecastedLoadHistory.aspx'),
+]
+
+
+def measure(case):
+    """
+    :return: Dict with the number of rows parsed, rows per second and peak memory in kilobytes (None on Python 2).
+    :rtype: dict
+    """
+    client = case.client()
+    content = case.content(client)
+
+    # warm up, and count rows
+    rows = len(case.parse(client, content))
+
+    seconds = min(timeit.repeat(lambda: case.parse(client, content), number=1, repeat=REPEAT))
+
+    peak_kb = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        case.parse(client, content)
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+        tracemalloc.stop()
+
+    return {'rows': rows, 'rows_per_sec': round(rows / seconds) if seconds else None,
+            'peak_kb': round(peak_kb, 1) if peak_kb is not None else None}
+
+
+def regressions(name, result, baseline):
+    """Returns a list of messages describing how result regressed from baseline."""
+    messages = []
+    if result['rows'] != baseline['rows']:
+        messages.append('%s: parsed %d rows, baseline %d' % (name, result['rows'], baseline['rows']))
+    if result['rows_per_sec'] and baseline['rows_per_sec'] and \
+            result['rows_per_sec'] * REGRESSION_FACTOR < baseline['rows_per_sec']:
+        messages.append('%s: %.0f rows/sec, baseline %.0f' % (name, result['rows_per_sec'], baseline['rows_per_sec']))
+    if result['peak_kb'] and baseline['peak_kb'] and result['peak_kb'] > baseline['peak_kb'] * REGRESSION_FACTOR:
+        messages.append('%s: peak memory %.0fKB, baseline %.0fKB' % (name, result['peak_kb'], baseline['peak_kb']))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark client parsers on recorded fixtures.')
+    parser.add_argument('--save', action='store_true', help='save the results as the new baselines')
+    parser.add_argument('--case', default='', help='only run cases whose name contains this')
+    args = parser.parse_args()
+
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as f:
+            baselines = json.load(f)
+
+    results = {}
+    failures = []
+    for case in CASES:
+        if args.case not in case.name:
+            continue
+        try:
+            result = measure(case)
+        except Exception as e:
+            # e.g. an optional parser dependency is missing; the other cases still run
+            error = '%s: %s' % (type(e).__name__, str(e).splitlines()[0][:100] if str(e) else '')
+            print('%-40s error: %s' % (case.name, error))
+            failures.append('%s: error: %s' % (case.name, error))
+            continue
+        results[case.name] = result
+
+        baseline = baselines.get(case.name)
+        print('%-40s %6d rows  %10.0f rows/sec  peak %8s KB  baseline %10s rows/sec' % (
+            case.name, result['rows'], result['rows_per_sec'] or 0,
+            '%.0f' % result['peak_kb'] if result['peak_kb'] is not None else '-',
+            '%.0f' % baseline['rows_per_sec'] if baseline and baseline['rows_per_sec'] else '-'))
+        if baseline is not None:
+            failures += regressions(case.name, result, baseline)
+
+    if args.save:
+        baselines.update(results)
+        with open(BASELINES_PATH, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('saved baselines to %s' % BASELINES_PATH)
+    elif failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
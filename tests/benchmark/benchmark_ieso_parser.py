@@ -0,0 +1,114 @@
+"""
+Compares the objectify and streaming iterparse IESO report parsers on every report in tests/fixtures/ieso,
+as is and with its repeated elements (generators, fuel days, intertie zones, ...) copied to the size of a
+larger report. Each timing covers parsing the report and appending its results with parse_report.
+
+Peak memory is the growth in maximum resident set size while parsing, measured in a fresh worker process
+for each run, since the lxml document tree is allocated by libxml2 where tracemalloc cannot see it.
+Exits with an error if the two parsers produce different results.
+
+Run from the repository root with:
+    python -m tests.benchmark.benchmark_ieso_parser
+"""
+from __future__ import print_function
+
+import gc
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+from datetime import datetime
+
+import pytz
+
+from pyiso import client_factory, ieso
+from pyiso.ieso import ParserFormat
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures', 'ieso')
+SCALES = [1, 50]
+PARSERS = ['objectify', 'iterparse']
+
+# fixture -> (report handler class name, parser format, repeated element)
+FIXTURES = [
+    ('full_Adequacy2_20170618.xml', 'AdequacyReportHandler', ParserFormat.generation, 'InternalResource'),
+    ('full_IntertieScheduleFlow_20170630.xml', 'IntertieScheduleFlowReportHandler', ParserFormat.trade,
+     'IntertieZone'),
+    ('full_PredispConstTotals_20170708.xml', 'PredispatchConstrainedTotalsReportHandler', ParserFormat.load,
+     'HourlyConstrainedEnergy'),
+    ('full_RealtimeConstTotals_2017070101.xml', 'RealTimeConstrainedTotalsReportHandler', ParserFormat.load,
+     'IntervalEnergy'),
+    ('reduced_GenOutputCapability_20160429.xml', 'GeneratorOutputCapabilityReportHandler', ParserFormat.generation,
+     'Generator'),
+    ('reduced_GenOutputbyFuelHourly_2016.xml', 'GeneratorOutputByFuelHourlyReportHandler', ParserFormat.generation,
+     'DailyData'),
+]
+
+MIN_DATETIME = datetime(2000, 1, 1, tzinfo=pytz.utc)
+MAX_DATETIME = datetime(2100, 1, 1, tzinfo=pytz.utc)
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+MAXRSS_BYTES = 1 if sys.platform == 'darwin' else 1024
+
+
+def scaled_report(xml, tag, scale):
+    """Repeats the first run of consecutive tag elements of a report scale times."""
+    match = re.search(r'(<%s>.*?</%s>\s*)+' % (tag, tag), xml, re.DOTALL)
+    return (xml[:match.start()] + match.group(0) * scale + xml[match.end():]).encode('utf-8')
+
+
+def parse(fixture, handler_name, parser_format, tag, scale, parser):
+    """Parses a scaled fixture with one parser. Returns the results, seconds taken and peak memory growth in bytes."""
+    with open(os.path.join(FIXTURES_DIR, fixture)) as f:
+        content = scaled_report(f.read(), tag, scale)
+    client = client_factory('IESO')
+    client.options['ieso_parser'] = parser
+    handler = getattr(ieso, handler_name)(ieso_client=client)
+    result_ts = []
+
+    gc.collect()
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    handler.parse_report(xml_content=content, result_ts=result_ts, parser_format=parser_format,
+                         min_datetime=MIN_DATETIME, max_datetime=MAX_DATETIME)
+    seconds = time.time() - start
+    peak_bytes = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss) * MAXRSS_BYTES
+
+    # objectify leaves numeric element objects in the results
+    values = [dict((k, getattr(v, 'pyval', v)) for k, v in row.items()) for row in result_ts]
+    return values, seconds, peak_bytes
+
+
+def parse_in_worker(args):
+    pool = multiprocessing.Pool(1)
+    try:
+        return pool.apply(parse, args)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main():
+    failures = []
+
+    for fixture, handler_name, parser_format, tag in FIXTURES:
+        for scale in SCALES:
+            runs = dict((parser, parse_in_worker((fixture, handler_name, parser_format, tag, scale, parser)))
+                        for parser in PARSERS)
+            if runs['objectify'][0] != runs['iterparse'][0]:
+                failures.append('%s x%d: results differ between parsers' % (fixture, scale))
+                continue
+
+            print('%-42s x%-3d %6d rows  objectify %7.4fs %7.1fMB  iterparse %7.4fs %7.1fMB' % (
+                fixture, scale, len(runs['iterparse'][0]),
+                runs['objectify'][1], runs['objectify'][2] / 1e6,
+                runs['iterparse'][1], runs['iterparse'][2] / 1e6))
+
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
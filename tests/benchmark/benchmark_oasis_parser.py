@@ -0,0 +1,54 @@
+"""
+Compares the BeautifulSoup and streaming lxml OASIS XML parsers on tests/fixtures/caiso/ene_slrs.xml,
+as is and with its REPORT_DATA elements repeated to the size of a multi-day ENE_SLRS pull.
+Each timing covers parsing the XML and running parse_oasis_slrs on the result.
+
+Run from the repository root with:
+    python -m tests.benchmark.benchmark_oasis_parser
+"""
+from __future__ import print_function
+
+import re
+import timeit
+
+from bs4 import BeautifulSoup
+
+from pyiso import client_factory
+from tests import read_fixture
+
+SCALES = [1, 100, 1000]
+REPEAT = 3
+
+
+def scaled_report(xml, scale):
+    """Repeats the REPORT_DATA elements of an OASIS report scale times."""
+    report_data = ''.join(re.findall(r'<REPORT_DATA>.*?</REPORT_DATA>\s*', xml, re.DOTALL))
+    first = xml.index('<REPORT_DATA>')
+    return (xml[:first] + report_data * scale + xml[first + len(report_data):]).encode('utf-8')
+
+
+def parse_bs4(client, content):
+    return client.parse_oasis_slrs(BeautifulSoup(content, 'xml').find_all(['REPORT_DATA', 'report_data']))
+
+
+def parse_lxml(client, content):
+    return client.parse_oasis_slrs(client.parse_oasis_xml(content))
+
+
+def main():
+    client = client_factory('CAISO')
+    client.handle_options(data='trade', market=client.MARKET_CHOICES.dam, freq=client.FREQUENCY_CHOICES.dam)
+    xml = read_fixture('caiso', 'ene_slrs.xml')
+
+    for scale in SCALES:
+        content = scaled_report(xml, scale)
+        assert parse_bs4(client, content) == parse_lxml(client, content), 'Results differ at scale %d' % scale
+
+        bs4_sec = min(timeit.repeat(lambda: parse_bs4(client, content), number=1, repeat=REPEAT))
+        lxml_sec = min(timeit.repeat(lambda: parse_lxml(client, content), number=1, repeat=REPEAT))
+        print('ene_slrs.xml x%-5d %8d bytes  bs4 %8.4fs  lxml %8.4fs  speedup %6.1fx' % (
+            scale, len(content), bs4_sec, lxml_sec, bs4_sec / lxml_sec))
+
+
+if __name__ == '__main__':
+    main()
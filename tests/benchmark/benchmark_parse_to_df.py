@@ -0,0 +1,87 @@
+"""
+Compares BaseClient.parse_to_df with the engine it selects automatically against the python engine it used
+to force, on every CSV fixture in tests/fixtures.
+
+Fixtures that a client parses with particular options use those options; the others use the defaults.
+Exits with an error if the two engines produce different DataFrames, or if the selected engine is more than
+REGRESSION_FACTOR times slower than the python engine.
+
+Run from the repository root with:
+    python -m tests.benchmark.benchmark_parse_to_df
+"""
+from __future__ import print_function
+
+import glob
+import os
+import sys
+import timeit
+
+from pyiso.base import BaseClient
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+NUMBER = 20
+REPEAT = 3
+REGRESSION_FACTOR = 1.5
+
+# read_csv kwargs used by the clients, by fixture path relative to FIXTURES_DIR
+FIXTURE_KWARGS = {
+    'bpa/wind_tsv.csv': {'skiprows': 6, 'header': 0, 'delimiter': '\t', 'index_col': 0, 'parse_dates': True},
+    'caiso/ren_report.csv': {'skiprows': 1, 'nrows': 24, 'header': 0, 'delimiter': '\t+'},
+    'nyiso/20171122pal.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+    'nyiso/20171122rtfuelmix.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+    'nyiso/20160119rtfuelmix.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+    'nyiso/20171122ExternalLimitsFlows.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+    'nyiso/20171122isolf.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+    'sveri/api_response.csv': {'header': 0, 'index_col': 0, 'parse_dates': True},
+}
+
+
+def fixture_paths():
+    paths = glob.glob(os.path.join(FIXTURES_DIR, '*', '*.csv'))
+    paths += glob.glob(os.path.join(FIXTURES_DIR, 'caiso', '*_DailyRenewablesWatch.txt'))
+    return sorted(paths)
+
+
+def fixture_kwargs(rel_path):
+    if rel_path.endswith('_DailyRenewablesWatch.txt'):
+        return {'nrows': 24, 'header': 1, 'delimiter': '\t+'}
+    return FIXTURE_KWARGS.get(rel_path, {})
+
+
+def main():
+    client = BaseClient()
+    failures = []
+
+    for path in fixture_paths():
+        rel_path = os.path.relpath(path, FIXTURES_DIR).replace(os.sep, '/')
+        kwargs = fixture_kwargs(rel_path)
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        try:
+            python_df = client.parse_to_df(content, engine='python', **kwargs)
+        except Exception as e:
+            print('%-44s skipped, not parseable as csv: %s' % (rel_path, str(e).splitlines()[0]))
+            continue
+        auto_df = client.parse_to_df(content, **kwargs)
+        if not python_df.equals(auto_df):
+            failures.append('%s: results differ between engines' % rel_path)
+            continue
+
+        engine = client.csv_engine(**kwargs)
+        python_sec = min(timeit.repeat(lambda: client.parse_to_df(content, engine='python', **kwargs),
+                                       number=NUMBER, repeat=REPEAT)) / NUMBER
+        auto_sec = min(timeit.repeat(lambda: client.parse_to_df(content, **kwargs),
+                                     number=NUMBER, repeat=REPEAT)) / NUMBER
+        print('%-44s %6d rows  python %8.5fs  %-6s %8.5fs  speedup %5.1fx' % (
+            rel_path, len(auto_df), python_sec, engine, auto_sec, python_sec / auto_sec))
+        if auto_sec > python_sec * REGRESSION_FACTOR:
+            failures.append('%s: %s engine is %.1fx slower than python' % (rel_path, engine, auto_sec / python_sec))
+
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
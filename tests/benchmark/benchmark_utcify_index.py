@@ -0,0 +1,56 @@
+"""
+Compares the vectorized tz_col path of BaseClient.utcify_index with the previous row-by-row loop
+on the NYISO fixtures.
+
+Run from the repository root with:
+    python -m tests.benchmark.benchmark_utcify_index
+"""
+from __future__ import print_function
+
+import timeit
+from io import StringIO
+
+import pandas as pd
+import pytz
+
+from pyiso.base import BaseClient
+from tests import read_fixture
+
+FIXTURES = ['20171122pal.csv', '20171122rtfuelmix.csv', '20160119rtfuelmix.csv']
+REPEAT = 5
+
+
+def legacy_utcify_index(client, local_index, tz_name, tz_col):
+    """The row-by-row loop that utcify_index used for tz_col before it was vectorized."""
+    aware_utc_list = []
+    for i in range(len(local_index)):
+        try:
+            aware_local_ts = pytz.timezone(tz_col[i]).localize(local_index[i])
+        except pytz.UnknownTimeZoneError:
+            aware_local_ts = pytz.timezone(tz_name).localize(local_index[i])
+        aware_utc_list.append(client.utcify(aware_local_ts))
+    return pd.DatetimeIndex(aware_utc_list)
+
+
+def main():
+    client = BaseClient()
+    tz_name = 'America/New_York'
+
+    for filename in FIXTURES:
+        df = pd.read_csv(StringIO(read_fixture('nyiso', filename)), header=0, index_col=0, parse_dates=True)
+        tz_col = list(df['Time Zone'])
+
+        legacy = legacy_utcify_index(client, df.index, tz_name, tz_col)
+        vectorized = client.utcify_index(df.index, tz_name=tz_name, tz_col=tz_col)
+        assert len(legacy) == len(vectorized) and (legacy == vectorized).all(), 'Results differ for %s' % filename
+
+        legacy_sec = min(timeit.repeat(lambda: legacy_utcify_index(client, df.index, tz_name, tz_col),
+                                       number=1, repeat=REPEAT))
+        vectorized_sec = min(timeit.repeat(lambda: client.utcify_index(df.index, tz_name=tz_name, tz_col=tz_col),
+                                           number=1, repeat=REPEAT))
+        print('%-24s %6d rows  loop %8.4fs  vectorized %8.4fs  speedup %6.1fx' % (
+            filename, len(df), legacy_sec, vectorized_sec, legacy_sec / vectorized_sec))
+
+
+if __name__ == '__main__':
+    main()
@@ -37,7 +37,7 @@ class IntegrationTestCAISOClient(TestCase):
                    'enddatetime': (ts+timedelta(minutes=40)).strftime(self.c.oasis_request_time_format),
                    }
         payload.update(self.c.base_payload)
-        data = self.c.fetch_oasis(payload=payload)
+        data = self.c.fetch_oasis(payload=payload, parser='bs4')
         self.assertEqual(len(data), 5)
         self.assertEqual(str(data[0]).lower(), '<report_data>\n\
 <data_item>SYS_FCST_DA_MW</data_item>\n\
@@ -57,7 +57,7 @@ class IntegrationTestCAISOClient(TestCase):
                    'enddatetime': (ts+timedelta(minutes=20)).strftime(self.c.oasis_request_time_format),
                    }
         payload.update(self.c.base_payload)
-        data = self.c.fetch_oasis(payload=payload)
+        data = self.c.fetch_oasis(payload=payload, parser='bs4')
         self.assertEqual(len(data), 55)
         self.assertEqual(str(data[0]).lower(), '<report_data>\n\
 <data_item>sys_fcst_15min_mw</data_item>\n\
@@ -77,7 +77,7 @@ class IntegrationTestCAISOClient(TestCase):
                    'enddatetime': (ts+timedelta(minutes=40)).strftime(self.c.oasis_request_time_format),
                    }
         payload.update(self.c.base_payload)
-        data = self.c.fetch_oasis(payload=payload)
+        data = self.c.fetch_oasis(payload=payload, parser='bs4')
         self.assertEqual(len(data), 4)
         self.assertEqual(str(data[0]).lower(), '<report_data>\n\
 <data_item>RENEW_FCST_DA_MW</data_item>\n\
@@ -98,7 +98,7 @@ class IntegrationTestCAISOClient(TestCase):
                    'enddatetime': (ts+timedelta(minutes=40)).strftime(self.c.oasis_request_time_format),
                    }
         payload.update(self.c.base_payload)
-        data = self.c.fetch_oasis(payload=payload)
+        data = self.c.fetch_oasis(payload=payload, parser='bs4')
         self.assertEqual(len(data), 17)
         self.assertEqual(str(data[0]).lower(), '<report_data>\n\
 <data_item>ISO_TOT_EXP_MW</data_item>\n\
@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from multiprocessing.pool import ThreadPool
+from unittest import TestCase
+
+import mock
+import pandas as pd
+import pytz
+
+from pyiso import backfill
+from pyiso.backfill import Shard, ShardResult, make_shards, run_backfill
+
+
+class FakeClient(object):
+    """Returns two points per call, after a short wait, and records how many calls run at once per source."""
+    lock = threading.Lock()
+    running = {}
+    max_running = {}
+    delays = {}
+
+    def __init__(self, ba_name):
+        self.ba_name = ba_name
+        self.source = backfill.BALANCING_AUTHORITIES[ba_name]['module']
+
+    def get_generation(self, start_at=False, end_at=False, **kwargs):
+        with self.lock:
+            self.running[self.source] = self.running.get(self.source, 0) + 1
+            self.max_running[self.source] = max(self.max_running.get(self.source, 0), self.running[self.source])
+        time.sleep(self.delays.get(self.ba_name, 0.01))
+        with self.lock:
+            self.running[self.source] -= 1
+
+        if self.ba_name == 'ELE':
+            return []
+        timestamp = datetime.strptime(start_at, '%Y-%m-%d').replace(tzinfo=pytz.utc)
+        return [{'ba_name': self.ba_name, 'timestamp': timestamp, 'freq': '1hr', 'market': 'RTHR',
+                 'fuel_name': fuel_name, 'gen_MW': 10.0} for fuel_name in ['coal', 'wind']]
+
+    def get_load(self, **kwargs):
+        raise NotImplementedError()
+
+
+class TestMakeShards(TestCase):
+    def test_shards(self):
+        shards = make_shards(['CAISO', 'ERCOT'], ['gen', 'load'], date(2017, 1, 1), date(2017, 1, 4), days=2)
+        self.assertEqual(len(shards), 8)
+        self.assertEqual(shards[0], Shard('CAISO', 'gen', date(2017, 1, 1), date(2017, 1, 3)))
+        self.assertEqual(shards[-1], Shard('ERCOT', 'load', date(2017, 1, 3), date(2017, 1, 4)))
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, make_shards, ['NOTABA'], ['gen'], date(2017, 1, 1), date(2017, 1, 2))
+        self.assertRaises(ValueError, make_shards, ['CAISO'], ['price'], date(2017, 1, 1), date(2017, 1, 2))
+
+
+@mock.patch('pyiso.backfill.client_factory', FakeClient)
+class TestRunBackfill(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.pool = ThreadPool(6)
+        FakeClient.max_running = {}
+        FakeClient.delays = {}
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.join()
+        shutil.rmtree(self.output_dir)
+
+    def test_output_and_checkpoint(self):
+        shards = make_shards(['CAISO', 'ELE'], ['gen', 'load'], date(2017, 1, 1), date(2017, 1, 3))
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool)
+
+        self.assertEqual(len(results), 8)
+        failed = [result.shard for result in results if result.error is not None]
+        self.assertEqual(sorted(shard.ba_name + shard.data for shard in failed), ['ELEgen', 'ELEgen'])
+
+        df = pd.read_csv(os.path.join(self.output_dir, 'data=gen', 'ba_name=CAISO', '20170102_20170103.csv'))
+        self.assertEqual(list(df['fuel_name']), ['coal', 'wind'])
+        self.assertEqual(df['timestamp'][0], '2017-01-02 00:00:00+00:00')
+
+        # only the failed shards run again
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool)
+        self.assertEqual(sorted(result.shard for result in results), sorted(failed))
+
+    def test_empty_shard_completed_after_retries(self):
+        shards = make_shards(['ELE'], ['gen'], date(2017, 1, 1), date(2017, 1, 2))
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool, max_empty_retries=2)
+        self.assertEqual(results, [ShardResult(shards[0], None, backfill.NO_DATA)])
+
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool, max_empty_retries=2)
+        self.assertEqual(results, [ShardResult(shards[0], 0, None)])
+
+        # completed with no rows, so not run again
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool, max_empty_retries=2)
+        self.assertEqual(results, [])
+
+    def test_per_source_limit(self):
+        shards = make_shards(['AZPS', 'DEAA', 'SRP', 'TEPC', 'CAISO'], ['gen'], date(2017, 1, 1), date(2017, 1, 3))
+        run_backfill(shards, self.output_dir, output_format='csv', per_source=1, pool=self.pool)
+        self.assertEqual(FakeClient.max_running['sveri'], 1)
+
+        run_backfill(make_shards(['PNM', 'WALC', 'IID', 'GRIF', 'HGMA'], ['gen'], date(2017, 1, 1), date(2017, 1, 3)),
+                     self.output_dir, output_format='csv', per_source=3, pool=self.pool)
+        self.assertLessEqual(FakeClient.max_running['sveri'], 3)
+
+    def test_bad_format(self):
+        self.assertRaises(ValueError, run_backfill, [], self.output_dir, output_format='xls', pool=self.pool)
+
+    @mock.patch('pyiso.backfill.parquet_available', return_value=False)
+    def test_parquet_falls_back_to_csv(self, mock_available):
+        shards = make_shards(['CAISO'], ['gen'], date(2017, 1, 1), date(2017, 1, 2))
+        results = run_backfill(shards, self.output_dir, output_format='parquet', pool=self.pool)
+        self.assertIsNone(results[0].error)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'data=gen', 'ba_name=CAISO',
+                                                    '20170101_20170102.csv')))
+
+    def test_bad_data_fails_shard(self):
+        shard = Shard('CAISO', 'gen', date(2017, 1, 1), date(2017, 1, 2))
+        with mock.patch.object(FakeClient, 'get_generation', return_value=[{'timestamp': 'not a time'}]):
+            result = backfill.fetch_shard(shard, self.output_dir, 'csv')
+        self.assertIsNone(result.rows)
+        self.assertIn('not a time', result.error)
+
+    @mock.patch('pyiso.backfill.fetch_shard', side_effect=RuntimeError('worker error'))
+    def test_worker_error_fails_shard(self, mock_fetch):
+        shards = make_shards(['CAISO', 'ERCOT'], ['gen'], date(2017, 1, 1), date(2017, 1, 3))
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=self.pool, shard_timeout=10)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(set(result.error for result in results), set(['RuntimeError: worker error']))
+
+    def test_lost_shard_times_out(self):
+        # a pool that never runs its tasks, like one whose worker process was killed
+        lost_pool = mock.Mock()
+        shards = make_shards(['CAISO', 'ERCOT'], ['gen'], date(2017, 1, 1), date(2017, 1, 3))
+        results = run_backfill(shards, self.output_dir, output_format='csv', pool=lost_pool, shard_timeout=0.01)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(set(result.error for result in results), set(['no result after 0.01 seconds']))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, backfill.CHECKPOINT_FILENAME)))
+
+    def test_lost_shard_keeps_slot(self):
+        lost_pool = mock.Mock()
+        shards = make_shards(['CAISO'], ['gen'], date(2017, 1, 1), date(2017, 1, 3))
+        results = run_backfill(shards, self.output_dir, output_format='csv', per_source=1, pool=lost_pool,
+                               shard_timeout=0.01)
+        self.assertEqual(lost_pool.apply_async.call_count, 1)
+        self.assertEqual([result.error for result in results],
+                         ['no result after 0.01 seconds', 'no free slot for its source'])
+
+    def test_slow_shard_keeps_slot(self):
+        FakeClient.delays = {'AZPS': 0.15}
+        shards = make_shards(['AZPS', 'DEAA'], ['gen'], date(2017, 1, 1), date(2017, 1, 2))
+        results = run_backfill(shards, self.output_dir, output_format='csv', per_source=1, pool=self.pool,
+                               shard_timeout=0.1)
+        self.assertEqual(FakeClient.max_running['sveri'], 1)
+        self.assertEqual(dict((result.shard.ba_name, result.error) for result in results),
+                         {'AZPS': 'no result after 0.1 seconds', 'DEAA': None})
+
+
+class TestMain(TestCase):
+    @mock.patch('pyiso.backfill.run_backfill')
+    def test_args(self, mock_run):
+        mock_run.return_value = []
+        self.assertEqual(backfill.main(['--start', '2017-01-01', '--end', '2017-01-03', '--ba', 'CAISO',
+                                        '--data', 'gen', 'load', '--output-dir', 'history', '--per-source', '3']), 0)
+
+        args, kwargs = mock_run.call_args
+        self.assertEqual(len(args[0]), 4)
+        self.assertEqual(args[1], 'history')
+        self.assertEqual(kwargs['per_source'], 3)
+        self.assertEqual(kwargs['output_format'], 'parquet')
+        self.assertEqual(kwargs['max_empty_retries'], backfill.MAX_EMPTY_RETRIES)
+
+    @mock.patch('pyiso.backfill.run_backfill')
+    def test_exit_code(self, mock_run):
+        shard = Shard('CAISO', 'gen', date(2017, 1, 1), date(2017, 1, 2))
+        argv = ['--start', '2017-01-01', '--end', '2017-01-02', '--ba', 'CAISO', '--data', 'gen', '--output-dir', 'history']
+
+        mock_run.return_value = [ShardResult(shard, None, backfill.NO_DATA)]
+        self.assertEqual(backfill.main(argv), 0)
+
+        mock_run.return_value = [ShardResult(shard, None, 'no result after 10 seconds')]
+        self.assertEqual(backfill.main(argv), 1)
@@ -119,3 +119,105 @@ class TestBaseClient(TestCase):
     def test_timeout(self):
         bc = BaseClient(timeout_seconds=30)
         self.assertEqual(bc.timeout_seconds, 30)
+
+    def test_utcify_index_tz_col(self):
+        bc = BaseClient()
+        local_index = pd.DatetimeIndex(['2017-11-05 00:55', '2017-11-05 01:05', '2017-11-05 01:05',
+                                        '2017-11-05 02:00'])
+        tz_col = ['EDT', 'EDT', 'EST', 'EST']
+        utc_index = bc.utcify_index(local_index, tz_name='America/New_York', tz_col=tz_col)
+        expected = pd.DatetimeIndex(['2017-11-05 04:55', '2017-11-05 05:05', '2017-11-05 06:05',
+                                     '2017-11-05 07:00']).tz_localize('UTC')
+        self.assertTrue((utc_index == expected).all())
+
+    def test_utcify_index_tz_col_fallback_to_tz_name(self):
+        bc = BaseClient()
+        local_index = pd.DatetimeIndex(['2017-07-01 12:00', '2017-12-01 12:00'])
+        tz_col = pd.Series(['unknown', 'unknown'], index=local_index)
+        utc_index = bc.utcify_index(local_index, tz_name='America/New_York', tz_col=tz_col)
+        self.assertEqual(utc_index[0], pd.Timestamp('2017-07-01 16:00', tz='UTC'))
+        self.assertEqual(utc_index[1], pd.Timestamp('2017-12-01 17:00', tz='UTC'))
+
+    def test_handle_options_invalid_output(self):
+        bc = BaseClient()
+        self.assertRaises(ValueError, bc.handle_options, output='dicts')
+
+    def test_serialize_faster_output_frame(self):
+        bc = BaseClient()
+        bc.handle_options(output='frame')
+        index = pd.DatetimeIndex(['2017-01-01 00:00', '2017-01-01 00:00', '2017-01-01 01:00'], name='timestamp')
+        df = pd.DataFrame({'fuel_name': ['wind', 'coal', 'wind'], 'gen_MW': [1, 2, 3]},
+                          index=index.tz_localize('UTC'))
+        frame = bc.serialize_faster(df, extras={'ba_name': 'BA', 'market': 'RTHR', 'freq': '1hr'})
+
+        self.assertIsInstance(frame, pd.DataFrame)
+        self.assertEqual(list(frame.columns), ['timestamp', 'ba_name', 'freq', 'market', 'fuel_name', 'gen_MW'])
+        self.assertEqual(str(frame['timestamp'].dt.tz), 'UTC')
+        for col in ['ba_name', 'freq', 'market', 'fuel_name']:
+            self.assertEqual(frame[col].dtype.name, 'category')
+        self.assertEqual(frame['gen_MW'].dtype.name, 'float64')
+        self.assertEqual(list(frame['ba_name']), ['BA', 'BA', 'BA'])
+
+    def test_serialize_output_arrays(self):
+        bc = BaseClient()
+        bc.handle_options(output='arrays')
+        index = pd.DatetimeIndex(['2017-01-01 00:00', '2017-01-01 01:00']).tz_localize('UTC')
+        df = pd.DataFrame({'load_MW': [1.5, 2.5]}, index=index)
+        records = bc.serialize(df, header=['timestamp', 'load_MW'], extras={'ba_name': 'BA'})
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records['load_MW'][1], 2.5)
+        self.assertEqual(records['ba_name'][0], 'BA')
+        self.assertEqual(pd.Timestamp(records['timestamp'][1]), pd.Timestamp('2017-01-01 01:00'))
+
+    def test_format_output_empty_frame(self):
+        bc = BaseClient()
+        bc.handle_options(output='frame')
+        frame = bc.format_output([])
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(list(frame.columns), ['timestamp', 'ba_name', 'freq', 'market'])
+
+    def test_format_output_list_unchanged(self):
+        bc = BaseClient()
+        bc.handle_options()
+        data = [{'timestamp': datetime(2017, 1, 1, tzinfo=pytz.utc), 'load_MW': 1}]
+        self.assertIs(bc.format_output(data), data)
+
+    def test_iter_load_chunks_by_local_day(self):
+        bc = BaseClient()
+        bc.TZ_NAME = 'America/New_York'
+        calls = []
+
+        def get_load(start_at, end_at, **kwargs):
+            calls.append((start_at, end_at))
+            return [{'timestamp': start_at, 'load_MW': 1}]
+        bc.get_load = get_load
+
+        start_at = datetime(2017, 1, 1, 12, tzinfo=pytz.utc)
+        end_at = datetime(2017, 1, 3, 12, tzinfo=pytz.utc)
+        chunks = list(bc.iter_load(start_at=start_at, end_at=end_at))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(calls[0][0], start_at)
+        self.assertEqual(calls[0][1], datetime(2017, 1, 2, 5, tzinfo=pytz.utc) - timedelta(microseconds=1))
+        self.assertEqual(calls[1][0], datetime(2017, 1, 2, 5, tzinfo=pytz.utc))
+        self.assertEqual(calls[2][1], end_at)
+
+    def test_iter_load_requires_range(self):
+        bc = BaseClient()
+        self.assertRaises(ValueError, list, bc.iter_load(start_at=datetime(2017, 1, 1, tzinfo=pytz.utc)))
+
+    def test_csv_engine(self):
+        bc = BaseClient()
+        self.assertEqual(bc.csv_engine(header=0), 'c')
+        self.assertEqual(bc.csv_engine(delimiter='\t'), 'c')
+        self.assertEqual(bc.csv_engine(sep='\\s+'), 'c')
+        self.assertEqual(bc.csv_engine(delimiter='\t+'), 'python')
+        self.assertEqual(bc.csv_engine(sep=None), 'python')
+        self.assertEqual(bc.csv_engine(skipfooter=2), 'python')
+
+    def test_parse_to_df_regex_delimiter(self):
+        bc = BaseClient()
+        df = bc.parse_to_df(b'a\t\tb\n1\t\t2\n', delimiter='\t+')
+        self.assertEqual(list(df.columns), ['a', 'b'])
+        self.assertEqual(df['b'][0], 2)
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import requests_mock
+
+from pyiso import client_factory
+from pyiso.cache import CacheRule, SQLiteCache, SQLiteReportStore
+
+
+class TestCacheRule(TestCase):
+    def setUp(self):
+        self.rule = CacheRule(r'/(?P<date>\d{8})_DailyRenewablesWatch\.txt$', date_format='%Y%m%d')
+        self.utcnow = datetime(2017, 11, 10, 12)
+
+    def test_past_file_cached_forever(self):
+        url = 'http://content.caiso.com/green/renewrpt/20171105_DailyRenewablesWatch.txt'
+        self.assertTrue(self.rule.matches(url))
+        self.assertIsNone(self.rule.ttl(url, self.utcnow))
+
+    def test_current_file_not_cached(self):
+        url = 'http://content.caiso.com/green/renewrpt/20171109_DailyRenewablesWatch.txt'
+        self.assertEqual(self.rule.ttl(url, self.utcnow), 0)
+
+    def test_no_match(self):
+        self.assertFalse(self.rule.matches('http://oasis.caiso.com/oasisapi/SingleZip'))
+
+    def test_monthly_file_covers_month(self):
+        rule = CacheRule(r'/(?P<date>\d{8})\w+_csv\.zip$', date_format='%Y%m%d', covers=timedelta(days=31))
+        url = 'http://mis.nyiso.com/public/csv/pal/20171101pal_csv.zip'
+        self.assertEqual(rule.ttl(url, self.utcnow), 0)
+        self.assertIsNone(rule.ttl(url, datetime(2017, 12, 5)))
+
+
+class TestSQLiteCache(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.cache = SQLiteCache(os.path.join(self.dir_name, 'cache.sqlite'), max_bytes=10)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def make_response(self, url, content):
+        return self.cache.build_response(url, 200, {'Content-Type': 'text/plain'}, content, 'utf-8')
+
+    def test_roundtrip(self):
+        self.cache.set('a', self.make_response('http://a', b'abc'), None)
+        response = self.cache.get('a')
+        self.assertEqual(response.text, 'abc')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/plain')
+        self.assertTrue(response.from_cache)
+
+    def test_expired(self):
+        self.cache.set('a', self.make_response('http://a', b'abc'), -1)
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_lru_eviction(self):
+        self.cache.set('a', self.make_response('http://a', b'aaaa'), None)
+        self.cache.set('b', self.make_response('http://b', b'bbbb'), None)
+        self.cache.get('a')
+        self.cache.set('c', self.make_response('http://c', b'cccc'), None)
+
+        # b was least recently used
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('c'))
+
+    def test_key_ignores_param_order(self):
+        self.assertEqual(self.cache.make_key('http://a', {'x': 1, 'y': 2}),
+                         self.cache.make_key('http://a', {'y': 2, 'x': 1}))
+
+
+class TestSQLiteReportStore(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.store = SQLiteReportStore(os.path.join(self.dir_name, 'cache.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def test_roundtrip(self):
+        self.store.set('a', [{'x': 1}], etag='"abc"')
+        stored = self.store.get('a')
+        self.assertEqual(stored['data'], [{'x': 1}])
+        self.assertEqual(stored['etag'], '"abc"')
+        self.assertIsNone(stored['last_modified'])
+
+    def test_missing(self):
+        self.assertIsNone(self.store.get('a'))
+
+
+class TestRequestCache(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.c = client_factory('CAISO')
+        self.c.cache = SQLiteCache(os.path.join(self.dir_name, 'cache.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    @requests_mock.Mocker()
+    def test_past_file_served_from_cache(self, mocked_request):
+        url = 'http://content.caiso.com/green/renewrpt/20171105_DailyRenewablesWatch.txt'
+        mocked_request.get(url, text='renewables')
+
+        first = self.c.request(url)
+        second = self.c.request(url)
+
+        self.assertEqual(mocked_request.call_count, 1)
+        self.assertEqual(second.text, first.text)
+        self.assertTrue(second.from_cache)
+
+    @requests_mock.Mocker()
+    def test_uncached_url(self, mocked_request):
+        url = 'http://content.caiso.com/outlook/SP/renewables.html'
+        mocked_request.get(url, text='renewables')
+
+        self.c.request(url)
+        self.c.request(url)
+
+        self.assertEqual(mocked_request.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_failure_not_cached(self, mocked_request):
+        url = 'http://content.caiso.com/green/renewrpt/20171105_DailyRenewablesWatch.txt'
+        mocked_request.get(url, status_code=404)
+
+        self.c.request(url)
+        self.c.request(url)
+
+        self.assertEqual(mocked_request.call_count, 2)
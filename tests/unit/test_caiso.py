@@ -1,4 +1,6 @@
+import zipfile
 from datetime import date, datetime, timedelta
+from io import BytesIO
 from unittest import TestCase, skip
 from pandas import Timestamp
 import pandas as pd
@@ -163,6 +165,130 @@ class TestCAISOBase(TestCase):
                     'gen_MW': 580.83}
         self.assertEqual(expected, parsed_data[0])
 
+    def test_parse_oasis_xml(self):
+        df = self.c.parse_oasis_xml(self.ene_slrs_xml.encode('utf-8'))
+        self.assertEqual(len(df), len(BeautifulSoup(self.ene_slrs_xml, 'xml').find_all('REPORT_DATA')))
+        self.assertEqual(df['DATA_ITEM'][0], 'ISO_TOT_EXP_MW')
+        self.assertEqual(df['INTERVAL_START_GMT'][0], '2013-09-19T15:00:00-00:00')
+        self.assertEqual(df['VALUE'][0], '704')
+
+    def test_parse_oasis_xml_error(self):
+        xml = b'<?xml version="1.0" encoding="UTF-8"?>' \
+              b'<OASISReport xmlns="http://www.caiso.com/soa/OASISReport_v1.xsd"><MessagePayload><RTO>' \
+              b'<ERROR><ERR_CODE>1000</ERR_CODE><ERR_DESC>No data returned</ERR_DESC></ERROR>' \
+              b'</RTO></MessagePayload></OASISReport>'
+        self.assertRaises(ValueError, self.c.parse_oasis_xml, xml)
+
+    def test_parse_oasis_slrs_frame_matches_soup(self):
+        soup_data = BeautifulSoup(self.ene_slrs_xml, 'xml').find_all('REPORT_DATA')
+        frame_data = self.c.parse_oasis_xml(self.ene_slrs_xml.encode('utf-8'))
+        for data in ['gen', 'trade']:
+            self.c.handle_options(data=data, market=self.c.MARKET_CHOICES.dam, freq=self.c.FREQUENCY_CHOICES.dam)
+            self.assertEqual(self.c.parse_oasis_slrs(frame_data), self.c.parse_oasis_slrs(soup_data))
+
+    def test_parse_oasis_renewables_frame_matches_soup(self):
+        soup_data = BeautifulSoup(self.sld_ren_fcst_xml, 'xml').find_all('REPORT_DATA')
+        frame_data = self.c.parse_oasis_xml(self.sld_ren_fcst_xml.encode('utf-8'))
+        self.c.handle_options(data='gen', market=self.c.MARKET_CHOICES.dam, freq=self.c.FREQUENCY_CHOICES.dam)
+        self.assertEqual(self.c.parse_oasis_renewable(frame_data), self.c.parse_oasis_renewable(soup_data))
+
+    def test_parse_oasis_demand_frame_matches_soup(self):
+        soup_data = BeautifulSoup(self.sld_fcst_xml, 'xml').find_all('REPORT_DATA')
+        frame_data = self.c.parse_oasis_xml(self.sld_fcst_xml.encode('utf-8'))
+        self.c.handle_options(market=self.c.MARKET_CHOICES.fivemin, freq=self.c.FREQUENCY_CHOICES.fivemin)
+        self.assertEqual(self.c.parse_oasis_demand_forecast(frame_data),
+                         self.c.parse_oasis_demand_forecast(soup_data))
+
+    @requests_mock.Mocker()
+    def test_fetch_oasis_lxml(self, mock_request):
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            z.writestr('ene_slrs.xml', self.ene_slrs_xml.encode('utf-8'))
+        mock_request.get(self.c.base_url_oasis, content=zipped.getvalue())
+
+        data = self.c.fetch_oasis(payload={'queryname': 'ENE_SLRS'})
+        self.assertIsInstance(data, pd.DataFrame)
+        self.assertIn('DATA_ITEM', data.columns)
+
+        soup_data = self.c.fetch_oasis(payload={'queryname': 'ENE_SLRS'}, parser='bs4')
+        self.assertEqual(len(data), len(soup_data))
+
+    def test_parse_oasis_csv_matches_xml(self):
+        """
+        The *_synthetic.csv fixtures were not recorded from OASIS: they hold the data points of the recorded
+        XML fixtures in the OASIS CSV layout.
+        """
+        cases = [('ene_slrs', self.c.parse_oasis_slrs, {'data': 'trade', 'market': self.c.MARKET_CHOICES.dam}),
+                 ('sld_forecast', self.c.parse_oasis_demand_forecast, {'market': self.c.MARKET_CHOICES.fivemin}),
+                 ('sld_ren_forecast', self.c.parse_oasis_renewable, {'data': 'gen', 'market': self.c.MARKET_CHOICES.dam})]
+        for name, parser, options in cases:
+            self.c.handle_options(**options)
+            csv_data = self.c.parse_oasis_csv(read_fixture(self.c.__module__, name + '_synthetic.csv').encode('utf-8'))
+            xml_data = self.c.parse_oasis_xml(read_fixture(self.c.__module__, name + '.xml').encode('utf-8'))
+            self.assertEqual(parser(csv_data), parser(xml_data))
+
+    @requests_mock.Mocker()
+    def test_get_load_range_requests_csv(self, mock_request):
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            z.writestr('sld_forecast.csv', read_fixture(self.c.__module__, 'sld_forecast_synthetic.csv').encode('utf-8'))
+        mock_request.get(self.c.base_url_oasis, content=zipped.getvalue())
+
+        data = self.c.get_load(start_at=datetime(2014, 5, 8, 18, 50, tzinfo=pytz.utc),
+                               end_at=datetime(2014, 5, 8, 19, 30, tzinfo=pytz.utc))
+
+        self.assertEqual(mock_request.last_request.qs['resultformat'], ['6'])
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['load_MW'], 26755.0)
+
+    @requests_mock.Mocker()
+    def test_get_load_range_xml_answer_to_csv_request(self, mock_request):
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            z.writestr('sld_forecast.xml', read_fixture(self.c.__module__, 'sld_forecast.xml').encode('utf-8'))
+        mock_request.get(self.c.base_url_oasis, content=zipped.getvalue())
+
+        data = self.c.get_load(start_at=datetime(2014, 5, 8, 18, 50, tzinfo=pytz.utc),
+                               end_at=datetime(2014, 5, 8, 19, 30, tzinfo=pytz.utc))
+
+        self.assertEqual(mock_request.last_request.qs['resultformat'], ['6'])
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['load_MW'], 26755.0)
+
+    def test_merge_oasis_data_single_piece_not_deduped(self):
+        df = pd.DataFrame({'INTERVAL_START_GMT': ['2017-01-01T08:00:00-00:00'] * 2,
+                           'DATA_ITEM': ['SYS_FCST_5MIN_MW'] * 2, 'VALUE': [1.0, 2.0]})
+        self.assertEqual(len(self.c.merge_oasis_data([df])), 2)
+        self.assertEqual(len(self.c.merge_oasis_data([df, df.copy()])), 1)
+
+    def test_oasis_windows(self):
+        self.c.handle_options(start_at='2017-01-01', end_at='2017-03-15', data='load')
+        payload = self.c.construct_oasis_payload('SLD_FCST')
+        windows = self.c.oasis_windows(payload)
+
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[0][0], datetime(2017, 1, 1, 8))
+        self.assertEqual(windows[0][1], windows[1][0])
+        self.assertEqual(windows[-1][1], datetime(2017, 3, 15, 7))
+        for window_start, window_end in windows:
+            self.assertLessEqual(window_end - window_start, self.c.OASIS_MAX_RANGE)
+
+    @requests_mock.Mocker()
+    def test_get_load_long_range_chunked_and_deduped(self, mock_request):
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            z.writestr('sld_forecast.csv', read_fixture(self.c.__module__, 'sld_forecast_synthetic.csv').encode('utf-8'))
+        mock_request.get(self.c.base_url_oasis, content=zipped.getvalue())
+
+        # every window returns the same data points
+        data = self.c.get_load(start_at=datetime(2014, 4, 1, tzinfo=pytz.utc),
+                               end_at=datetime(2014, 6, 1, tzinfo=pytz.utc))
+
+        self.assertEqual(mock_request.call_count, 2)
+        starts = sorted(request.qs['startdatetime'][0] for request in mock_request.request_history)
+        self.assertEqual(starts, ['20140401t00:00-0000', '20140502t00:00-0000'])
+        self.assertEqual(len(data), 1)
+
     @requests_mock.Mocker()
     def test_get_generation_dst_start(self, mock_request):
         expected_url = 'http://content.caiso.com/green/renewrpt/20170312_DailyRenewablesWatch.txt'
@@ -227,3 +353,29 @@ class TestCAISOBase(TestCase):
 
         self.assertEqual(generation[0]['timestamp'], Timestamp('2017-11-06T08:00:00Z'))  # '2017-11-06T00:00:00-08:00'
         self.assertEqual(generation[239]['timestamp'], Timestamp('2017-11-07T07:00:00Z'))  # '2017-11-06T23:00:00-08:00'
+
+    @requests_mock.Mocker()
+    def test_get_generation_many_days(self, mock_request):
+        for day in ['20171104', '20171105', '20171106']:
+            mock_request.get('http://content.caiso.com/green/renewrpt/%s_DailyRenewablesWatch.txt' % day,
+                             content=read_fixture(self.c.__module__, '%s_DailyRenewablesWatch.txt' % day).encode('utf-8'))
+
+        start_at = parse('2017-11-04T12:00:00-07:00')
+        end_at = parse('2017-11-06T11:59:59-08:00')
+        generation = self.c.get_generation(start_at=start_at, end_at=end_at,
+                                           market=self.c.MARKET_CHOICES.hourly, freq=self.c.FREQUENCY_CHOICES.hourly)
+
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(len(generation), 120 + 240 + 120)
+        self.assertEqual(generation[0]['timestamp'], Timestamp('2017-11-04T19:00:00Z'))  # '2017-11-04T12:00:00-07:00'
+        self.assertEqual(generation[-1]['timestamp'], Timestamp('2017-11-06T19:00:00Z'))  # '2017-11-06T11:00:00-08:00'
+        self.assertEqual(set(type(dp['gen_MW']) for dp in generation), set([float]))
+        self.assertEqual(set(dp['fuel_name'] for dp in generation),
+                         set(['geo', 'biomass', 'biogas', 'smhydro', 'wind', 'solarpv', 'solarth', 'nuclear', 'thermal',
+                              'hydro']))
+
+        # same points as parsing the files one by one
+        chunks = list(self.c.iter_generation(start_at=start_at, end_at=end_at, market=self.c.MARKET_CHOICES.hourly,
+                                             freq=self.c.FREQUENCY_CHOICES.hourly))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([dp for chunk in chunks for dp in chunk], generation)
@@ -5,6 +5,8 @@ from unittest import TestCase
 
 import mock
 import pytz
+import requests_mock
+from freezegun import freeze_time
 
 from pyiso import client_factory
 from pyiso.base import BaseClient
@@ -93,3 +95,88 @@ class TestEIALoad(TestEIA):
 class TestEIATrade(TestEIA):
     def test_null_response(self):
         self._run_null_response_test(self.BALists.us_bas[0], data_type="trade", latest=True)
+
+
+class TestEIAMany(TestEIA):
+    def series(self, ba, suffix, values):
+        return {'series_id': 'EBA.%s%s' % (ba, suffix),
+                'data': [['20171120T%02dZ' % (23 - i), value] for i, value in enumerate(values)]}
+
+    @requests_mock.Mocker()
+    def test_get_load_many_batches_series(self, mocked_request):
+        self.c.EIA_MAX_SERIES_PER_REQUEST = 2
+        responses = {
+            'eba.ciso-all.d.h;eba.pjm-all.d.h': [self.series('PJM', '-ALL.D.H', [3, 4]),
+                                                 self.series('CISO', '-ALL.D.H', [1, 2])],
+            'eba.miso-all.d.h': [self.series('MISO', '-ALL.D.H', [5, None])],
+        }
+        mocked_request.get(self.c.base_url + '/series/',
+                           json=lambda request, context: {'request': {},
+                                                          'series': responses[request.qs['series_id'][0]]})
+
+        data = self.c.get_load_many(bas=['CISO', 'PJM', 'MISO', 'IESO'], latest=True)
+
+        # IESO is not supported; 3 series in batches of 2
+        self.assertEqual(mocked_request.call_count, 2)
+        self.assertEqual([(dp['ba_name'], dp['load_MW']) for dp in data], [('CISO', 1), ('PJM', 3), ('MISO', 5)])
+        self.assertEqual(data[0]['timestamp'], datetime(2017, 11, 20, 23, tzinfo=pytz.utc))
+        self.assertFalse(hasattr(self.c, 'BA'))
+
+    @freeze_time('2017-11-20 12:00')
+    @requests_mock.Mocker()
+    def test_get_load_many_forecast(self, mocked_request):
+        mocked_request.get(self.c.base_url + '/series/',
+                           json={'request': {}, 'series': [self.series('CISO', '-ALL.DF.H', [10, 20])]})
+
+        data = self.c.get_load_many(bas=['CISO'], forecast=True)
+
+        self.assertEqual(mocked_request.last_request.qs['series_id'], ['eba.ciso-all.df.h'])
+        self.assertEqual([(dp['load_MW'], dp['market']) for dp in data], [(10, 'DAHR'), (20, 'DAHR')])
+
+    @requests_mock.Mocker()
+    def test_get_generation_many_missing_series(self, mocked_request):
+        mocked_request.get(self.c.base_url + '/series/',
+                           json={'request': {}, 'series': [self.series('CISO', '-ALL.NG.H', [10, 20])]})
+        self.c.set_ba('TVA')
+
+        data = self.c.get_generation_many(bas=['CISO', 'PJM'], latest=True)
+
+        self.assertEqual(mocked_request.call_count, 1)
+        self.assertEqual(data, [{'ba_name': 'CISO', 'timestamp': datetime(2017, 11, 20, 23, tzinfo=pytz.utc),
+                                 'freq': '1hr', 'gen_MW': 10, 'market': 'RTHR', 'fuel_name': 'other'}])
+        self.assertEqual(self.c.BA, 'TVA')
+
+    def test_unknown_ba(self):
+        self.assertRaises(ValueError, self.c.get_trade_many, bas=['CISO', 'XXXX'], latest=True)
+
+
+class TestEIAFormatResult(TestEIA):
+    def setUp(self):
+        super(TestEIAFormatResult, self).setUp()
+        self.c.set_ba('CISO')
+        self.result = {'request': {}, 'series': [{'series_id': 'EBA.CISO-ALL.D.H', 'data': [
+            ['20171120T02Z', 1002.7], ['20171120T01Z', None], ['20171120T00Z', 1000], ['20171119T23Z', 999]]}]}
+
+    def test_format_start_end(self):
+        self.c.handle_options(data='load', latest=False, yesterday=False,
+                              start_at='2017-11-19T23:30Z', end_at='2017-11-20T01:00Z')
+        data = self.c.format_result(self.result)
+        self.assertEqual([(dp['timestamp'], dp['load_MW']) for dp in data],
+                         [(datetime(2017, 11, 20, 1, tzinfo=pytz.utc), 0),
+                          (datetime(2017, 11, 20, 0, tzinfo=pytz.utc), 1000)])
+        self.assertEqual(data[0]['ba_name'], 'CISO')
+        self.assertEqual(data[0]['market'], 'RTHR')
+
+    def test_format_latest_frame(self):
+        self.c.handle_options(data='load', latest=True, yesterday=False, start_at=False, end_at=False,
+                              output='frame')
+        df = self.c.format_result(self.result)
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df['load_MW'].iloc[0], 1002)
+        self.assertEqual(df['timestamp'].iloc[0], datetime(2017, 11, 20, 2, tzinfo=pytz.utc))
+
+    def test_format_other_timestamp_format(self):
+        self.result['series'][0]['data'] = [['2017-11-20T02:00:00Z', 5]]
+        self.c.handle_options(data='load', latest=False, yesterday=False, start_at=False, end_at=False)
+        data = self.c.format_result(self.result)
+        self.assertEqual(data[0]['timestamp'], datetime(2017, 11, 20, 2, tzinfo=pytz.utc))
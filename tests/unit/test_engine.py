@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+import requests
+from mock import patch
+
+from pyiso import engine
+
+
+class StubClient(object):
+    def __init__(self, ba_name):
+        self.ba_name = ba_name
+
+    def get_generation(self, latest=False, **kwargs):
+        if self.ba_name == 'NOGEN':
+            raise NotImplementedError()
+        if self.ba_name == 'BROKEN':
+            raise ValueError('bad response')
+        return [{'ba_name': self.ba_name, 'gen_MW': 1}]
+
+
+class TestFetchAll(TestCase):
+    def setUp(self):
+        self.clients = []
+
+        def factory(ba_name):
+            client = StubClient(ba_name)
+            self.clients.append(client)
+            return client
+
+        patcher = patch('pyiso.engine.client_factory', side_effect=factory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetch_all(self):
+        results = engine.fetch_all(data='gen', ba_names=['A', 'B', 'C'])
+        self.assertEqual(sorted(results.keys()), ['A', 'B', 'C'])
+        self.assertEqual(results['B'], [{'ba_name': 'B', 'gen_MW': 1}])
+
+    def test_clients_share_session(self):
+        engine.fetch_all(data='gen', ba_names=['A', 'B', 'C'])
+        self.assertEqual(len(self.clients), 3)
+        for client in self.clients:
+            self.assertIs(client.session, engine.shared_session())
+
+    def test_custom_session(self):
+        session = requests.Session()
+        engine.fetch_all(data='gen', ba_names=['A'], session=session)
+        self.assertIs(self.clients[0].session, session)
+
+    def test_failures_omitted(self):
+        results = engine.fetch_all(data='gen', ba_names=['A', 'NOGEN', 'BROKEN'], max_workers=1)
+        self.assertEqual(list(results.keys()), ['A'])
+
+    def test_invalid_data(self):
+        self.assertRaises(ValueError, engine.fetch_all, data='price')
@@ -2,8 +2,10 @@ import os
 from pyiso import client_factory
 from unittest import TestCase
 import mock
+import requests_mock
 from mock import patch
-from datetime import timedelta
+from datetime import datetime, timedelta
+import pytz
 
 fixtures_base_path = os.path.join(os.path.dirname(__file__), '../fixtures/eu')
 
@@ -32,3 +34,94 @@ class TestEU(TestCase):
           self.assertEqual(parsed[-1]['gen_MW'], 3816)
           self.assertEqual(parsed[-1]['fuel_name'], 'nuclear')
 
+
+    def test_parse_gen_all_points(self):
+        self.c.handle_options(start_at='2017-10-29T20:00Z', end_at='2017-10-29T21:30Z',
+                              control_area='DE(TenneT GER)', data='gen')
+        with open(os.path.join(fixtures_base_path, 'de_gen.xml'), 'r') as report:
+          parsed = self.c.parse_response(report.read().encode('ascii'))
+          self.assertEqual(len(parsed), 72)
+          self.assertEqual(parsed[0]['timestamp'], datetime(2017, 10, 29, 20, 15, tzinfo=pytz.utc))
+          self.assertEqual(parsed[0]['gen_MW'], 80)
+          self.assertNotIn(0, [dp['gen_MW'] for dp in parsed])
+
+    def test_parse_load_frame(self):
+        self.c.handle_options(start_at='2017-10-29T20:00Z', end_at='2017-10-29T21:30Z',
+                              control_area='DE(TenneT GER)', data='load', output='frame')
+        with open(os.path.join(fixtures_base_path, 'de_load.xml'), 'r') as report:
+          df = self.c.parse_response(report.read().encode('ascii'))
+          self.assertEqual(len(df), 16)
+          self.assertEqual(df['load_MW'].iloc[-1], 13926)
+          self.assertTrue(df['timestamp'].is_monotonic_increasing)
+
+    def test_parse_decimal_quantities(self):
+        self.c.handle_options(start_at='2017-10-29T20:00Z', end_at='2017-10-29T21:30Z',
+                              control_area='DE(TenneT GER)', data='load')
+        response = b'''<GL_MarketDocument xmlns="urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0">
+            <TimeSeries><Period>
+                <timeInterval><start>2017-10-29T20:00Z</start><end>2017-10-29T21:00Z</end></timeInterval>
+                <resolution>PT30M</resolution>
+                <Point><position>1</position><quantity>12.5</quantity></Point>
+                <Point><position>2</position><quantity>13</quantity></Point>
+            </Period></TimeSeries>
+        </GL_MarketDocument>'''
+        parsed = self.c.parse_response(response)
+        self.assertEqual([dp['load_MW'] for dp in parsed], [12.5, 13])
+        self.assertEqual(parsed[1]['timestamp'], datetime(2017, 10, 29, 21, tzinfo=pytz.utc))
+
+    def test_entsoe_windows(self):
+        self.c.handle_options(start_at='2015-01-01T00:00Z', end_at='2017-03-01T00:00Z',
+                              control_area='DE(TenneT GER)', data='load')
+        windows = self.c.entsoe_windows()
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[0][0], self.c.options['start_at'])
+        self.assertEqual(windows[-1][1], self.c.options['end_at'])
+        for (_, window_end), (next_start, _) in zip(windows[:-1], windows[1:]):
+            self.assertEqual(window_end, next_start)
+        self.assertTrue(all(end - start <= self.c.ENTSOE_MAX_RANGE for start, end in windows))
+
+    @requests_mock.Mocker()
+    def test_get_load_many(self, mocked_request):
+        with open(os.path.join(fixtures_base_path, 'de_load.xml'), 'r') as report:
+            mocked_request.get(self.c.base_url, content=report.read().encode('ascii'))
+
+        control_areas = ['DE(TenneT GER)', 'DE(Amprion)']
+        data = self.c.get_load_many(control_areas=control_areas, start_at='2016-01-01T00:00Z',
+                                    end_at='2017-01-15T00:00Z')
+
+        # two windows per control area
+        self.assertEqual(mocked_request.call_count, 4)
+        domains = sorted(request.qs['outbiddingzone_domain'][0] for request in mocked_request.request_history)
+        self.assertEqual(domains, sorted(self.c.CONTROL_AREAS[ca]['ENTSOe_ID'].lower()
+                                         for ca in control_areas for window in range(2)))
+        self.assertEqual(len(data), 16 * 4)
+        self.assertEqual(set(dp['ba_name'] for dp in data), set(control_areas))
+        self.assertEqual(data[0]['ba_name'], 'DE(TenneT GER)')
+
+    @requests_mock.Mocker()
+    def test_get_load_many_bad_response_skipped(self, mocked_request):
+        with open(os.path.join(fixtures_base_path, 'de_load.xml'), 'r') as report:
+            good = report.read().encode('ascii')
+        tso_id = self.c.CONTROL_AREAS['DE(Amprion)']['ENTSOe_ID']
+
+        def respond(request, context):
+            if request.qs['outbiddingzone_domain'][0] == tso_id.lower():
+                return b'<html>Service unavailable</html'
+            return good
+        mocked_request.get(self.c.base_url, content=respond)
+
+        control_areas = ['DE(TenneT GER)', 'DE(Amprion)', 'DE(50HzT)']
+        data = self.c.get_load_many(control_areas=control_areas, start_at='2017-01-01T00:00Z',
+                                    end_at='2017-01-02T00:00Z')
+        self.assertEqual(mocked_request.call_count, 3)
+        self.assertEqual(len(data), 16 * 2)
+        self.assertEqual(sorted(set(dp['ba_name'] for dp in data)), ['DE(50HzT)', 'DE(TenneT GER)'])
+
+    def test_get_generation_many_bad_control_area(self):
+        with patch.object(self.c, 'fetch_entsoe') as fetch:
+            self.assertRaises(ValueError, self.c.get_generation_many, ['DE(TenneT GER)', 'not-a-cta'], latest=True)
+            fetch.assert_not_called()
+
+    def test_rate_limiter_shared_by_token(self):
+        other = client_factory('EU')
+        self.assertIs(self.c.get_rate_limiter(), other.get_rate_limiter())
@@ -1,5 +1,7 @@
 from os import environ
-from pyiso import client_factory
+from freezegun import freeze_time
+from pyiso import client_class, client_factory, pooled_client
+from pyiso.caiso import CAISOClient
 from unittest import TestCase
 import inspect
 
@@ -57,3 +59,33 @@ class TestFactory(TestCase):
 
             # check for BaseClient
             self.assertIn('BaseClient', parent_names)
+
+    def test_module_imported_once(self):
+        self.assertIs(client_factory('CAISO').__class__, client_factory('caiso').__class__)
+        self.assertIs(client_class('CAISO'), CAISOClient)
+
+    def test_name(self):
+        self.assertEqual(client_factory('caiso').NAME, 'caiso')
+        self.assertEqual(client_factory('AZPS').NAME, 'AZPS')
+
+    def test_pooled_session_reused(self):
+        with pooled_client('MISO', timeout_seconds=5) as c:
+            session = c.get_session()
+        with pooled_client('MISO', timeout_seconds=5) as c2:
+            self.assertIsNot(c2, c)
+            self.assertIs(c2.get_session(), session)
+            self.assertEqual(c2.timeout_seconds, 5)
+
+            # in use, so not lent twice
+            with pooled_client('MISO', timeout_seconds=5) as c3:
+                self.assertIsNot(c3.get_session(), session)
+
+    def test_pooled_client_clock_moves(self):
+        with freeze_time('2017-07-01 12:00', tz_offset=0):
+            with pooled_client('IESO') as c:
+                session = c.get_session()
+                self.assertEqual(c.local_start_of_day.day, 1)
+        with freeze_time('2017-07-02 12:00', tz_offset=0):
+            with pooled_client('IESO') as c2:
+                self.assertIs(c2.get_session(), session)
+                self.assertEqual(c2.local_start_of_day.day, 2)
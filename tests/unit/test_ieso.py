@@ -1,12 +1,19 @@
 import os
+import shutil
+import tempfile
 from datetime import datetime
 from datetime import timedelta
 from unittest import TestCase
+import re
 
+import requests_mock
+from freezegun import freeze_time
+from mock import patch
 from pytz import timezone
 
 from pyiso import client_factory
 from pyiso import ieso
+from pyiso.cache import SQLiteReportStore
 from pyiso.ieso import ParserFormat
 
 FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '../fixtures/ieso')
@@ -25,6 +32,13 @@ class TestIESO(TestCase):
         self.assertTrue(self.ieso_client.options.get('historical', False))
         self.assertTrue(self.ieso_client.options.get('forecast', False))
 
+    def test_cache_ttl_hour_ending_24(self):
+        url = 'http://reports.ieso.ca/public/RealtimeConstTotals/PUB_RealtimeConstTotals_2017070124.xml'
+        with freeze_time('2017-07-02 12:00'):
+            self.assertEqual(self.ieso_client.cache_ttl(url), 0)
+        with freeze_time('2017-07-10'):
+            self.assertIsNone(self.ieso_client.cache_ttl(url))
+
     def test_handle_options_sets_historical_only(self):
         start_at = self.ieso_client.local_now - timedelta(days=2)
         end_at = self.ieso_client.local_now - timedelta(days=1)
@@ -47,6 +61,173 @@ class TestIESO(TestCase):
         self.ieso_client.handle_options(latest=True)
         self.assertTrue(self.ieso_client.options.get('latest', False))
 
+    @freeze_time('2017-07-05 12:00:00')
+    @requests_mock.Mocker()
+    def test_iter_trade_yields_each_report(self, mocked_request):
+        xml_content = open(FIXTURES_DIR + '/full_IntertieScheduleFlow_20170630.xml').read().encode('utf8')
+        mocked_request.get(re.compile('IntertieScheduleFlow'), content=xml_content)
+        ieso_client = client_factory('IESO')
+        start_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(year=2017, month=6, day=29, hour=0, minute=5))
+        end_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(year=2017, month=7, day=1, hour=0, minute=0))
+
+        chunks = list(ieso_client.iter_trade(start_at=start_at, end_at=end_at))
+        trades = ieso_client.get_trade(start_at=start_at, end_at=end_at)
+
+        self.assertGreater(len(chunks), 0)
+        self.assertEqual([dp for chunk in chunks for dp in chunk], trades)
+
+
+    @freeze_time('2017-07-02 12:00:00')
+    @requests_mock.Mocker()
+    def test_get_load_requests_reports_concurrently(self, mocked_request):
+        xml_content = open(FIXTURES_DIR + '/full_RealtimeConstTotals_2017070101.xml').read().encode('utf8')
+        mocked_request.get(re.compile('RealtimeConstTotals'), content=xml_content)
+        start_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(year=2017, month=7, day=1, hour=0, minute=5))
+        end_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(year=2017, month=7, day=2, hour=0, minute=0))
+
+        serial_client = client_factory('IESO')
+        serial_loads = serial_client.get_load(start_at=start_at, end_at=end_at, ieso_max_workers=1)
+        concurrent_client = client_factory('IESO')
+        with patch.object(concurrent_client, 'map_concurrently', wraps=concurrent_client.map_concurrently) as mapped:
+            concurrent_loads = concurrent_client.get_load(start_at=start_at, end_at=end_at, ieso_max_workers=4)
+
+        # one report per hour ending, requested by each client
+        urls = [request.url for request in mocked_request.request_history]
+        self.assertEqual(len(set(urls)), 24)
+        self.assertEqual(len(urls), 48)
+        self.assertEqual(mapped.call_args[1]['max_workers'], 4)
+        self.assertEqual(len(mapped.call_args[0][1]), 24)
+        self.assertGreater(len(concurrent_loads), 0)
+        self.assertEqual(serial_loads, concurrent_loads)
+
+class TestIESOReportStore(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.xml_content = open(FIXTURES_DIR + '/reduced_GenOutputbyFuelHourly_2016.xml').read().encode('utf8')
+        self.url = 'http://reports.ieso.ca/public/GenOutputbyFuelHourly/PUB_GenOutputbyFuelHourly_2016.xml'
+        self.start_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(2016, 1, 1, 1))
+        self.end_at = timezone(ieso.IESOClient.TZ_NAME).localize(datetime(2016, 1, 8))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def make_client(self):
+        ieso_client = client_factory('IESO')
+        ieso_client.report_store = SQLiteReportStore(os.path.join(self.dir_name, 'store.sqlite'))
+        return ieso_client
+
+    @freeze_time('2016-01-09 12:00:00')
+    @requests_mock.Mocker()
+    def test_unmodified_report_not_parsed_again(self, mocked_request):
+        mocked_request.get(self.url, [{'content': self.xml_content, 'headers': {'ETag': '"v1"'}},
+                                      {'status_code': 304}])
+
+        first = self.make_client().get_generation(start_at=self.start_at, end_at=self.end_at)
+        second = self.make_client().get_generation(start_at=self.start_at, end_at=self.end_at)
+
+        self.assertEqual(mocked_request.call_count, 2)
+        self.assertEqual(mocked_request.request_history[1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(len(first), 1008)  # 6 fuels * 24 hours * 7 days
+        self.assertEqual(first, second)
+
+    @freeze_time('2016-01-09 12:00:00')
+    @requests_mock.Mocker()
+    def test_modified_report_parses_only_new_hours(self, mocked_request):
+        mocked_request.get(self.url, [{'content': self.xml_content, 'headers': {'Last-Modified': 'a'}},
+                                      {'content': self.xml_content, 'headers': {'Last-Modified': 'b'}}])
+        ieso_client = self.make_client()
+        ieso_client.get_generation(start_at=self.start_at, end_at=self.end_at)
+
+        ieso_client = self.make_client()
+        handler = ieso.GeneratorOutputByFuelHourlyReportHandler(ieso_client=ieso_client)
+        store_key = self.url + '#' + ParserFormat.generation
+        stored = ieso_client.report_store.get(store_key)
+        last_timestamp = ieso_client._decode_report_ts(stored['data'])[-1]['timestamp']
+
+        min_datetimes = []
+        parse_report = handler.parse_report
+
+        def spy(**kwargs):
+            min_datetimes.append(kwargs['min_datetime'])
+            return parse_report(**kwargs)
+        handler.parse_report = spy
+
+        result_ts = ieso_client._get_stored_report(handler, ParserFormat.generation, self.url)
+        self.assertEqual(mocked_request.request_history[1].headers['If-Modified-Since'], 'a')
+        self.assertGreater(min_datetimes[0], last_timestamp)
+        self.assertEqual(len(result_ts), len(stored['data']))
+        self.assertEqual(ieso_client.report_store.get(store_key)['last_modified'], 'b')
+
+
+class TestBaseIesoReportHandler(TestCase):
+    fixtures = [
+        (ieso.IntertieScheduleFlowReportHandler, 'full_IntertieScheduleFlow_20170630.xml', ParserFormat.trade),
+        (ieso.AdequacyReportHandler, 'full_Adequacy2_20170618.xml', ParserFormat.trade),
+        (ieso.AdequacyReportHandler, 'full_Adequacy2_20170618.xml', ParserFormat.generation),
+        (ieso.RealTimeConstrainedTotalsReportHandler, 'full_RealtimeConstTotals_2017070101.xml', ParserFormat.load),
+        (ieso.PredispatchConstrainedTotalsReportHandler, 'full_PredispConstTotals_20170708.xml', ParserFormat.load),
+        (ieso.GeneratorOutputCapabilityReportHandler, 'reduced_GenOutputCapability_20160429.xml',
+         ParserFormat.generation),
+        (ieso.GeneratorOutputByFuelHourlyReportHandler, 'reduced_GenOutputbyFuelHourly_2016.xml',
+         ParserFormat.generation),
+    ]
+
+    def test_iter_report_elements_clears_consumed_elements(self):
+        xml_content = open(FIXTURES_DIR + '/reduced_GenOutputCapability_20160429.xml').read().encode('utf8')
+        fuel_types = []
+        generators = []
+        for name, elem in ieso.BaseIesoReportHandler.iter_report_elements(xml_content, ('Generator',)):
+            fuel_types.append(elem.findtext('{*}FuelType'))
+            generators.append(elem)
+
+        self.assertEqual(fuel_types[0], 'NUCLEAR')
+        self.assertEqual(len(fuel_types), len(re.findall('<Generator>', xml_content.decode('utf8'))))
+        for elem in generators:
+            self.assertEqual(len(elem), 0)
+        # all but the last have been removed from the document
+        for elem in generators[:-1]:
+            self.assertIsNone(elem.getparent())
+
+    def test_parser_chosen_by_size(self):
+        xml_content = open(FIXTURES_DIR + '/full_RealtimeConstTotals_2017070101.xml').read().encode('utf8')
+        ieso_client = client_factory('IESO')
+        handler = ieso.RealTimeConstrainedTotalsReportHandler(ieso_client=ieso_client)
+        kwargs = {'xml_content': xml_content, 'result_ts': [], 'parser_format': ParserFormat.load,
+                  'min_datetime': None, 'max_datetime': None}
+
+        with patch.object(handler, 'parse_report_objectify') as objectify, \
+                patch.object(handler, 'parse_report_iterparse') as iterparse:
+            handler.parse_report(**kwargs)
+            self.assertEqual((objectify.call_count, iterparse.call_count), (1, 0))
+
+            ieso_client.REPORT_ITERPARSE_MIN_BYTES = len(xml_content)
+            handler.parse_report(**kwargs)
+            self.assertEqual((objectify.call_count, iterparse.call_count), (1, 1))
+
+            # the option overrides the size
+            ieso_client.options['ieso_parser'] = 'objectify'
+            handler.parse_report(**kwargs)
+            self.assertEqual((objectify.call_count, iterparse.call_count), (2, 1))
+
+    def test_parsers_agree(self):
+        min_datetime = datetime(year=2016, month=1, day=1, tzinfo=timezone('UTC'))
+        max_datetime = datetime(year=2018, month=1, day=1, tzinfo=timezone('UTC'))
+        for handler_class, fixture, parser_format in self.fixtures:
+            xml_content = open(FIXTURES_DIR + '/' + fixture).read().encode('utf8')
+            results = {}
+            for parser in ['objectify', 'iterparse']:
+                ieso_client = client_factory('IESO')
+                ieso_client.options['ieso_parser'] = parser
+                result_ts = []
+                handler_class(ieso_client=ieso_client).parse_report(
+                    xml_content=xml_content, result_ts=result_ts, parser_format=parser_format,
+                    min_datetime=min_datetime, max_datetime=max_datetime)
+                # objectify leaves numeric element objects in the results
+                results[parser] = [dict((k, getattr(v, 'pyval', v)) for k, v in row.items()) for row in result_ts]
+
+            self.assertGreater(len(results['iterparse']), 0, fixture)
+            self.assertEqual(results['objectify'], results['iterparse'], fixture)
+
 
 class TestIntertieScheduleFlowReportHandler(TestCase):
     def setUp(self):
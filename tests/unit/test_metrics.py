@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import pandas as pd
+import requests_mock
+
+from pyiso.base import BaseClient
+from pyiso.metrics import BaseMetricsSink, CallStats, InMemoryMetricsSink
+
+
+class BrokenSink(BaseMetricsSink):
+    def timing(self, name, seconds, tags):
+        raise IOError('statsd is down')
+
+    def count(self, name, value, tags):
+        raise IOError('statsd is down')
+
+
+class TestCallStats(TestCase):
+    def test_phases_added_up(self):
+        stats = CallStats('CAISO')
+        stats.record('request', 0.5, bytes=100)
+        stats.record('request', 0.25, bytes=50)
+        stats.record('parse_to_df', 0.125, rows=24)
+
+        self.assertEqual(stats.as_dict()['request'], {'calls': 2, 'seconds': 0.75, 'bytes': 150, 'rows': 0})
+        self.assertEqual(stats.seconds('parse_to_df'), 0.125)
+        self.assertEqual(stats.seconds(), 0.875)
+        self.assertEqual(stats.seconds('unzip'), 0.0)
+
+
+class TestInMemoryMetricsSink(TestCase):
+    def test_totals_per_tags(self):
+        sink = InMemoryMetricsSink()
+        sink.timing('pyiso.phase.seconds', 2, {'ba_name': 'CAISO', 'phase': 'request'})
+        sink.timing('pyiso.phase.seconds', 1, {'phase': 'request', 'ba_name': 'CAISO'})
+        sink.timing('pyiso.phase.seconds', 5, {'ba_name': 'ERCOT', 'phase': 'request'})
+
+        self.assertEqual(sink.get('pyiso.phase.seconds', ba_name='CAISO', phase='request'),
+                         {'count': 2, 'total': 3, 'max': 2})
+        self.assertIsNone(sink.get('pyiso.phase.rows', ba_name='CAISO', phase='request'))
+
+        sink.clear()
+        self.assertIsNone(sink.get('pyiso.phase.seconds', ba_name='CAISO', phase='request'))
+
+
+class TestClientInstrumentation(TestCase):
+    def setUp(self):
+        self.c = BaseClient()
+        self.c.NAME = 'TEST'
+        self.c.metrics_sink = InMemoryMetricsSink()
+
+    @requests_mock.Mocker()
+    def test_call_phases(self, mocked_request):
+        mocked_request.get('http://example.com/data.csv', content=b'a,b\n1,2\n3,4\n')
+        self.c.handle_options()
+
+        response = self.c.request('http://example.com/data.csv')
+        df = self.c.parse_to_df(response.content)
+        self.c.serialize_faster(df)
+
+        stats = self.c.stats.as_dict()
+        self.assertEqual(list(self.c.stats.phases.keys()), ['request', 'parse_to_df', 'serialize_faster'])
+        self.assertEqual(stats['request']['bytes'], 12)
+        self.assertEqual(stats['parse_to_df']['rows'], 2)
+        self.assertEqual(stats['serialize_faster']['rows'], 2)
+
+        rows = self.c.metrics_sink.get('pyiso.phase.rows', ba_name='TEST', phase='parse_to_df')
+        self.assertEqual(rows['total'], 2)
+        seconds = self.c.metrics_sink.get('pyiso.phase.seconds', ba_name='TEST', phase='request')
+        self.assertEqual(seconds['count'], 1)
+
+    def test_new_stats_per_call(self):
+        df = pd.DataFrame({'gen_MW': [1, 2]}, index=pd.date_range('2017-01-01', periods=2, freq='h'))
+        self.c.handle_options()
+        self.c.utcify_index(df.index)
+        first_stats = self.c.stats
+
+        self.c.handle_options()
+        self.assertIsNot(self.c.stats, first_stats)
+        self.assertEqual(self.c.stats.as_dict(), {})
+        self.assertEqual(first_stats.as_dict()['utcify_index']['rows'], 2)
+
+    def test_sink_errors_ignored(self):
+        self.c.metrics_sink = BrokenSink()
+        self.c.record_phase('request', 0.1, bytes=10)
+        self.assertEqual(self.c.stats.as_dict()['request']['bytes'], 10)
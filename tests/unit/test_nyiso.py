@@ -1,6 +1,9 @@
 from pyiso import client_factory
 from unittest import TestCase
 from datetime import date
+from io import BytesIO
+import zipfile
+import requests_mock
 
 from tests import read_fixture
 
@@ -66,3 +69,46 @@ class TestNYISOBase(TestCase):
             self.assertLess(row['gen_MW'], 5500)
             self.assertIn(row['fuel_name'], self.c.fuel_names.values())
         self.assertEqual(df.index.name, 'timestamp')
+
+    @requests_mock.Mocker()
+    def test_fetch_csvs_range_requests_monthly_zip_once(self, mocked_request):
+        self.c.options = {'data': 'gen'}
+        rtfuelmix_csv = read_fixture(ba_name='nyiso', filename='20171122rtfuelmix.csv')
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            z.writestr('20171001rtfuelmix.csv', rtfuelmix_csv)
+        mocked_request.get(requests_mock.ANY, status_code=404)
+        mocked_request.get('http://mis.nyiso.com/public/csv/rtfuelmix/20171001rtfuelmix_csv.zip',
+                           content=zipped.getvalue())
+        for day in [21, 22]:
+            mocked_request.get('http://mis.nyiso.com/public/csv/rtfuelmix/201711%drtfuelmix.csv' % day,
+                               text=rtfuelmix_csv)
+
+        dates_list = [date(2017, 10, 30), date(2017, 10, 31), date(2017, 11, 21), date(2017, 11, 22)]
+        csvs = self.c.fetch_csvs_range(dates_list, 'rtfuelmix')
+
+        # one zip for October, two daily csvs for November, in date order
+        self.assertEqual(len(csvs), 3)
+        self.assertEqual(csvs[0].decode('utf-8'), rtfuelmix_csv)
+        requested_urls = [r.url for r in mocked_request.request_history]
+        self.assertEqual(len(requested_urls), 4)
+        self.assertEqual(len(set(requested_urls)), 4)
+        self.assertNotIn('http://mis.nyiso.com/public/csv/rtfuelmix/20171031rtfuelmix.csv', requested_urls)
+
+    @requests_mock.Mocker()
+    def test_fetch_csvs_range_middle_days_missing(self, mocked_request):
+        self.c.options = {'data': 'load'}
+        zipped = BytesIO()
+        with zipfile.ZipFile(zipped, 'w') as z:
+            for day in range(20, 25):
+                z.writestr('201711%dpal.csv' % day, 'zipped %d' % day)
+        mocked_request.get(requests_mock.ANY, status_code=404)
+        mocked_request.get('http://mis.nyiso.com/public/csv/pal/20171101pal_csv.zip', content=zipped.getvalue())
+        for day in [20, 21, 24]:
+            mocked_request.get('http://mis.nyiso.com/public/csv/pal/201711%dpal.csv' % day, text='daily %d' % day)
+
+        dates_list = [date(2017, 11, day) for day in range(20, 25)]
+        csvs = self.c.fetch_csvs_range(dates_list, 'pal')
+
+        # the monthly zip replaces the daily csvs, so each day is returned once
+        self.assertEqual([csv.decode('utf-8') for csv in csvs], ['zipped %d' % day for day in range(20, 25)])
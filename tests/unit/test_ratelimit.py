@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from pyiso.ratelimit import RateLimiter, shared_rate_limiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(2, period=60.0, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_calls_within_limit_not_delayed(self):
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.clock.now = 10.0
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_waits_for_oldest_call_to_expire(self):
+        self.limiter.acquire()
+        self.clock.now = 10.0
+        self.limiter.acquire()
+        self.clock.now = 20.0
+
+        self.assertEqual(self.limiter.acquire(), 40.0)
+        self.assertEqual(self.clock.now, 60.0)
+
+        # the call at 10s is still counted
+        self.assertEqual(self.limiter.acquire(), 10.0)
+
+    def test_shared_by_key(self):
+        limiter = shared_rate_limiter('test-key', 10)
+        self.assertIs(shared_rate_limiter('test-key', 10), limiter)
+        self.assertIsNot(shared_rate_limiter('other-key', 10), limiter)
@@ -0,0 +1,191 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import mock
+import pytz
+
+from pyiso.scheduler import PollingScheduler, PollJob
+
+
+class FakeClock(object):
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def data_points(timestamp, gen_MW=100, freq='5m'):
+    return [{'ba_name': 'ISONE', 'timestamp': timestamp, 'freq': freq, 'market': 'RT5M',
+             'fuel_name': 'coal', 'gen_MW': gen_MW}]
+
+
+class HashingClient(object):
+    """Checks its response body against response_hashes, like BaseClient.request, and counts the parses."""
+    response_hashes = None
+
+    def __init__(self, body, timestamp):
+        self.body = body
+        self.timestamp = timestamp
+        self.parsed = 0
+
+    def get_generation(self, latest=False, **kwargs):
+        self.response_hashes.check('http://example.com/latest', None, self.body)
+        self.parsed += 1
+        return data_points(self.timestamp)
+
+
+class TestPollingScheduler(TestCase):
+    def setUp(self):
+        self.start = datetime(2017, 1, 1, 12, 1, tzinfo=pytz.utc)
+        self.clock = FakeClock(self.start)
+        self.published = {}
+        self.fetched = []
+        self.emitted = []
+
+    def fetch(self, job):
+        self.fetched.append(self.clock())
+        published = [ts for ts in self.published if ts <= self.clock()]
+        if not published:
+            return []
+        return self.published[max(published)]
+
+    def callback(self, job, data):
+        self.emitted.append(data)
+
+    def scheduler(self):
+        return PollingScheduler(self.callback, fetch=self.fetch, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_job_known_period(self):
+        self.assertEqual(PollJob('CAISO', 'gen').period, timedelta(minutes=10))
+        self.assertEqual(PollJob('NYISO', 'load').period, timedelta(minutes=5))
+        self.assertEqual(PollJob('AZPS', 'gen').period, timedelta(minutes=5))
+        self.assertIsNone(PollJob('ISONE', 'gen').period)
+        self.assertRaises(ValueError, PollJob, 'ISONE', 'price')
+
+    def test_period_learned_from_freq(self):
+        self.published[datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc)] = data_points(
+            datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc), freq='1hr')
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen')
+
+        scheduler.run_pending()
+        self.assertEqual(job.period, timedelta(hours=1))
+        # next poll after the next hourly point, plus the default lag and margin
+        self.assertEqual(job.next_run, datetime(2017, 1, 1, 13, 1, 30, tzinfo=pytz.utc))
+
+    def test_polls_after_publication(self):
+        # each 5-minute point is published 2 minutes after its timestamp
+        for minutes in range(0, 60, 5):
+            timestamp = datetime(2017, 1, 1, 12, minutes, tzinfo=pytz.utc)
+            self.published[timestamp + timedelta(minutes=2)] = data_points(timestamp, gen_MW=minutes)
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=5))
+
+        while self.clock() < self.start + timedelta(minutes=40):
+            scheduler.run_pending()
+            self.clock.sleep((min(j.next_run for j in scheduler.jobs) - self.clock()).total_seconds())
+
+        # the lag is learned, so after the first few polls each poll finds a new point
+        self.assertEqual(job.get_lag(), timedelta(minutes=2, seconds=30))
+        self.assertEqual(len(self.emitted), len(set(dp[0]['timestamp'] for dp in self.emitted)))
+        self.assertLess(len(self.fetched), len(self.emitted) + 4)
+        self.assertEqual(job.next_run - job.last_timestamp, timedelta(minutes=5, seconds=30) + job.get_lag())
+
+    def run_scheduler(self, scheduler, duration):
+        polled = []
+        while self.clock() < self.start + duration:
+            scheduler.run_pending()
+            polled.append((self.clock(), scheduler.jobs[0].last_timestamp))
+            self.clock.sleep((min(j.next_run for j in scheduler.jobs) - self.clock()).total_seconds())
+        return polled
+
+    def publish(self, lag, duration):
+        timestamp = datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc)
+        while timestamp < self.start + duration:
+            self.published[timestamp + lag] = data_points(timestamp)
+            timestamp += timedelta(minutes=5)
+
+    def test_lag_converges(self):
+        # points published 2:30 after their timestamp: the first retry finds the point exactly on publication
+        lag = timedelta(minutes=2, seconds=30)
+        self.publish(lag, timedelta(hours=48))
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=5))
+
+        self.run_scheduler(scheduler, timedelta(hours=48))
+        self.assertEqual(job.get_lag(), lag)
+        self.assertEqual(job.next_run, job.last_timestamp + timedelta(minutes=5) + lag + timedelta(seconds=30))
+
+    def test_lag_does_not_drift(self):
+        lag = timedelta(minutes=2)
+        self.publish(lag, timedelta(hours=48))
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=5))
+
+        polled = self.run_scheduler(scheduler, timedelta(hours=48))
+        # after the first hour every poll finds the next point, the same time after its timestamp
+        delays = set(polled_at - timestamp for polled_at, timestamp in polled if polled_at > self.start + timedelta(hours=1))
+        self.assertEqual(len(delays), 1)
+        self.assertLessEqual(delays.pop(), lag + job.retry_interval() + timedelta(seconds=30))
+        self.assertEqual(job.next_run - job.last_timestamp, timedelta(minutes=5) + job.get_lag() + timedelta(seconds=30))
+
+    def test_unchanged_content_not_emitted(self):
+        timestamp = datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc)
+        self.published[timestamp] = data_points(timestamp)
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=5))
+
+        scheduler.poll(job)
+        scheduler.poll(job)
+        self.assertEqual(len(self.fetched), 2)
+        self.assertEqual(len(self.emitted), 1)
+
+        # revised value for the same timestamp is emitted
+        self.published[timestamp] = data_points(timestamp, gen_MW=101)
+        scheduler.poll(job)
+        self.assertEqual(len(self.emitted), 2)
+
+    def test_no_data_retried(self):
+        scheduler = self.scheduler()
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=10))
+
+        scheduler.run_pending()
+        self.assertEqual(self.emitted, [])
+        self.assertEqual(job.next_run, self.start + timedelta(minutes=2))
+
+    def test_fetch_errors_retried(self):
+        def fetch(job):
+            raise ValueError('bad response')
+        scheduler = PollingScheduler(self.callback, fetch=fetch, clock=self.clock)
+        job = scheduler.add('ISONE', 'gen')
+
+        self.assertEqual(scheduler.run_pending(), 1)
+        self.assertEqual(job.next_run, self.start + timedelta(minutes=1))
+        self.assertEqual(scheduler.run_pending(), 0)
+
+    def test_unchanged_responses_not_parsed(self):
+        client = HashingClient(b'12:00', datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc))
+
+        @contextmanager
+        def pooled_client(ba_name):
+            yield client
+
+        scheduler = PollingScheduler(self.callback, clock=self.clock, sleep=self.clock.sleep)
+        job = scheduler.add('ISONE', 'gen', period=timedelta(minutes=5))
+        with mock.patch('pyiso.scheduler.pooled_client', pooled_client):
+            scheduler.poll(job)
+            scheduler.poll(job)
+            self.assertEqual(client.parsed, 1)
+            self.assertEqual(len(self.emitted), 1)
+            self.assertTrue(job.missed)
+            self.assertEqual(job.next_run, datetime(2017, 1, 1, 12, 6, 30, tzinfo=pytz.utc))
+
+            client.body, client.timestamp = b'12:05', datetime(2017, 1, 1, 12, 5, tzinfo=pytz.utc)
+            scheduler.poll(job)
+            self.assertEqual(client.parsed, 2)
+            self.assertEqual(len(self.emitted), 2)
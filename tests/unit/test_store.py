@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytz
+
+from pyiso.base import BaseClient
+from pyiso.store import SQLiteTimeSeriesStore
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=pytz.utc)
+
+
+class HourlyClient(BaseClient):
+    """Returns one point per hour in the requested range except on skip_dates, and records the ranges requested."""
+    NAME = 'TEST'
+
+    def __init__(self):
+        super(HourlyClient, self).__init__()
+        self.requested = []
+        self.skip_dates = []
+
+    def get_load(self, latest=False, yesterday=False, start_at=False, end_at=False, **kwargs):
+        self.handle_options(latest=latest, yesterday=yesterday, start_at=start_at, end_at=end_at, **kwargs)
+        self.requested.append((self.options['start_at'], self.options['end_at']))
+        data = []
+        ts = self.options['start_at'].replace(minute=0, second=0, microsecond=0)
+        while ts <= self.options['end_at']:
+            if ts >= self.options['start_at'] and ts.date() not in self.skip_dates:
+                data.append({'ba_name': self.NAME, 'timestamp': ts, 'freq': '1hr',
+                             'market': kwargs.get('market', 'RTHR'), 'load_MW': 100.0 + ts.hour})
+            ts += timedelta(hours=1)
+        return data
+
+
+class TestSQLiteTimeSeriesStore(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.store = SQLiteTimeSeriesStore(os.path.join(self.dir_name, 'store.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def test_gaps(self):
+        self.store.add('TEST', 'load', {}, [], start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3))
+        self.store.add('TEST', 'load', {}, [], start_at=utc(2017, 1, 4), end_at=utc(2017, 1, 5))
+
+        self.assertEqual(self.store.gaps('TEST', 'load', {}, utc(2017, 1, 1), utc(2017, 1, 6)),
+                         [(utc(2017, 1, 1), utc(2017, 1, 2)), (utc(2017, 1, 3), utc(2017, 1, 4)),
+                          (utc(2017, 1, 5), utc(2017, 1, 6))])
+        self.assertEqual(self.store.gaps('TEST', 'load', {}, utc(2017, 1, 2, 6), utc(2017, 1, 2, 12)), [])
+        self.assertEqual(len(self.store.gaps('TEST', 'load', {'market': 'RT5M'}, utc(2017, 1, 2), utc(2017, 1, 3))), 1)
+        self.assertEqual(len(self.store.gaps('TEST', 'gen', {}, utc(2017, 1, 2), utc(2017, 1, 3))), 1)
+
+    def test_coverage_merged(self):
+        self.store.add('TEST', 'load', {}, [], start_at=utc(2017, 1, 1), end_at=utc(2017, 1, 2))
+        self.store.add('TEST', 'load', {}, [], start_at=utc(2017, 1, 3), end_at=utc(2017, 1, 4))
+        self.store.add('TEST', 'load', {}, [], start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3))
+
+        self.assertEqual(self.store.covered('TEST', 'load', {}, utc(2016, 1, 1), utc(2018, 1, 1)),
+                         [(utc(2017, 1, 1), utc(2017, 1, 4))])
+
+    def test_points_replaced(self):
+        point = {'ba_name': 'TEST', 'timestamp': utc(2017, 1, 1, 1), 'freq': '1hr', 'market': 'RTHR',
+                 'fuel_name': 'coal', 'gen_MW': 10.0}
+        self.store.add('TEST', 'gen', {}, [point, dict(point, fuel_name='wind', gen_MW=5.0)])
+        self.store.add('TEST', 'gen', {}, [dict(point, gen_MW=12.0)])
+
+        points = self.store.get('TEST', 'gen', {}, utc(2017, 1, 1), utc(2017, 1, 2))
+        self.assertEqual([(p['fuel_name'], p['gen_MW']) for p in points], [('coal', 12.0), ('wind', 5.0)])
+        self.assertEqual(points[0]['timestamp'], utc(2017, 1, 1, 1))
+
+
+class TestStoredClient(TestCase):
+    def setUp(self):
+        self.dir_name = tempfile.mkdtemp()
+        self.client = HourlyClient()
+        self.client.store = SQLiteTimeSeriesStore(os.path.join(self.dir_name, 'store.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_name)
+
+    def test_only_gaps_fetched(self):
+        first = self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3))
+        self.assertEqual(len(first), 25)
+
+        data = self.client.get_load(start_at=utc(2017, 1, 1), end_at=utc(2017, 1, 4))
+        self.assertEqual(self.client.requested[1:], [(utc(2017, 1, 1), utc(2017, 1, 2)),
+                                                     (utc(2017, 1, 3), utc(2017, 1, 4))])
+        self.assertEqual(len(data), 73)
+        self.assertEqual(data[24], first[0])
+
+        self.client.get_load(start_at=utc(2017, 1, 1, 12), end_at=utc(2017, 1, 3, 12))
+        self.assertEqual(len(self.client.requested), 3)
+
+    def test_options_stored_separately(self):
+        self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3))
+        data = self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3), market='RT5M')
+        self.assertEqual(len(self.client.requested), 2)
+        self.assertEqual(data[0]['market'], 'RT5M')
+
+    def test_unsettled_data_fetched_again(self):
+        end_at = datetime.now(pytz.utc)
+        start_at = end_at - timedelta(days=1)
+        self.client.get_load(start_at=start_at, end_at=end_at)
+        self.client.get_load(start_at=start_at, end_at=end_at)
+
+        self.assertEqual(len(self.client.requested), 2)
+        self.assertEqual(self.client.requested[1][1], end_at)
+        self.assertGreater(self.client.requested[1][0], end_at - self.client.STORE_SETTLED_AFTER - timedelta(minutes=1))
+
+    def test_missing_day_not_stored(self):
+        # the request for Jan 3 fails, so the client skips that day
+        self.client.skip_dates = [datetime(2017, 1, 3).date()]
+        data = self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 4, 23))
+        self.assertEqual(len(data), 48)
+        self.assertEqual(self.client.store.gaps('TEST', 'load', {}, utc(2017, 1, 2), utc(2017, 1, 4, 23)),
+                         [(utc(2017, 1, 3), utc(2017, 1, 4))])
+
+        # only the missing day is fetched again
+        self.client.skip_dates = []
+        data = self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 4, 23))
+        self.assertEqual(self.client.requested[1], (utc(2017, 1, 3), utc(2017, 1, 4)))
+        self.assertEqual(len(data), 72)
+
+    def test_other_calls_not_stored(self):
+        self.client.get_load(yesterday=True)
+        self.client.get_load(start_at=utc(2017, 1, 2), end_at=utc(2017, 1, 3), output='frame')
+        self.assertEqual(self.client.store.covered('TEST', 'load', {}, utc(2017, 1, 1), utc(2017, 1, 4)), [])
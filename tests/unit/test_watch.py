@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytz
+import requests_mock
+
+from pyiso.base import BaseClient
+from pyiso.watch import ResponseHashes, UnchangedResponses, Watcher
+
+
+class CSVClient(BaseClient):
+    NAME = 'TEST'
+    URLS = ['http://example.com/fuels.csv', 'http://example.com/status.csv']
+
+    def __init__(self):
+        super(CSVClient, self).__init__()
+        self.parsed = 0
+
+    def get_generation(self, latest=False, **kwargs):
+        self.handle_options(latest=latest, **kwargs)
+        contents = [self.request(url).text for url in self.URLS]
+        self.parsed += 1
+        data = []
+        for line in contents[0].splitlines():
+            timestamp, fuel_name, gen_MW = line.split(',')
+            data.append({'ba_name': self.NAME, 'market': 'RT5M', 'freq': '5m', 'fuel_name': fuel_name,
+                         'timestamp': datetime.strptime(timestamp, '%Y-%m-%d %H:%M').replace(tzinfo=pytz.utc),
+                         'gen_MW': float(gen_MW)})
+        return data
+
+
+class TestResponseHashes(TestCase):
+    def test_raises_when_all_responses_unchanged(self):
+        hashes = ResponseHashes()
+        hashes.start_call()
+        hashes.check('http://example.com/a', None, b'a')
+        hashes.check('http://example.com/b', None, b'b')
+
+        hashes.start_call()
+        hashes.check('http://example.com/a', None, b'a')
+        self.assertRaises(UnchangedResponses, hashes.check, 'http://example.com/b', None, b'b')
+
+        hashes.start_call()
+        hashes.check('http://example.com/a', None, b'a')
+        hashes.check('http://example.com/b', None, b'changed')
+
+    def test_params_distinguish_requests(self):
+        hashes = ResponseHashes()
+        hashes.start_call()
+        hashes.check('http://example.com/a', {'date': '20170101'}, b'a')
+        hashes.start_call()
+        hashes.check('http://example.com/a', {'date': '20170102'}, b'a')
+
+
+@requests_mock.Mocker()
+class TestWatcher(TestCase):
+    def setUp(self):
+        self.client = CSVClient()
+        self.watcher = Watcher('TEST', client=self.client)
+
+    def mock(self, mocked_request, fuels, status='ok'):
+        mocked_request.get(self.client.URLS[0], text=fuels)
+        mocked_request.get(self.client.URLS[1], text=status)
+
+    def test_unchanged_responses_not_parsed(self, mocked_request):
+        self.mock(mocked_request, '2017-01-01 12:00,coal,100\n2017-01-01 12:00,wind,50')
+        self.assertEqual(len(self.watcher.poll('gen')), 2)
+        self.assertEqual(self.watcher.poll('gen'), [])
+        self.assertEqual(self.client.parsed, 1)
+        self.assertIsNone(self.client.response_hashes)
+
+        # any changed response is parsed
+        self.mock(mocked_request, '2017-01-01 12:00,coal,100\n2017-01-01 12:00,wind,50', status='late')
+        self.assertEqual(self.watcher.poll('gen'), [])
+        self.assertEqual(self.client.parsed, 2)
+
+    def test_new_and_revised_points(self, mocked_request):
+        self.mock(mocked_request, '2017-01-01 12:00,coal,100\n2017-01-01 12:00,wind,50')
+        self.watcher.poll('gen')
+
+        self.mock(mocked_request, '2017-01-01 12:00,coal,100\n2017-01-01 12:00,wind,55\n'
+                                  '2017-01-01 12:05,coal,110\n2017-01-01 12:05,wind,60')
+        changed = self.watcher.poll('gen')
+        self.assertEqual([(dp['timestamp'].minute, dp['fuel_name'], dp['gen_MW']) for dp in changed],
+                         [(0, 'wind', 55), (5, 'coal', 110), (5, 'wind', 60)])
+        self.assertEqual(self.watcher.last_timestamps[('gen', 'RT5M')],
+                         datetime(2017, 1, 1, 12, 5, tzinfo=pytz.utc))
+
+    def test_points_before_revision_window_ignored(self, mocked_request):
+        self.mock(mocked_request, '2017-01-03 12:00,coal,100')
+        self.watcher.poll('gen')
+
+        self.mock(mocked_request, '2017-01-01 12:00,coal,90\n2017-01-03 12:00,coal,100')
+        self.assertEqual(self.watcher.poll('gen'), [])
+
+    def test_old_values_forgotten(self, mocked_request):
+        start = datetime(2017, 1, 1, 12, 0, tzinfo=pytz.utc)
+        self.watcher.changed('gen', [{'timestamp': start, 'market': 'RT5M', 'fuel_name': 'coal', 'gen_MW': 1}])
+        self.watcher.changed('gen', [{'timestamp': start + timedelta(days=2), 'market': 'RT5M', 'fuel_name': 'coal',
+                                      'gen_MW': 1}])
+        self.assertEqual(len(self.watcher.emitted_values[('gen', 'RT5M')]), 1)
+
+    def test_bad_data(self, mocked_request):
+        self.assertRaises(ValueError, self.watcher.poll, 'price')
+
+    def test_frame_output_rejected(self, mocked_request):
+        self.mock(mocked_request, '2017-01-01 12:00,coal,100')
+        self.assertRaises(ValueError, self.watcher.poll, 'gen', output='frame')
+        self.assertEqual(self.client.parsed, 0)